@@ -0,0 +1,86 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# ─────────────────────────────
+# 🔹 Aho-Corasick: หาคำหลายพันคำในข้อความด้วยการสแกนรอบเดียว
+# ─────────────────────────────
+class AhoCorasick:
+    """
+    automaton สำหรับจับคู่หลาย pattern พร้อมกัน (สร้างครั้งเดียว ใช้ซ้ำได้ทุกข้อความ)
+    เวลาในการค้นหา = O(ความยาวข้อความ + จำนวนที่เจอ) ไม่ขึ้นกับจำนวน pattern
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]   # index ของ pattern ที่จบที่ node นี้ (รวมผ่าน fail link)
+
+        for pattern in dict.fromkeys(p for p in patterns if p):
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _step(self, node: int, ch: str) -> int:
+        while node and ch not in self._goto[node]:
+            node = self._fail[node]
+        return self._goto[node].get(ch, 0)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """yield (ตำแหน่งเริ่ม, pattern) ของทุกคำที่เจอ รวมคำที่ซ้อนกัน"""
+        node = 0
+        for i, ch in enumerate(text):
+            node = self._step(node, ch)
+            for idx in self._out[node]:
+                pattern = self.patterns[idx]
+                yield i - len(pattern) + 1, pattern
+
+    def search(self, text: str) -> bool:
+        """True ทันทีที่เจอคำแรก (early exit)"""
+        node = 0
+        for ch in text:
+            node = self._step(node, ch)
+            if self._out[node]:
+                return True
+        return False
+
+    def longest_matches(self, text: str, accept=None) -> List[Tuple[int, int, str]]:
+        """
+        คืน (start, end, pattern) แบบไม่ทับซ้อน: เลือกจากซ้ายไปขวา ตำแหน่งเดียวกันเลือกคำที่ยาวที่สุด
+        accept(text, start, end) ใช้กรองตำแหน่งที่ไม่ต้องการ (เช่น ขอบคำ)
+        """
+        candidates = [(start, start + len(p), p) for start, p in self.finditer(text)
+                      if accept is None or accept(text, start, start + len(p))]
+        candidates.sort(key=lambda m: (m[0], -len(m[2])))
+        out, pos = [], 0
+        for start, end, pattern in candidates:
+            if start >= pos:
+                out.append((start, end, pattern))
+                pos = end
+        return out
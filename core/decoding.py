@@ -0,0 +1,76 @@
+import hashlib
+import json
+import math
+import os
+from typing import Dict
+
+# ─────────────────────────────
+# 🔹 Decoding profiles: beam settings per speed/quality trade-off
+# ─────────────────────────────
+# DECODING_PROFILE=fast|balanced|quality picks the profile for a run (default keeps today's 4 beams).
+DECODING_PROFILE = os.environ.get("DECODING_PROFILE", "quality")
+
+DECODING_PROFILES = {
+    "fast": {"num_beams": 1, "do_sample": False},
+    "balanced": {"num_beams": 2, "early_stopping": True, "do_sample": False},
+    "quality": {"num_beams": 4, "early_stopping": True, "do_sample": False},
+}
+# Fail at import on a typo instead of a KeyError inside every generate() path
+# (the summarizer would otherwise catch it and store "[ERROR] ..." summaries)
+if DECODING_PROFILE not in DECODING_PROFILES:
+    raise ValueError(f"Unknown DECODING_PROFILE '{DECODING_PROFILE}'; expected one of {', '.join(DECODING_PROFILES)}")
+
+# ─────────────────────────────
+# 🔹 Output length caps proportional to the input
+# ─────────────────────────────
+# Output tokens per input token by (source, target); T5's vocabulary splits Thai/Korean into
+# many more pieces than English, so translating into them needs a higher ratio.
+LENGTH_RATIO = {
+    ("th", "en"): 1.2,
+    ("ko", "en"): 1.2,
+    ("en", "th"): 2.5,
+    ("en", "ko"): 2.0,
+}
+DEFAULT_LENGTH_RATIO = 1.5
+LENGTH_SLACK = 16          # extra tokens so very short inputs (titles, tags) still finish
+
+TASK_LIMITS = {
+    # task: (hard max output tokens, min output tokens)
+    "translate": (512, 0),
+    "summarize": (150, 50),       # flan-t5 summary inside EpidemicNewsPipeline
+    "summarize_en": (150, 30),    # BART summary in core/summarizer.py
+}
+SUMMARY_RATIO = 0.7         # a summary never needs more tokens than ~70% of its input
+
+def output_cap(task: str, input_tokens: int, source_lang: str = None, target_lang: str = None) -> int:
+    hard_max, _ = TASK_LIMITS[task]
+    ratio = SUMMARY_RATIO if task.startswith("summarize") else \
+        LENGTH_RATIO.get((source_lang, target_lang), DEFAULT_LENGTH_RATIO)
+    return max(1, min(hard_max, math.ceil(input_tokens * ratio) + LENGTH_SLACK))
+
+def generation_kwargs(task: str, input_tokens: int, source_lang: str = None, target_lang: str = None,
+                      profile: str = None) -> Dict:
+    """kwargs for generate(): the profile's beam settings plus max/min length scaled to the input."""
+    settings = dict(DECODING_PROFILES[profile or DECODING_PROFILE])
+    max_length = output_cap(task, input_tokens, source_lang, target_lang)
+    settings["max_length"] = max_length
+    _, min_length = TASK_LIMITS[task]
+    if min_length:
+        settings["min_length"] = min(min_length, max(1, max_length // 2))
+    return settings
+
+def cache_namespace(profile: str = None, task: str = "translate") -> str:
+    """
+    "<profile>-<digest>" of everything that shapes a task's output (beam settings, hard cap, length
+    ratios, slack), so cached outputs are never reused across profiles or after the caps change.
+    """
+    profile = profile or DECODING_PROFILE
+    settings = {
+        "profile": DECODING_PROFILES[profile],
+        "limits": TASK_LIMITS[task],
+        "ratios": sorted((f"{src}>{tgt}", ratio) for (src, tgt), ratio in LENGTH_RATIO.items()),
+        "default_ratio": DEFAULT_LENGTH_RATIO,
+        "slack": LENGTH_SLACK,
+    }
+    digest = hashlib.sha1(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+    return f"{profile}-{digest}"
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pythainlp.tokenize import word_tokenize
+
+# ─────────────────────────────
+# 🔹 ตรวจข่าวซ้ำ/เกือบซ้ำก่อนส่งเข้าโมเดล (exact hash + MinHash LSH)
+# ─────────────────────────────
+DEDUP_PATH = "data/dedup_index.db"
+
+SHINGLE_SIZE = 3          # จำนวนคำต่อ shingle
+NUM_PERM = 64             # ความยาว MinHash signature
+BANDS = 16                # LSH: 16 band × 4 row → เริ่มเป็น candidate ที่ Jaccard ≈ 0.5
+ROWS = NUM_PERM // BANDS
+NEAR_DUP_THRESHOLD = 0.8  # Jaccard โดยประมาณที่ถือว่าเป็นข่าวเดียวกัน
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(42)  # seed คงที่ → signature เทียบข้ามรอบการรันได้
+_PERM_A = _rng.randint(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+def normalize_content(text: str) -> str:
+    return re.sub(r'\s+', ' ', text or "").strip().lower()
+
+def exact_hash(text: str) -> str:
+    return hashlib.sha1(normalize_content(text).encode("utf-8")).hexdigest()
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> set:
+    """ตัดคำไทยด้วย pythainlp แล้วสร้าง shingle ทีละ k คำ"""
+    tokens = [t for t in word_tokenize(normalize_content(text), keep_whitespace=False) if t.strip()]
+    if len(tokens) < k:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+def minhash(shingle_set: set) -> np.ndarray:
+    """MinHash signature (uint32 × NUM_PERM) จาก hash ของแต่ละ shingle"""
+    if not shingle_set:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint32)
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set),
+                         dtype=np.uint64, count=len(shingle_set))
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) % _PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """ค่าประมาณ Jaccard = สัดส่วนตำแหน่งที่ signature ตรงกัน"""
+    return float(np.mean(sig_a == sig_b))
+
+def band_keys(sig: np.ndarray) -> List[Tuple[int, str]]:
+    return [(b, hashlib.blake2b(sig[b * ROWS:(b + 1) * ROWS].tobytes(), digest_size=8).hexdigest())
+            for b in range(BANDS)]
+
+# ─────────────────────────────
+# 🔹 Index ของข่าวที่ประมวลผลไปแล้ว (SQLite)
+# ─────────────────────────────
+class DedupIndex:
+    def __init__(self, path: str = DEDUP_PATH, threshold: float = NEAR_DUP_THRESHOLD):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.threshold = threshold
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    url TEXT PRIMARY KEY,
+                    exact TEXT,
+                    signature BLOB
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fp_exact ON fingerprints (exact)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER,
+                    bucket TEXT,
+                    url TEXT
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_lsh ON lsh_buckets (band, bucket)")
+
+    def fingerprint(self, article: Dict) -> Tuple[str, np.ndarray]:
+        content = article.get("content_raw") or article.get("content", "")
+        return exact_hash(content), minhash(shingles(content))
+
+    def find_duplicate(self, article: Dict, fingerprint=None) -> Optional[Tuple[str, float]]:
+        """คืน (url ต้นฉบับ, ความคล้าย) ถ้าข่าวนี้ซ้ำ/เกือบซ้ำกับข่าวใน index"""
+        exact, sig = fingerprint or self.fingerprint(article)
+        url = article.get("url")
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url FROM fingerprints WHERE exact = ? AND url != ?", (exact, url)
+            ).fetchone()
+            if row:
+                return row[0], 1.0
+
+            candidates = set()
+            for band, bucket in band_keys(sig):
+                candidates.update(r[0] for r in self._conn.execute(
+                    "SELECT url FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)))
+            candidates.discard(url)
+
+            best = None
+            for cand in candidates:
+                blob = self._conn.execute(
+                    "SELECT signature FROM fingerprints WHERE url = ?", (cand,)).fetchone()[0]
+                score = similarity(sig, np.frombuffer(blob, dtype=np.uint32))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (cand, score)
+        return best
+
+    def add(self, article: Dict, fingerprint=None):
+        exact, sig = fingerprint or self.fingerprint(article)
+        url = article["url"]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM lsh_buckets WHERE url = ?", (url,))
+            self._conn.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)",
+                               (url, exact, sig.tobytes()))
+            self._conn.executemany("INSERT INTO lsh_buckets VALUES (?, ?, ?)",
+                                   [(band, bucket, url) for band, bucket in band_keys(sig)])
+
+    def check_and_add(self, article: Dict) -> Optional[Tuple[str, float]]:
+        """ตรวจซ้ำ ถ้าไม่ซ้ำจะเพิ่มเข้า index ทันที (ข่าวถัดไปในรอบเดียวกันจะเทียบกับข่าวนี้ได้)"""
+        if not (article.get("content_raw") or article.get("content")):
+            return None
+        fp = self.fingerprint(article)
+        dup = self.find_duplicate(article, fp)
+        if dup is None:
+            self.add(article, fp)
+        return dup
+
+    def close(self):
+        self._conn.close()
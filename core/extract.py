@@ -0,0 +1,79 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# ─────────────────────────────
+# 🔹 เลือก parser ที่เร็วที่สุดที่มีในเครื่อง
+# ─────────────────────────────
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+def make_soup(html: str, parse_only: SoupStrainer = None) -> BeautifulSoup:
+    """parse เฉพาะ node ที่ต้องใช้ (strained parsing) แทนการสร้าง tree ทั้งหน้า"""
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+def timed(func, html: str):
+    """รันใน worker process: คืน (ผลลัพธ์, เวลา parse เป็นวินาที CPU)"""
+    start = time.process_time()
+    result = func(html)
+    return result, time.process_time() - start
+
+# ─────────────────────────────
+# 🔹 Process pool สำหรับ parse HTML แยกจาก network I/O
+# ─────────────────────────────
+class ExtractPool:
+    """
+    ส่งงาน parse ไปทำใน process pool เพื่อไม่ให้ CPU ของ BeautifulSoup
+    ไปบล็อก event loop ที่กำลังดึงหน้าเว็บ และเก็บเวลา parse ต่อหน้า
+    max_workers=0 → parse ใน process หลัก (ใช้ตอน debug)
+    ใช้ fork (ถ้ามี) เพราะ spawn/forkserver จะ import สคริปต์หลัก (etl_pipeline) ซ้ำใน worker
+    → ควรสร้างและ start() ก่อน process หลักเริ่ม thread อื่น แล้วส่งตัวเดียวกันให้ทุก scraper
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max(1, (os.cpu_count() or 2) - 1) if max_workers is None else max_workers
+        context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+        self._executor = ProcessPoolExecutor(self.max_workers, mp_context=context) if self.max_workers > 0 else None
+        self.timings = {}
+
+    def start(self) -> "ExtractPool":
+        """fork worker ทั้งหมดทันที (แบบ fork ทุกตัวถูกสร้างตอน submit ครั้งแรก) แทนการ fork ทีหลังจาก thread ของ scraper"""
+        if self._executor is not None:
+            self._executor.submit(os.getpid).result()
+        return self
+
+    async def run(self, func, html: str, label: str = ""):
+        if self._executor is None:
+            result, elapsed = timed(func, html)
+        else:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self._executor, timed, func, html)
+        self.timings[label or f"page-{len(self.timings)}"] = elapsed
+        return result
+
+    def report(self) -> dict:
+        values = list(self.timings.values())
+        if not values:
+            return {"pages": 0, "total_ms": 0.0, "avg_ms": 0.0, "max_ms": 0.0}
+        return {
+            "pages": len(values),
+            "total_ms": sum(values) * 1000,
+            "avg_ms": sum(values) * 1000 / len(values),
+            "max_ms": max(values) * 1000,
+        }
+
+    def print_report(self):
+        r = self.report()
+        print(f"⏱️ parse {r['pages']} หน้า: รวม {r['total_ms']:.0f} ms, "
+              f"เฉลี่ย {r['avg_ms']:.1f} ms/หน้า, สูงสุด {r['max_ms']:.1f} ms")
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
@@ -0,0 +1,398 @@
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.resilience import (RETRY_POLICY, RETRY_STATUS, CircuitBreaker, CircuitOpenError,
+                             CrawlMetrics, backoff_delay)
+
+# ─────────────────────────────
+# 🔹 ค่าตั้งต้นของแต่ละเว็บ (ปรับได้ตามงบ rate ของแต่ละไซต์)
+# ─────────────────────────────
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+DEFAULT_TIMEOUT = 15
+CACHE_DIR = "data/http_cache"
+
+# concurrency = จำนวน request พร้อมกันสูงสุดต่อ host
+# rate        = จำนวน request ต่อวินาทีโดยเฉลี่ย (token bucket)
+# burst       = จำนวน request ที่ยิงติดกันได้ก่อนต้องรอ token
+HOST_POLICY = {
+    "default": {"concurrency": 4, "rate": 2.0, "burst": 4},
+    "www.hfocus.org": {"concurrency": 4, "rate": 2.0, "burst": 4},
+    "thestandard.co": {"concurrency": 4, "rate": 2.0, "burst": 4},
+}
+
+# ─────────────────────────────
+# 🔹 Token bucket: คุมจังหวะแทน time.sleep แบบตายตัว
+# ─────────────────────────────
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """รอจนมี token ว่าง 1 ตัวแล้วหยิบไปใช้"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# ─────────────────────────────
+# 🔹 Session pool: keep-alive หนึ่ง session ต่อ host
+# ─────────────────────────────
+class SessionPool:
+    def __init__(self, headers: dict = None, pool_size: int = 8):
+        self.headers = headers or DEFAULT_HEADERS
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session(self, host: str) -> requests.Session:
+        """คืน session เดิมของ host นี้ (reuse connection/TLS)"""
+        with self._lock:
+            if host not in self._sessions:
+                sess = requests.Session()
+                sess.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                sess.mount("http://", adapter)
+                sess.mount("https://", adapter)
+                self._sessions[host] = sess
+            return self._sessions[host]
+
+    def close(self):
+        with self._lock:
+            for sess in self._sessions.values():
+                sess.close()
+            self._sessions.clear()
+
+# ─────────────────────────────
+# 🔹 Cache บนดิสก์สำหรับ conditional GET (ETag / Last-Modified)
+# ─────────────────────────────
+class ResponseCache:
+    """เก็บ body + validator ของแต่ละ URL เพื่อส่ง If-None-Match / If-Modified-Since รอบถัดไป"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def lookup(self, url: str):
+        path = self._path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def conditional_headers(self, entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, res: requests.Response, previous: dict = None) -> dict:
+        """บันทึก response ลงดิสก์ (ข้ามถ้าเว็บไม่ส่ง validator มาเลย)"""
+        etag = res.headers.get("ETag")
+        last_modified = res.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return None
+
+        body_hash = hashlib.sha256(res.content).hexdigest()
+        if previous and previous.get("sha256") == body_hash and previous.get("etag") == etag \
+                and previous.get("last_modified") == last_modified:
+            return previous
+
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": body_hash,
+            "encoding": res.encoding,
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            "body": res.text,
+        }
+
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return entry
+
+    def to_response(self, url: str, entry: dict) -> requests.Response:
+        """แปลง entry ใน cache กลับเป็น Response (ใช้ตอนเว็บตอบ 304)"""
+        res = requests.Response()
+        res.url = url
+        res.status_code = 200
+        res.encoding = entry.get("encoding") or "utf-8"
+        res._content = entry["body"].encode(res.encoding)
+        res.from_cache = True
+        return res
+
+# ─────────────────────────────
+# 🔹 GET แบบ sync ที่ใช้ session pool + cache ร่วมกัน
+# ─────────────────────────────
+_default_sessions = SessionPool()
+_default_cache = ResponseCache()
+
+def http_get(url: str, *, use_cache: bool = False, sessions: SessionPool = None,
+             cache: ResponseCache = None, timeout: int = DEFAULT_TIMEOUT) -> requests.Response:
+    """GET ผ่าน keep-alive session; ถ้า use_cache จะส่ง conditional request และใช้ body เดิมเมื่อได้ 304"""
+    sessions = sessions or _default_sessions
+    cache = cache or _default_cache
+    entry = cache.lookup(url) if use_cache else None
+    headers = cache.conditional_headers(entry) if entry else {}
+
+    res = sessions.session(urlparse(url).netloc).get(url, headers=headers, timeout=timeout)
+    if entry and res.status_code == 304:
+        return cache.to_response(url, entry)
+    res.from_cache = False
+    if use_cache and res.status_code == 200:
+        cache.store(url, res, previous=entry)
+    return res
+
+# ─────────────────────────────
+# 🔹 Fetch engine แบบ asyncio (ใช้ร่วมกันทุก scraper)
+# ─────────────────────────────
+class AsyncFetcher:
+    """
+    ยิง HTTP GET พร้อมกันหลาย URL โดยจำกัด concurrency และ rate แยกตาม host
+    ล้มเหลวชั่วคราว (timeout, 429, 5xx) จะ retry แบบ exponential backoff
+    และถ้า host ล้มติดกันหลายครั้งจะตัดวงจร (CircuitOpenError) ไม่ให้รอ timeout ทุก URL
+    """
+
+    def __init__(self, host_policy: dict = None, headers: dict = None, timeout: int = DEFAULT_TIMEOUT,
+                 sessions: SessionPool = None, cache: ResponseCache = None, retry_policy: dict = None,
+                 metrics: CrawlMetrics = None):
+        self.host_policy = {**HOST_POLICY, **(host_policy or {})}
+        self.headers = headers or DEFAULT_HEADERS
+        self.timeout = timeout
+        self.sessions = sessions or (SessionPool(headers) if headers else _default_sessions)
+        self.cache = cache or _default_cache
+        self.retry_policy = {**RETRY_POLICY, **(retry_policy or {})}
+        self.metrics = metrics or CrawlMetrics()
+        self._semaphores = {}
+        self._buckets = {}
+        self._breakers = {}
+
+    def policy(self, host: str) -> dict:
+        return self.host_policy.get(host, self.host_policy["default"])
+
+    def _limits(self, host: str):
+        if host not in self._semaphores:
+            policy = self.policy(host)
+            self._semaphores[host] = asyncio.Semaphore(policy["concurrency"])
+            self._buckets[host] = TokenBucket(policy["rate"], policy["burst"])
+        return self._semaphores[host], self._buckets[host]
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(self.retry_policy["failure_threshold"],
+                                                  self.retry_policy["reset_after"])
+        return self._breakers[host]
+
+    def _get(self, url: str, use_cache: bool = False) -> requests.Response:
+        return http_get(url, use_cache=use_cache, sessions=self.sessions, cache=self.cache, timeout=self.timeout)
+
+    async def get(self, url: str, use_cache: bool = False) -> requests.Response:
+        """ดึง URL เดียว (blocking I/O ถูกย้ายไปทำใน thread) พร้อม retry/circuit breaker"""
+        host = urlparse(url).netloc
+        semaphore, bucket = self._limits(host)
+        breaker = self.breaker(host)
+        attempts = self.retry_policy["retries"] + 1
+        last_err = None
+
+        for attempt in range(attempts):
+            if not breaker.allow():
+                self.metrics.incr(host, "short_circuited")
+                raise CircuitOpenError(f"circuit open for {host}") from last_err
+
+            self.metrics.incr(host, "requests")
+            try:
+                async with semaphore:
+                    await bucket.acquire()
+                    start = time.monotonic()
+                    res = await asyncio.to_thread(self._get, url, use_cache)
+                    self.metrics.observe(host, time.monotonic() - start)
+                if res.status_code in RETRY_STATUS:
+                    raise requests.HTTPError(f"{res.status_code} for {url}", response=res)
+            except requests.RequestException as err:
+                last_err = err
+                self.metrics.incr(host, "errors")
+                breaker.record_failure()
+                if attempt + 1 < attempts:
+                    self.metrics.incr(host, "retries")
+                    await asyncio.sleep(backoff_delay(attempt, self.retry_policy))
+                continue
+            except BaseException:
+                # ถูก cancel (เช่น iter_crawl ยกเลิกหน้า list ที่ค้าง) หรือ error ที่ไม่ใช่ของ host
+                breaker.release_probe()
+                raise
+
+            breaker.record_success()
+            self.metrics.incr(host, "ok")
+            if getattr(res, "from_cache", False):
+                self.metrics.incr(host, "cache_hits")
+            return res
+
+        raise last_err
+
+    async def get_text(self, url: str, use_cache: bool = False) -> str:
+        res = await self.get(url, use_cache)
+        res.raise_for_status()
+        return res.text
+
+# ─────────────────────────────
+# 🔹 ไล่หน้า list + ดึงข่าวแบบ pipeline
+# ─────────────────────────────
+async def iter_crawl(page_urls: list, parse_listing, fetch_article, *, fetcher: AsyncFetcher,
+                     window: int = None, stop_after=None, extractor=None, max_pending: int = 32):
+    """
+    ดึงหน้า list ล่วงหน้าครั้งละ `window` หน้า แล้วส่งลิงก์ข่าวไปดึงต่อทันที
+    โดยไม่ต้องรอหน้า list ถัดไป และ yield ข่าวออกไปทันทีที่ parse เสร็จ
+    - parse_listing(html) -> list ของ item (คืนค่าว่างเมื่อหมดหน้า)
+    - fetch_article(item) -> dict ข่าว หรือ None ถ้าข้าม
+    - stop_after(items) -> True เพื่อหยุดหลังหน้านี้ (เช่น เจอแต่ข่าวที่เคยดึงแล้ว)
+    - extractor (ExtractPool) ถ้ามี จะ parse หน้า list ใน process pool
+    - max_pending = จำนวนข่าวสูงสุดที่ดึงมาแล้วแต่ผู้ใช้ยังไม่ได้รับ (คุม memory)
+    ลำดับข่าวที่ได้ = ลำดับที่ดึงเสร็จ ไม่ใช่ลำดับในหน้า list
+    """
+    if not page_urls:
+        return
+    if window is None:
+        window = fetcher.policy(urlparse(page_urls[0]).netloc)["concurrency"]
+
+    done = object()
+    queue = asyncio.Queue()
+    slots = asyncio.Semaphore(max_pending)
+
+    async def run_article(item):
+        await slots.acquire()
+        try:
+            article = await fetch_article(item)
+        except Exception:
+            article = None
+        if article:
+            await queue.put(article)
+        else:
+            slots.release()
+
+    async def produce():
+        pages = iter(page_urls)
+        pending = []
+        article_tasks = []
+
+        def schedule():
+            while len(pending) < window:
+                url = next(pages, None)
+                if url is None:
+                    return
+                pending.append((url, asyncio.create_task(fetcher.get_text(url))))
+
+        try:
+            schedule()
+            while pending:
+                url, task = pending.pop(0)
+                print(f"\n🔍 {url}")
+                try:
+                    html = await task
+                    items = await extractor.run(parse_listing, html, url) if extractor else parse_listing(html)
+                except Exception as err:
+                    print(f"⚠️ Error: {err}")
+                    schedule()
+                    continue
+
+                if not items:
+                    print("    • ไม่พบข่าวหรือ selector เปลี่ยน")
+                    break
+
+                article_tasks.extend(asyncio.create_task(run_article(item)) for item in items)
+                if stop_after and stop_after(items):
+                    print("    • ถึงข่าวที่เคยดึงแล้ว หยุดไล่หน้าถัดไป")
+                    break
+                schedule()
+
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*article_tasks)
+        finally:
+            for task in article_tasks:
+                task.cancel()
+            queue.put_nowait(done)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (article := await queue.get()) is not done:
+            slots.release()
+            yield article
+        await producer
+    finally:
+        producer.cancel()
+
+async def crawl(page_urls: list, parse_listing, fetch_article, **kwargs) -> list:
+    """เหมือน iter_crawl แต่รวบรวมทุกข่าวเป็น list"""
+    return [article async for article in iter_crawl(page_urls, parse_listing, fetch_article, **kwargs)]
+
+# ─────────────────────────────
+# 🔹 ใช้ async iterator จากโค้ดแบบ sync (เช่น etl_pipeline)
+# ─────────────────────────────
+def iterate_in_thread(*sources, maxsize: int = 32):
+    """
+    รัน async iterator หลายตัวพร้อมกันใน event loop ของ thread แยก
+    แล้ว yield ผลออกมาทีละชิ้นผ่าน queue แบบจำกัดขนาด (backpressure)
+    sources = ฟังก์ชันที่ไม่รับอาร์กิวเมนต์และคืน async iterator
+    """
+    out = queue.Queue(maxsize=maxsize)
+    done = object()
+    stop = threading.Event()
+
+    async def pump(source):
+        async for item in source():
+            if stop.is_set():
+                return
+            await asyncio.to_thread(out.put, item)
+
+    async def main():
+        try:
+            results = await asyncio.gather(*(pump(src) for src in sources), return_exceptions=True)
+            for err in results:
+                if isinstance(err, Exception):
+                    print(f"⚠️ Error: {err}")
+        finally:
+            out.put(done)
+
+    worker = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+    worker.start()
+    try:
+        while (item := out.get()) is not done:
+            yield item
+    finally:
+        stop.set()
+        while worker.is_alive():
+            try:
+                out.get(timeout=0.2)
+            except queue.Empty:
+                pass
@@ -1,5 +1,8 @@
 import re
-from typing import Dict, List
+from collections import Counter
+from typing import Dict
+
+from core.automaton import AhoCorasick
 
 # 🔹 คำที่มักพบในข่าวโรคระบาด
 EPIDEMIC_KEYWORDS = [
@@ -7,21 +10,60 @@ EPIDEMIC_KEYWORDS = [
     "ไข้เลือดออก", "โรคติดต่อ", "โรงพยาบาล", "แพร่ระบาด", "ป้องกัน", "วัคซีน"
 ]
 
+# 🔹 automaton ของ keyword ทั้งหมด สร้างครั้งเดียวตอน import (สแกนข้อความรอบเดียวไม่ว่าจะมีกี่คำ)
+EPIDEMIC_MATCHER = AhoCorasick(kw.lower() for kw in EPIDEMIC_KEYWORDS)
+
 def normalize(text: str) -> str:
-    """ลบช่องว่าง, แปลงเป็น lowercase"""
+    """ลบช่องว่าง, แปลงเป็น lowercase (ค่าที่ไม่ใช่ข้อความ เช่น NaN จาก DataFrame → "")"""
+    if not isinstance(text, str):
+        return ""
     return re.sub(r'\s+', ' ', text).strip().lower()
 
-def contains_keywords(text: str, keywords: List[str]) -> bool:
-    """ตรวจสอบว่า text มีคำใดๆ จาก keyword list"""
-    return any(kw in text for kw in keywords)
-
 def is_epidemic_related(article: Dict) -> bool:
     """
     ตรวจสอบว่าข่าวเกี่ยวข้องกับโรคระบาดไหม
     โดยใช้ title และ content_raw ในการพิจารณา
     """
-    title = normalize(article.get("title", ""))
-    content = normalize(article.get("content_raw", ""))
+    # ✅ เจอใน title แล้วไม่ต้องสแกน content ต่อ
+    if EPIDEMIC_MATCHER.search(normalize(article.get("title", "") or "")):
+        return True
+    return EPIDEMIC_MATCHER.search(normalize(article.get("content_raw", "") or ""))
+
+# ─────────────────────────────
+# 🔹 Batch: คัดกรองทั้ง list หรือ DataFrame พร้อมตำแหน่ง/จำนวนคำที่เจอ
+# ─────────────────────────────
+def match_keywords(article: Dict) -> Dict:
+    """
+    สแกน title และ content_raw ครั้งละรอบเดียว คืน
+    {"relevant": bool, "matches": [(field, ตำแหน่ง, keyword)], "counts": {keyword: จำนวน}}
+    (ตำแหน่งนับบนข้อความหลัง normalize)
+    """
+    matches = []
+    for field in ("title", "content_raw"):
+        text = normalize(article.get(field, "") or "")
+        matches += [(field, pos, kw) for pos, kw in EPIDEMIC_MATCHER.finditer(text)]
+    return {
+        "relevant": bool(matches),
+        "matches": matches,
+        "counts": dict(Counter(kw for _, _, kw in matches)),
+    }
+
+def filter_epidemic_batch(articles):
+    """
+    คัดกรองข่าวทีละหลายข่าว
+    - list[dict]  → list ของข่าวที่เกี่ยวข้อง (เพิ่ม key keyword_matches / keyword_counts)
+    - DataFrame   → DataFrame เฉพาะแถวที่เกี่ยวข้อง (เพิ่มคอลัมน์ keyword_matches / keyword_counts)
+    """
+    if hasattr(articles, "to_dict") and hasattr(articles, "loc"):
+        df = articles
+        results = [match_keywords(row) for row in df.to_dict("records")]
+        df = df.assign(keyword_matches=[r["matches"] for r in results],
+                       keyword_counts=[r["counts"] for r in results])
+        return df.loc[[r["relevant"] for r in results]]
 
-    # ✅ พบคำที่เกี่ยวข้องใน title หรือ content ถือว่าเกี่ยวข้อง
-    return contains_keywords(title, EPIDEMIC_KEYWORDS) or contains_keywords(content, EPIDEMIC_KEYWORDS)
+    out = []
+    for article in articles:
+        result = match_keywords(article)
+        if result["relevant"]:
+            out.append({**article, "keyword_matches": result["matches"], "keyword_counts": result["counts"]})
+    return out
@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, unquote
+
+# ─────────────────────────────
+# 🔹 Crawl frontier: จำ URL ที่เคยดึงแล้วข้ามวัน (SQLite ไฟล์เดียว)
+# ─────────────────────────────
+FRONTIER_PATH = "data/crawl_frontier.db"
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+def normalize_url(url: str) -> str:
+    """ทำ URL ให้อยู่รูปเดียวกัน (host ตัวเล็ก, ถอด %xx, ตัด fragment/tracking param, ตัด / ท้าย)"""
+    parts = urlsplit(url.strip())
+    path = unquote(parts.path).rstrip("/") or "/"
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.startswith(TRACKING_PARAMS)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ""))
+
+class CrawlFrontier:
+    def __init__(self, path: str = FRONTIER_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    source TEXT,
+                    first_seen TEXT,
+                    last_seen TEXT
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    source TEXT PRIMARY KEY,
+                    url TEXT,
+                    date TEXT,
+                    updated_at TEXT
+                )
+            """)
+
+    def __contains__(self, url: str) -> bool:
+        return self.is_known(url)
+
+    def is_known(self, url: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM urls WHERE url = ?", (normalize_url(url),)).fetchone()
+        return row is not None
+
+    def known(self, urls: list[str]) -> set:
+        """คืนเฉพาะ URL (ตามที่ส่งเข้ามา) ที่อยู่ใน frontier แล้ว"""
+        by_norm = {normalize_url(u): u for u in urls}
+        if not by_norm:
+            return set()
+        marks = ",".join("?" * len(by_norm))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT url FROM urls WHERE url IN ({marks})", list(by_norm)).fetchall()
+        return {by_norm[r[0]] for r in rows}
+
+    def mark_seen(self, urls: list[str], source: str):
+        """เพิ่ม URL ใหม่ (first_seen) หรืออัปเดต last_seen ของ URL เดิม"""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO urls (url, source, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET last_seen = excluded.last_seen
+            """, [(normalize_url(u), source, now, now) for u in urls])
+
+    def high_watermark(self, source: str):
+        """ข่าวล่าสุดที่เคยเจอของแต่ละแหล่ง → dict(url, date, updated_at) หรือ None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, date, updated_at FROM watermarks WHERE source = ?", (source,)
+            ).fetchone()
+        return dict(zip(("url", "date", "updated_at"), row)) if row else None
+
+    def update_watermark(self, source: str, url: str, date: str = ""):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO watermarks (source, url, date, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(source) DO UPDATE SET url = excluded.url, date = excluded.date,
+                    updated_at = excluded.updated_at
+            """, (source, normalize_url(url), date, now))
+
+    def close(self):
+        self._conn.close()
+
+# ─────────────────────────────
+# 🔹 เงื่อนไขหยุดไล่หน้า list
+# ─────────────────────────────
+def listing_exhausted(frontier: CrawlFrontier, items: list[dict], source: str) -> bool:
+    """
+    True เมื่อหน้านี้มีแต่ข่าวที่รู้จักแล้ว (หน้า list เรียงใหม่ → เก่า จึงไม่ต้องไล่หน้าถัดไป)
+    ไม่หยุดที่ high-watermark: ข่าวที่ดึงไม่สำเร็จ/เนื้อหาว่างรอบก่อนยังไม่ถูก mark_seen จึงต้องไล่ต่อไปดึงใหม่
+    """
+    if frontier is None or not items:
+        return False
+    urls = [item["url"] for item in items]
+    known = frontier.known(urls)
+    frontier.mark_seen(list(known), source)
+    return len(known) == len(set(urls))
+
+def advance_watermark(frontier: CrawlFrontier, items: list[dict], source: str) -> bool:
+    """
+    ขยับ high-watermark ไปที่ข่าวแรกของหน้า list ล่าสุด เฉพาะเมื่อทุกข่าวในหน้านั้นถูก mark_seen แล้ว
+    (รอบที่มีข่าวดึงไม่สำเร็จจะไม่ขยับ)
+    """
+    if frontier is None or not items:
+        return False
+    if len(frontier.known([item["url"] for item in items])) < len({item["url"] for item in items}):
+        return False
+    frontier.update_watermark(source, items[0]["url"], items[0].get("date", ""))
+    return True
@@ -0,0 +1,200 @@
+import argparse
+import random
+import re
+import time
+from typing import Dict, List, Tuple
+
+from core.automaton import AhoCorasick
+
+# ─────────────────────────────
+# 🔹 Glossary protection: one automaton pass to protect, one regex pass to restore
+# ─────────────────────────────
+PLACEHOLDER_RE = re.compile(r"\[\[GLOSSARY_\d{3}_[^\[\]]*\]\]")
+
+def _is_word(ch: str) -> bool:
+    """Same notion of a word character as `\\w` in Python's re module."""
+    return ch.isalnum() or ch == "_"
+
+def at_word_boundary(text: str, start: int, end: int) -> bool:
+    """True where `\\bterm\\b` would match text[start:end]."""
+    def boundary(i: int) -> bool:
+        left = i > 0 and _is_word(text[i - 1])
+        right = i < len(text) and _is_word(text[i])
+        return left != right
+    return boundary(start) and boundary(end)
+
+class GlossaryEngine:
+    """
+    Protects glossary terms behind `[[GLOSSARY_nnn_Term]]` placeholders before translation
+    and puts the right-language term back afterwards.
+
+    The automaton is built once; each text is scanned once regardless of glossary size.
+    Overlapping terms resolve leftmost-longest, so "โควิด-19" wins over "โควิด".
+    Word boundaries are checked against the original text. The old per-term regex loop checked
+    them against text already rewritten by longer terms, so a short term glued to a longer one
+    was skipped there: "ดร.สมจิตร" now protects both terms ("Dr.Somjit"), where it gave "ดร.Somjit".
+    """
+
+    def __init__(self, glossary: Dict[str, str], glossary_ko: Dict[str, str] = None):
+        self.glossary = glossary
+        self.glossary_ko = glossary_ko or {}
+        self.matcher = AhoCorasick(glossary)
+
+    def protect(self, text: str) -> Tuple[str, Dict[str, Tuple[str, str]]]:
+        """Replace glossary terms with placeholders. Returns (text, placeholder -> (Thai term, English term))."""
+        if not text:
+            return text, {}
+        term_map = {}
+        placeholders = {}
+        parts, pos = [], 0
+        for start, end, term_th in self.matcher.longest_matches(text, at_word_boundary):
+            placeholder = placeholders.get(term_th)
+            if placeholder is None:
+                term_en = self.glossary[term_th]
+                placeholder = f"[[GLOSSARY_{len(placeholders) + 1:03d}_{term_en.replace(' ', '_')}]]"
+                placeholders[term_th] = placeholder
+                term_map[placeholder] = (term_th, term_en)
+            parts.append(text[pos:start])
+            parts.append(placeholder)
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts), term_map
+
+    def restore(self, text: str, term_map: Dict[str, Tuple[str, str]], target_lang: str) -> str:
+        """Swap every placeholder for its term in target_lang (Korean falls back to English)."""
+        if not text or not term_map:
+            return text
+
+        def replacement(match: re.Match) -> str:
+            terms = term_map.get(match.group(0))
+            if terms is None:
+                return match.group(0)
+            term_th, term_en = terms
+            if target_lang == "th":
+                return term_th
+            if target_lang == "en":
+                return term_en
+            if target_lang == "ko":
+                return self.glossary_ko.get(term_en, term_en)
+            return match.group(0)
+
+        return PLACEHOLDER_RE.sub(replacement, text)
+
+class HashtagIndex:
+    """
+    Entity index for hashtag extraction, compiled once from the glossary.
+
+    categories maps a category name (e.g. "country") to its Thai glossary terms. Every Thai,
+    English and Korean surface form of those terms goes into one automaton, so all
+    categories are found in a single case-insensitive scan of the text (longest form wins,
+    so "COVID-19" is not also counted as "COVID").
+    """
+
+    def __init__(self, glossary: Dict[str, str], glossary_ko: Dict[str, str], categories: Dict[str, List[str]]):
+        self.glossary = glossary
+        self.glossary_ko = glossary_ko
+        self.rank = {name: i for i, name in enumerate(categories)}
+        self.entities: Dict[str, List[Tuple[str, str]]] = {}   # surface form -> [(category, Thai term)]
+        for category, terms_th in categories.items():
+            for term_th in terms_th:
+                term_en = glossary.get(term_th, term_th)
+                for surface in dict.fromkeys((term_th, term_en, glossary_ko.get(term_en))):
+                    if surface:
+                        self.entities.setdefault(surface.lower(), []).append((category, term_th))
+        self.matcher = AhoCorasick(self.entities)
+
+    def label(self, term_th: str, lang: str) -> str:
+        term_en = self.glossary.get(term_th, term_th)
+        if lang == "th":
+            tag = term_th
+        elif lang == "ko":
+            tag = self.glossary_ko.get(term_en, term_en)
+        else:
+            tag = term_en
+        return f"#{tag.replace(' ', '')}"
+
+    def extract(self, text: str, lang: str, limit: int = 5) -> List[str]:
+        """Hashtags in lang, ranked by mentions, then category order, then first appearance."""
+        if not text:
+            return []
+        text = text.lower()
+        found = {}   # hashtag -> [mentions, category rank, first position]
+        for start, _, surface in self.matcher.longest_matches(text, at_word_boundary):
+            for category, term_th in self.entities[surface]:
+                tag = self.label(term_th, lang)
+                stats = found.setdefault(tag, [0, self.rank[category], start])
+                stats[0] += 1
+                stats[1] = min(stats[1], self.rank[category])
+        ranked = sorted(found.items(), key=lambda item: (-item[1][0], item[1][1], item[1][2]))
+        return [tag for tag, _ in ranked[:limit]]
+
+# ─────────────────────────────
+# 🔹 Benchmark: per-article cost vs. glossary size (old per-term regex vs. automaton)
+# ─────────────────────────────
+def _regex_protect(glossary: Dict[str, str], text: str) -> Tuple[str, Dict[str, Tuple[str, str]]]:
+    """The previous implementation: sort, then re.search + re.sub once per term."""
+    term_map = {}
+    idx = 1
+    for term_th, term_en in sorted(glossary.items(), key=lambda item: len(item[0]), reverse=True):
+        pattern = r'\b' + re.escape(term_th) + r'\b'
+        if re.search(pattern, text):
+            placeholder = f"[[GLOSSARY_{idx:03d}_{term_en.replace(' ', '_')}]]"
+            term_map[placeholder] = (term_th, term_en)
+            text = re.sub(pattern, placeholder, text)
+            idx += 1
+    return text, term_map
+
+def _synthetic_glossary(size: int, rng: random.Random) -> Dict[str, str]:
+    letters = "กขคงจฉชซญดตถทนบปผพฟมยรลวศสหอฮ"
+    glossary = {}
+    while len(glossary) < size:
+        term = "".join(rng.choice(letters) for _ in range(rng.randint(3, 8)))
+        glossary.setdefault(term, f"Term {len(glossary)}")
+    return glossary
+
+def benchmark(sizes: List[int], articles: int = 20, words: int = 400, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        glossary = _synthetic_glossary(size, rng)
+        terms = list(glossary)
+        # ~5% of words are glossary terms, separated by spaces so \b boundaries hold
+        texts = [" ".join(rng.choice(terms) if rng.random() < 0.05 else "ข่าว" for _ in range(words))
+                 for _ in range(articles)]
+
+        start = time.perf_counter()
+        engine = GlossaryEngine(glossary)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in texts:
+            protected, term_map = engine.protect(text)
+            engine.restore(protected, term_map, "en")
+        automaton_ms = (time.perf_counter() - start) * 1000 / articles
+
+        start = time.perf_counter()
+        for text in texts:
+            protected, term_map = _regex_protect(glossary, text)
+            for placeholder, (_, term_en) in term_map.items():
+                protected = protected.replace(placeholder, term_en)
+        regex_ms = (time.perf_counter() - start) * 1000 / articles
+
+        results.append({"terms": size, "build_ms": build * 1000,
+                        "automaton_ms_per_article": automaton_ms, "regex_ms_per_article": regex_ms})
+    return results
+
+# ─────────────────────────────
+# 🔹 CLI: python -m core.glossary --sizes 100 1000 5000
+# ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark glossary protection cost against glossary size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--articles", type=int, default=20)
+    parser.add_argument("--words", type=int, default=400)
+    args = parser.parse_args()
+
+    print("\n🏁 Glossary benchmark (ms per article, protect + restore)")
+    print(f"   {'terms':>6} {'build':>10} {'automaton':>10} {'regex':>10}")
+    for row in benchmark(args.sizes, args.articles, args.words):
+        print(f"   {row['terms']:>6} {row['build_ms']:>10.1f} "
+              f"{row['automaton_ms_per_article']:>10.3f} {row['regex_ms_per_article']:>10.3f}")
@@ -0,0 +1,88 @@
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Tuple
+
+from core.nlp_utils import DISEASE_KEYWORDS, LOCATION_KEYWORDS
+
+# ─────────────────────────────
+# 🔹 พจนานุกรมแฮชแท็กหลายภาษา (แปลแท็กโดยไม่เรียกโมเดล)
+#   แท็กทุกตัวมาจาก DISEASE_KEYWORDS / LOCATION_KEYWORDS จึงเตรียมคำแปลไว้ได้ตั้งแต่โหลด
+# ─────────────────────────────
+LEXICON_PATH = "data/hashtag_lexicon.json"   # คำแปลที่ได้จากโมเดล (แท็กที่ไม่รู้จัก) เก็บไว้ใช้รอบถัดไป
+
+# คำใน keyword list ที่ไม่มีใน GLOSSARY: tag → {ภาษา: คำแปล}
+EXTRA_TAGS = {
+    "ไทย": {"en": "Thailand", "ko": "태국"},
+    "เกาหลี": {"en": "Korea", "ko": "한국"},
+    "ประเทศ": {"en": "Country", "ko": "국가"},
+    "จังหวัด": {"en": "Province", "ko": "주"},
+    "COVID": {"th": "โควิด", "ko": "코로나"},
+    "covid-19": {"th": "โควิด-19", "ko": "코로나19"},
+    "COVID-19": {"th": "โควิด-19", "ko": "코로나19"},
+}
+
+def _tag(word: str) -> str:
+    return f"#{word.replace(' ', '')}"
+
+class HashtagLexicon:
+    def __init__(self, glossary: Dict[str, str], glossary_ko: Dict[str, str], path: str = LEXICON_PATH):
+        """
+        glossary = ไทย → อังกฤษ, glossary_ko = อังกฤษ → เกาหลี (จาก core.translator)
+        ภาษาเกาหลีหาจากคำอังกฤษ: glossary_ko → EXTRA_TAGS ของคำอังกฤษนั้น (เช่น โควิด → COVID → 코로나)
+        → ไม่มีทั้งคู่ใช้คำอังกฤษแทน (แบบเดียวกับ restore_glossary_terms)
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self.learned: Dict[str, Dict[str, str]] = {}
+        self.model_calls = 0
+        self._lock = threading.Lock()
+
+        for word in DISEASE_KEYWORDS + LOCATION_KEYWORDS:
+            en = EXTRA_TAGS.get(word, {}).get("en") or glossary.get(word) or (word if word.isascii() else None)
+            if en is None:
+                continue
+            self.entries[word] = {
+                "th": word,
+                "en": en,
+                "ko": glossary_ko.get(en) or EXTRA_TAGS.get(en, {}).get("ko", en),
+                **EXTRA_TAGS.get(word, {}),
+            }
+
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.learned = json.load(f)
+            for word, langs in self.learned.items():
+                self.entries.setdefault(word, {}).update(langs)
+
+    def translate_tags(self, tags: List[str], src: str, tgt: str, translate: Callable) -> Tuple[List[str], int]:
+        """แปลแฮชแท็กเป็นภาษา tgt → (แท็ก, จำนวนครั้งที่เรียกโมเดล) เรียกโมเดลเฉพาะแท็กที่ไม่รู้จัก แล้วจำไว้"""
+        out, calls = [], 0
+        for tag in tags:
+            word = tag.lstrip("#")
+            with self._lock:
+                known = self.entries.get(word, {}).get(tgt)
+            if known is None:
+                known = (translate(word, src=src, tgt=tgt) or word).strip().lstrip("#")
+                calls += 1
+                with self._lock:
+                    self.entries.setdefault(word, {src: word})[tgt] = known
+                    self.learned.setdefault(word, {src: word})[tgt] = known
+                    self.model_calls += 1
+            out.append(_tag(known))
+        return out, calls
+
+    def merge(self, learned: Dict[str, Dict[str, str]]):
+        """รวมคำแปลที่ worker process อื่นเรียนรู้มา (โหมด process pool) เพื่อบันทึกรวมกันตอนจบ"""
+        with self._lock:
+            for word, langs in learned.items():
+                self.entries.setdefault(word, {}).update(langs)
+                self.learned.setdefault(word, {}).update(langs)
+
+    def save(self):
+        """บันทึกเฉพาะคำแปลที่ได้จากโมเดล (คำจาก glossary สร้างใหม่ได้ทุกครั้งตอนโหลด)"""
+        if not self.path or not self.learned:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.learned, f, ensure_ascii=False, indent=2)
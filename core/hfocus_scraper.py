@@ -1,10 +1,20 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 import json
 import os
 import re
-import time
-from datetime import datetime
+from urllib.parse import urlparse
+
+from core.extract import ExtractPool, make_soup
+from core.fetcher import AsyncFetcher, http_get, iter_crawl, iterate_in_thread
+from core.frontier import CrawlFrontier, listing_exhausted, advance_watermark
+from core.raw_store import RawNewsStore
+
+BASE_URL = "https://www.hfocus.org"
+LIST_URL = BASE_URL + "/topics/โรคอุบัติใหม่อุบัติซ้ำ?page={}"
+
+# parse เฉพาะ node ที่ใช้จริง (วันที่/เนื้อหา, ลิงก์ข่าวในหน้า list)
+ARTICLE_NODES = SoupStrainer(["span", "article"])
+LISTING_NODES = SoupStrainer("div", class_="views-field-title")
 
 # ─────────────────────────────
 # 🔹 ฟังก์ชันช่วย
@@ -26,27 +36,33 @@ def load_existing_urls(path: str) -> set:
 # ─────────────────────────────
 # 🔹 ดึงเนื้อหา/วันที่จากหน้าเดี่ยว
 # ─────────────────────────────
+def parse_article(html: str) -> tuple[str, str]:
+    """แยกวันที่และเนื้อหาออกจาก HTML ของหน้าข่าว"""
+    soup = make_soup(html, ARTICLE_NODES)
+
+    # วันที่
+    date_tag = soup.select_one("span.field-content")
+    date = clean(date_tag.text) if date_tag else ""
+
+    # เนื้อหา
+    content_div = soup.select_one("article div.field--name-body")
+    content = clean(content_div.get_text(" ", strip=True)) if content_div else ""
+
+    return date, content
+
+def report_content(content: str):
+    if content:
+        print(f"      ✅ เนื้อหา {len(content)} ตัวอักษร")
+    else:
+        print("      • ไม่พบเนื้อหา")
+
 def get_article_content_and_date(article_url: str) -> tuple[str, str]:
     try:
         print(f"    • ดึง: {article_url}")
-        res = requests.get(article_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
+        res = http_get(article_url, use_cache=True)
         res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        # วันที่
-        date_tag = soup.select_one("span.field-content")
-        date = clean(date_tag.text) if date_tag else ""
-
-        # เนื้อหา
-        content_div = soup.select_one("article div.field--name-body")
-        if content_div:
-            raw = content_div.get_text(" ", strip=True)
-            content = clean(raw)
-            print(f"      ✅ เนื้อหา {len(content)} ตัวอักษร")
-        else:
-            content = ""
-            print("      • ไม่พบเนื้อหา")
-
+        date, content = parse_article(res.text)
+        report_content(content)
         return date, content
     except Exception as err:
         print(f"❌ Error @ {article_url} : {err}")
@@ -55,79 +71,98 @@ def get_article_content_and_date(article_url: str) -> tuple[str, str]:
 # ─────────────────────────────
 # 🔹 ดึงข่าวจากหน้า list
 # ─────────────────────────────
-def scrape_hfocus_articles(pages: int = 1, *, existing_urls: set = set()) -> list[dict]:
-    base = "https://www.hfocus.org/topics/โรคอุบัติใหม่อุบัติซ้ำ?page={}"
-    articles = []
+def parse_listing(html: str) -> list[dict]:
+    """ดึงชื่อข่าวและลิงก์จากหน้า list"""
+    soup = make_soup(html, LISTING_NODES)
+    return [
+        {"title": clean(a.get_text()), "url": BASE_URL + a["href"]}
+        for a in soup.select("div.views-field-title h3.field-content a")
+    ]
+
+async def aiter_hfocus_articles(pages: int = 1, *, existing_urls: set = set(), fetcher: AsyncFetcher = None,
+                                frontier: CrawlFrontier = None, extractor: ExtractPool = None):
+    """
+    async iterator: ดึงข่าวจาก Hfocus หลายหน้า/หลายข่าวพร้อมกันผ่าน AsyncFetcher
+    แล้ว yield ทีละข่าวทันทีที่ parse เสร็จ (จำกัด concurrency และ rate ต่อ host แทนการ sleep)
+    ถ้าส่ง frontier มา จะข้ามข่าวที่เคยดึงแล้ว และหยุดไล่หน้าเมื่อเจอแต่ข่าวเก่า
+    (ผู้เรียกเป็นคน mark_seen หลังบันทึกข่าวสำเร็จ ข่าวที่ประมวลผลไม่สำเร็จจะถูกดึงใหม่รอบหน้า)
+    การ parse HTML ทำใน ExtractPool (process แยก) และรายงานเวลา parse ตอนจบ
+    """
+    fetcher = fetcher or AsyncFetcher()
+    pool = extractor or ExtractPool()
+    newest = []
+
+    async def fetch_article(item: dict):
+        link = item["url"]
+        if link in existing_urls or (frontier is not None and link in frontier):
+            print(f"      • ข้ามข่าวซ้ำ: {link}")
+            return None
 
-    for page in range(pages):
-        url = base.format(page)
-        print(f"\n🔍 หน้า {page+1}: {url}")
         try:
-            res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
-            res.raise_for_status()
-            soup = BeautifulSoup(res.text, "html.parser")
-
-            links = soup.select("div.views-field-title h3.field-content a")
-            if not links:
-                print("    • ไม่พบข่าวหรือ selector เปลี่ยน")
-                break
-
-            for a in links:
-                link = "https://www.hfocus.org" + a["href"]
-                if link in existing_urls:
-                    print(f"      • ข้ามข่าวซ้ำ: {link}")
-                    continue
-
-                title = clean(a.get_text())
-                date, content_raw = get_article_content_and_date(link)
-
-                articles.append({
-                    "source": "hfocus",
-                    "title": title,
-                    "url": link,
-                    "date": date,
-                    "content_raw": content_raw,   # ✅ ใช้ content_raw
-                    "content_translated": None,
-                    "summary": None,
-                    "language": "th",
-                    "is_translated": False,
-                    "is_summarized": False
-                })
-
-                time.sleep(0.5)  # ถนอมเซิร์ฟเวอร์
-
-        except requests.exceptions.RequestException as http_err:
-            print(f"⚠️ HTTP Error: {http_err}")
+            print(f"    • ดึง: {link}")
+            html = await fetcher.get_text(link, use_cache=True)
+            date, content_raw = await pool.run(parse_article, html, link)
+            report_content(content_raw)
         except Exception as err:
-            print(f"⚠️ Error: {err}")
-
-        time.sleep(2)
-
-    return articles
+            print(f"❌ Error @ {link} : {err}")
+            date, content_raw = "", ""
+
+        # ❗ ข่าวที่ไม่มีเนื้อหาไม่ส่งต่อ (จะได้ไม่เสียเวลาแปล/สรุปข้อความว่าง) และไม่จำใน frontier เพื่อดึงใหม่รอบหน้า
+        if not content_raw:
+            fetcher.metrics.incr(urlparse(link).netloc, "empty_bodies")
+            return None
+
+        return {
+            "source": "hfocus",
+            "title": item["title"],
+            "url": link,
+            "date": date,
+            "content_raw": content_raw,   # ✅ ใช้ content_raw
+            "content_translated": None,
+            "summary": None,
+            "language": "th",
+            "is_translated": False,
+            "is_summarized": False
+        }
+
+    def stop_after(items: list[dict]) -> bool:
+        if not newest:
+            newest.append(items)
+        return listing_exhausted(frontier, items, "hfocus")
+
+    page_urls = [LIST_URL.format(page) for page in range(pages)]
+    try:
+        async for article in iter_crawl(page_urls, parse_listing, fetch_article, fetcher=fetcher,
+                                        extractor=pool, stop_after=stop_after):
+            yield article
+        if newest:
+            advance_watermark(frontier, newest[0], "hfocus")
+    finally:
+        pool.print_report()
+        fetcher.metrics.print_report()
+        if extractor is None:
+            pool.close()
+
+def iter_hfocus_articles(pages: int = 1, **kwargs):
+    """generator แบบ sync ของ aiter_hfocus_articles (ดึงใน thread แยก, ได้ข่าวแรกทันที)"""
+    return iterate_in_thread(lambda: aiter_hfocus_articles(pages, **kwargs))
+
+def scrape_hfocus_articles(pages: int = 1, *, existing_urls: set = set(), fetcher: AsyncFetcher = None,
+                           frontier: CrawlFrontier = None, extractor: ExtractPool = None) -> list[dict]:
+    """ดึงข่าวจาก Hfocus ทั้งหมดเป็น list (ดู aiter_hfocus_articles)"""
+    return list(iter_hfocus_articles(pages, existing_urls=existing_urls, fetcher=fetcher,
+                                     frontier=frontier, extractor=extractor))
 
 # ─────────────────────────────
-# 🔹 Main: ใช้ดึงแล้วเซฟเป็นไฟล์ JSON
+# 🔹 Main: ดึงแล้วต่อท้ายลง raw news store (gzip JSONL)
 # ─────────────────────────────
 if __name__ == "__main__":
     print("🚀 เริ่มดึงข่าวจาก Hfocus.org …")
 
-    today = datetime.now().strftime("%Y%m%d")
-    save_dir = "data/raw_news"
-    os.makedirs(save_dir, exist_ok=True)
-    save_path = os.path.join(save_dir, f"hfocus_news_{today}.json")
-
-    existing = load_existing_urls(save_path)
-    new_articles = scrape_hfocus_articles(pages=20, existing_urls=existing)
+    store = RawNewsStore()
+    new_articles = scrape_hfocus_articles(pages=20, existing_urls=store)
 
     print(f"\n✅ ข่าวใหม่ {len(new_articles)} รายการ")
 
-    # รวมกับข่าวเก่าถ้ามี
-    all_articles = new_articles
-    if os.path.exists(save_path):
-        with open(save_path, encoding="utf-8") as f:
-            all_articles = json.load(f) + new_articles
-
-    with open(save_path, "w", encoding="utf-8") as f:
-        json.dump(all_articles, f, ensure_ascii=False, indent=2)
-
-    print(f"📝 บันทึกทั้งหมด {len(all_articles)} ข่าว → {save_path}")
+    store.append(new_articles)
+    print(f"📝 บันทึกทั้งหมด {len(store)} ข่าว → {store.segment_dir}")
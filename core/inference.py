@@ -0,0 +1,72 @@
+import logging
+import os
+import re
+
+import torch
+from transformers import AutoModelForSeq2SeqLM
+
+from core.quantize import load_seq2seq
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────
+# 🔹 Inference backends: eager PyTorch or exported ONNX Runtime graphs
+# ─────────────────────────────
+# INFERENCE_BACKEND=onnx runs the translator and summarizer on ONNX Runtime
+# (encoder + decoder graphs with past key values, exported once into ONNX_DIR).
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "pytorch")
+ONNX_DIR = "models/onnx"
+
+class TorchBackend:
+    name = "pytorch"
+
+    def __init__(self, model_name: str, model_cls=AutoModelForSeq2SeqLM, device: torch.device = None,
+                 quantize: bool = False):
+        self.device = device or torch.device("cpu")
+        self.model = load_seq2seq(model_name, model_cls, quantize=quantize).to(self.device)
+
+    def generate(self, **kwargs) -> torch.Tensor:
+        with torch.no_grad():
+            return self.model.generate(**kwargs)
+
+class OnnxBackend:
+    """
+    ONNX Runtime via optimum: the model is exported on first use to ONNX_DIR/<model> with
+    use_cache=True, so decoding reuses past key values instead of re-running the whole prefix.
+    """
+    name = "onnx"
+
+    def __init__(self, model_name: str, onnx_dir: str = ONNX_DIR):
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        self.device = torch.device("cpu")
+        path = os.path.join(onnx_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+        if os.path.isdir(path):
+            self.model = ORTModelForSeq2SeqLM.from_pretrained(path, use_cache=True)
+        else:
+            logger.info(f"Exporting {model_name} to ONNX at {path} (first run only)")
+            self.model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True)
+            self.model.save_pretrained(path)
+
+    def generate(self, **kwargs) -> torch.Tensor:
+        return self.model.generate(**kwargs)
+
+def make_backend(model_name: str, model_cls=AutoModelForSeq2SeqLM, backend: str = INFERENCE_BACKEND,
+                 device: torch.device = None, quantize: bool = False):
+    """
+    Build the configured backend. ONNX Runtime is optional: without optimum/onnxruntime
+    installed (or on a GPU device) this falls back to PyTorch with a warning.
+    """
+    if backend == "onnx":
+        if device is not None and device.type != "cpu":
+            logger.warning("ONNX backend is CPU-only here; using PyTorch on the GPU instead.")
+        else:
+            try:
+                if quantize:
+                    logger.warning("int8 dynamic quantization applies to the PyTorch backend only; ignored for ONNX.")
+                return OnnxBackend(model_name)
+            except ImportError as e:
+                logger.warning(f"ONNX backend unavailable ({str(e)}; pip install -r requirements-onnx.txt); falling back to PyTorch.")
+    elif backend != "pytorch":
+        logger.warning(f"Unknown inference backend '{backend}'; using PyTorch.")
+    return TorchBackend(model_name, model_cls, device=device, quantize=quantize)
@@ -0,0 +1,270 @@
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────
+# 🔹 Local inference service: one process holds the models, ETL workers send requests
+# ─────────────────────────────
+# INFERENCE_SERVICE=unix:/tmp/epidemic-inference.sock (or 127.0.0.1:8765) makes etl_pipeline use the
+# running service instead of loading models in-process. Protocol: one JSON object per line each way.
+INFERENCE_SERVICE = os.environ.get("INFERENCE_SERVICE", "")
+DEFAULT_ADDRESS = "unix:/tmp/epidemic-inference.sock"
+MAX_BATCH = 16          # requests coalesced into one model call
+MAX_WAIT_MS = 20        # how long the first request in a batch waits for company
+STATS_INTERVAL = 60     # seconds between stats lines on the server (0 = off)
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """"unix:/path" → (AF_UNIX, path), "host:port" → (AF_INET, (host, port))"""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+class DynamicBatcher:
+    """
+    Collects submitted payloads on a queue; a single worker thread takes the first one, waits up to
+    max_wait for more (or until max_batch) and hands the whole list to handler(payloads) -> results.
+    """
+    def __init__(self, name: str, handler: Callable[[List[Dict]], List], max_batch: int = MAX_BATCH,
+                 max_wait_ms: float = MAX_WAIT_MS):
+        self.name = name
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._sizes = Counter()
+        self._requests = self._errors = 0
+        self._wait_s = self._busy_s = 0.0
+        self._thread = threading.Thread(target=self._loop, name=f"batcher-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: Dict) -> Future:
+        future = Future()
+        self.queue.put((payload, future, time.perf_counter()))
+        return future
+
+    def _loop(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run(batch)
+
+    def _run(self, batch: List[Tuple[Dict, Future, float]]):
+        start = time.perf_counter()
+        try:
+            results = self.handler([payload for payload, _, _ in batch])
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+            failed = 0
+        except Exception as e:
+            logger.error(f"{self.name} batch of {len(batch)} failed: {str(e)}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            failed = len(batch)
+        with self._lock:
+            self._sizes[len(batch)] += 1
+            self._requests += len(batch)
+            self._errors += failed
+            self._wait_s += sum(start - queued for _, _, queued in batch)
+            self._busy_s += time.perf_counter() - start
+
+    def stats(self) -> Dict:
+        with self._lock:
+            batches = sum(self._sizes.values())
+            return {
+                "queue_depth": self.queue.qsize(),
+                "requests": self._requests,
+                "errors": self._errors,
+                "batches": batches,
+                "mean_batch": self._requests / batches if batches else 0.0,
+                "max_batch": max(self._sizes) if self._sizes else 0,
+                "batch_sizes": dict(sorted(self._sizes.items())),
+                "mean_wait_ms": 1000 * self._wait_s / self._requests if self._requests else 0.0,
+                "busy_s": self._busy_s,
+            }
+
+# ─────────────────────────────
+# 🔹 Batch handlers over the in-process models (loaded once by the service)
+# ─────────────────────────────
+def _translate_batch(payloads: List[Dict]) -> List[str]:
+    from core.translator import translate_many
+    return translate_many([(p["text"], p.get("src", "th"), p.get("tgt", "en")) for p in payloads])
+
+def _summarize_batch(payloads: List[Dict]) -> List[str]:
+    from core.summarizer import summarize_many
+    results = [""] * len(payloads)
+    by_lang: Dict[str, List[int]] = {}
+    for i, p in enumerate(payloads):
+        by_lang.setdefault(p.get("lang", "en"), []).append(i)
+    for lang, indices in by_lang.items():
+        for i, summary in zip(indices, summarize_many([payloads[i]["text"] for i in indices], lang)):
+            results[i] = summary
+    return results
+
+DEFAULT_HANDLERS = {"translate": _translate_batch, "summarize": _summarize_batch}
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                op = request.pop("op")
+                if op == "stats":
+                    response = {"result": self.server.service.stats()}
+                else:
+                    response = {"result": self.server.service.submit(op, request).result()}
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {str(e)}"}
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128 # every ETL worker thread of every process connects at start-up
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+class InferenceService:
+    """One batcher per operation; every client connection gets a thread that waits on its futures."""
+    def __init__(self, handlers: Dict[str, Callable] = None, max_batch: int = MAX_BATCH,
+                 max_wait_ms: float = MAX_WAIT_MS):
+        self.batchers = {op: DynamicBatcher(op, handler, max_batch, max_wait_ms)
+                         for op, handler in (handlers or DEFAULT_HANDLERS).items()}
+        self.started = time.time()
+
+    def submit(self, op: str, payload: Dict) -> Future:
+        if op not in self.batchers:
+            raise ValueError(f"unknown op '{op}'")
+        return self.batchers[op].submit(payload)
+
+    def stats(self) -> Dict:
+        return {"uptime_s": time.time() - self.started, **{op: b.stats() for op, b in self.batchers.items()}}
+
+    def make_server(self, address: str = DEFAULT_ADDRESS) -> socketserver.BaseServer:
+        family, target = parse_address(address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(target):
+                os.unlink(target) # stale socket from a previous run
+            server = _UnixServer(target, _RequestHandler)
+        else:
+            server = _TCPServer(target, _RequestHandler)
+        server.service = self
+        return server
+
+    def _report(self, interval: float):
+        while True:
+            time.sleep(interval)
+            for op, s in self.stats().items():
+                if isinstance(s, dict) and s["requests"]:
+                    print(f"📊 {op}: queue {s['queue_depth']}, {s['requests']} requests in {s['batches']} batches "
+                          f"(mean {s['mean_batch']:.1f}, max {s['max_batch']}), wait {s['mean_wait_ms']:.0f} ms")
+
+    def serve_forever(self, address: str = DEFAULT_ADDRESS, stats_interval: float = STATS_INTERVAL):
+        server = self.make_server(address)
+        if stats_interval:
+            threading.Thread(target=self._report, args=(stats_interval,), daemon=True).start()
+        print(f"🛰️ Inference service listening on {address}")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+class InferenceClient:
+    """
+    Thread-safe client (one connection per calling thread). translate/summarize match the
+    signatures of core.translator.translate and core.summarizer.summarize, so they drop into execute_plan.
+    """
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 600):
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            family, target = parse_address(self.address)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(target)
+            conn = self._local.conn = (sock, sock.makefile("rb"))
+        return conn
+
+    def call(self, op: str, **payload):
+        sock, reader = self._connection()
+        try:
+            sock.sendall((json.dumps({"op": op, **payload}, ensure_ascii=False) + "\n").encode("utf-8"))
+            line = reader.readline()
+        except OSError:
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise ConnectionError(f"inference service at {self.address} closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    def translate(self, text: str, src: str = "th", tgt: str = "en") -> str:
+        return self.call("translate", text=text, src=src, tgt=tgt)
+
+    def summarize(self, text: str, lang: str = "en") -> str:
+        return self.call("summarize", text=text, lang=lang)
+
+    def stats(self) -> Dict:
+        return self.call("stats")
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+            self._local.conn = None
+
+# ─────────────────────────────
+# 🔹 CLI
+#   python -m core.inference_service serve --address unix:/tmp/epidemic-inference.sock
+#   python -m core.inference_service stats --address 127.0.0.1:8765
+# ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared translation/summarization service with dynamic batching")
+    parser.add_argument("command", choices=["serve", "stats"])
+    parser.add_argument("--address", default=INFERENCE_SERVICE or DEFAULT_ADDRESS)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--stats-interval", type=float, default=STATS_INTERVAL)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        from core import summarizer, translator
+        print(f"🔥 Warm-up: translator {translator.warm_up():.1f}s, summarizer {summarizer.warm_up():.1f}s")
+        InferenceService(max_batch=args.max_batch, max_wait_ms=args.max_wait_ms) \
+            .serve_forever(args.address, stats_interval=args.stats_interval)
+    else:
+        print(json.dumps(InferenceClient(args.address).stats(), ensure_ascii=False, indent=2))
@@ -0,0 +1,83 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+# ─────────────────────────────
+# 🔹 แผนการเรียกโมเดลต่อข่าว (DAG ของผลลัพธ์ที่ต้องใช้)
+#   content → content_en (pivot) → content_ko / content_th
+#                   └→ summary_en (สรุปครั้งเดียว) → summary_ko / summary_th
+#   hashtags (ไทย, ไม่ใช้โมเดล) → hashtags_en / hashtags_ko (พจนานุกรมก่อน แท็กที่ไม่รู้จักแปลทีละแท็ก)
+# ─────────────────────────────
+TARGET_LANGS = ("en", "ko", "th")
+HASHTAG_LANG = "th"   # generate_hashtags คืนแฮชแท็กภาษาไทยเสมอ
+
+# step = (op, input step, src, tgt)
+#   op: "input" | "copy" | "translate" | "translate_list" | "summarize"
+Step = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+def build_plan(source_lang: str, targets=TARGET_LANGS) -> Dict[str, Step]:
+    """สร้าง DAG ตามลำดับ dependency (dict เรียงตามลำดับที่ต้องคำนวณอยู่แล้ว)"""
+    plan: Dict[str, Step] = {"content": ("input", None, None, None), "hashtags": ("input", None, None, None)}
+
+    # pivot ภาษาอังกฤษ: ถ้าต้นฉบับเป็นอังกฤษอยู่แล้วก็ไม่ต้องแปล
+    plan["content_en"] = ("copy", "content", None, None) if source_lang == "en" \
+        else ("translate", "content", source_lang, "en")
+    for tgt in targets:
+        if tgt == "en":
+            continue
+        # ภาษาเดียวกับต้นฉบับ → ใช้ต้นฉบับเลย, ภาษาอื่น → แปลจาก pivot แทนการแปลจากต้นฉบับใหม่
+        plan[f"content_{tgt}"] = ("copy", "content", None, None) if tgt == source_lang \
+            else ("translate", "content_en", "en", tgt)
+
+    plan["summary_en"] = ("summarize", "content_en", "en", None)
+    for tgt in targets:
+        if tgt != "en":
+            plan[f"summary_{tgt}"] = ("translate", "summary_en", "en", tgt)
+
+    for tgt in targets:
+        plan[f"hashtags_{tgt}"] = ("copy", "hashtags", None, None) if tgt == HASHTAG_LANG \
+            else ("translate_list", "hashtags", HASHTAG_LANG, tgt)
+    return plan
+
+def naive_calls(targets=TARGET_LANGS, n_hashtags: int = 0) -> int:
+    """จำนวนครั้งที่เรียกโมเดลแบบเดิม: แปลเนื้อหาทุกภาษา + สรุป 1 + แปลสรุป + แปลแฮชแท็กทีละอัน"""
+    others = [t for t in targets if t != "en"]
+    return len(targets) + 1 + len(others) + n_hashtags * len([t for t in targets if t != HASHTAG_LANG])
+
+def _translate_list(items: List[str], src: str, tgt: str, translate: Callable) -> Tuple[List[str], int]:
+    """
+    แปลทีละแท็ก (tokenizer ของ flan-t5 ไม่มี token ขึ้นบรรทัดใหม่ ถ้ารวมเป็นข้อความเดียว
+    ผลลัพธ์จะกลับมาเป็นบรรทัดเดียวและแยกคืนเป็นรายแท็กไม่ได้)
+    """
+    words = [item.lstrip("#") for item in items]
+    lines = [(translate(word, src=src, tgt=tgt) or word).strip() for word in words]
+    return [f"#{line.lstrip('#').replace(' ', '')}" for line in lines], len(words)
+
+def execute_plan(plan: Dict[str, Step], inputs: Dict, translate: Callable, summarize: Callable,
+                 lexicon=None) -> Tuple[Dict, Dict]:
+    """
+    รันแผนตามลำดับ คืน (ผลลัพธ์ทุก node, สถิติ)
+    สถิติ = calls (เรียกโมเดลจริง), skipped (copy แทนการแปล), naive (แบบเดิม), saved
+    ถ้าส่ง lexicon (HashtagLexicon) มา แฮชแท็กจะแปลจากพจนานุกรมก่อน เรียกโมเดลเฉพาะแท็กที่ไม่รู้จัก
+    """
+    values = dict(inputs)
+    calls = skipped = 0
+    for name, (op, source, src, tgt) in plan.items():
+        if op == "input":
+            values.setdefault(name, [] if name == "hashtags" else "")
+        elif op == "copy":
+            values[name] = values[source]
+            skipped += 1
+        elif op == "summarize":
+            values[name] = summarize(values[source], lang=src) if values[source] else ""
+            calls += bool(values[source])
+        elif op == "translate":
+            values[name] = translate(values[source], src=src, tgt=tgt) if values[source] else ""
+            calls += bool(values[source])
+        elif op == "translate_list":
+            if lexicon is not None:
+                values[name], n = lexicon.translate_tags(values[source], src, tgt, translate)
+            else:
+                values[name], n = _translate_list(values[source], src, tgt, translate)
+            calls += n
+    targets = [name.split("_", 1)[1] for name in plan if name.startswith("content_")]
+    naive = naive_calls(targets, len(values.get("hashtags") or []))
+    return values, {"calls": calls, "skipped": skipped, "naive": naive, "saved": max(naive - calls, 0)}
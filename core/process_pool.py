@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# ─────────────────────────────
+# 🔹 โหมด process pool: แบ่งข่าวให้ worker หลาย process (โหลดโมเดลครั้งเดียวต่อ process)
+#   ETL_PROCESSES=auto → เลือกจำนวน process จากจำนวน core จริง + RAM ที่เหลือ
+#   ETL_PROCESSES=3    → กำหนดเอง, ไม่ตั้ง → ใช้ thread pool ใน process เดียวเหมือนเดิม
+# ─────────────────────────────
+ETL_PROCESSES = os.environ.get("ETL_PROCESSES", "")
+
+# RAM ต่อ worker โดยประมาณ (flan-t5-large + bart-large-cnn + tokenizer/buffer)
+WORKER_MEMORY_GB = {"fp32": 6.0, "int8": 2.5}
+MEMORY_HEADROOM_GB = 1.0   # เผื่อให้ process หลัก (scraper, dedup, DB)
+
+def physical_cores() -> int:
+    """จำนวน core จริง (ไม่นับ hyper-thread) ที่ process นี้ใช้ได้"""
+    try:
+        allowed = os.sched_getaffinity(0)
+    except AttributeError:
+        allowed = set(range(os.cpu_count() or 1))
+    cores = set()
+    for cpu in allowed:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/core_id") as f:
+                core_id = f.read().strip()
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/physical_package_id") as f:
+                package_id = f.read().strip()
+            cores.add((package_id, core_id))
+        except OSError:
+            cores.add(("cpu", cpu)) # ไม่มี sysfs (เช่น macOS/container บางแบบ) → นับ logical cpu
+    return max(1, len(cores))
+
+def available_memory_gb() -> Optional[float]:
+    """MemAvailable จาก /proc/meminfo (None ถ้าอ่านไม่ได้)"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024 / 1024
+    except OSError:
+        pass
+    return None
+
+def plan_workers(requested: str = ETL_PROCESSES, quantized: bool = None) -> Tuple[int, int]:
+    """
+    → (จำนวน worker process, torch threads ต่อ worker) ให้ workers × threads = จำนวน core จริง
+    auto: worker เยอะสุดเท่าที่ core และ RAM รับไหว (อย่างน้อย 1)
+    """
+    if quantized is None:
+        quantized = os.environ.get("QUANTIZED_INFERENCE", "0") == "1"
+    cores = physical_cores()
+    if requested and requested != "auto":
+        workers = max(1, int(requested))
+    else:
+        workers = cores
+        memory = available_memory_gb()
+        if memory is not None:
+            per_worker = WORKER_MEMORY_GB["int8" if quantized else "fp32"]
+            workers = min(workers, int((memory - MEMORY_HEADROOM_GB) // per_worker))
+        workers = max(1, workers)
+    return workers, max(1, cores // workers)
+
+# ─────────────────────────────
+# 🔹 ฝั่ง worker process
+# ─────────────────────────────
+_lexicon = None
+
+def _init_worker(threads: int):
+    """ตั้งจำนวน thread ของ torch ก่อนโหลดโมเดล แล้ว warm-up ทั้งสองโมเดลครั้งเดียวต่อ process"""
+    global _lexicon
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    import torch
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+    from core import summarizer, translator
+    from core.hashtag_lexicon import HashtagLexicon
+    _lexicon = HashtagLexicon(translator.GLOSSARY, translator.GLOSSARY_KO)
+    try:
+        seconds = translator.warm_up() + summarizer.warm_up()
+        print(f"🔥 worker {os.getpid()}: โหลดโมเดลเสร็จใน {seconds:.1f} วินาที ({threads} threads)")
+    except Exception as e:
+        print(f"[⚠️] worker {os.getpid()}: warm-up ไม่สำเร็จ จะโหลดตอนใช้งานแทน: {e}")
+
+def _started() -> int:
+    return os.getpid()
+
+def _run_plan(lang: str, raw: str, hashtags: List[str]) -> Tuple[Dict, Dict, Dict]:
+    """execute_plan ใน worker → (ผลลัพธ์, สถิติ, คำแปลแฮชแท็กที่เพิ่งเรียนรู้ของข่าวนี้)"""
+    from core.plan import build_plan, execute_plan
+    from core.summarizer import summarize
+    from core.translator import translate
+
+    outputs, calls = execute_plan(build_plan(lang), {"content": raw, "hashtags": hashtags},
+                                  translate, summarize, lexicon=_lexicon)
+    words = {tag.lstrip("#") for tag in hashtags}
+    learned = {word: langs for word, langs in _lexicon.learned.items() if word in words}
+    return outputs, calls, learned
+
+# ─────────────────────────────
+# 🔹 ฝั่ง process หลัก
+# ─────────────────────────────
+class ArticlePool:
+    """
+    ProcessPoolExecutor แบบ fork: worker ทุกตัวถูก fork ตอน submit ครั้งแรก (ใน __init__)
+    จึงต้องสร้างก่อนที่ process หลักจะเริ่ม thread อื่น ๆ (scraper, warm-up)
+    """
+    def __init__(self, requested: str = ETL_PROCESSES):
+        self.workers, self.threads = plan_workers(requested)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("fork"),
+                                            initializer=_init_worker, initargs=(self.threads,))
+        self.executor.submit(_started)
+
+    @classmethod
+    def from_env(cls) -> Optional["ArticlePool"]:
+        """คืน ArticlePool ถ้าตั้ง ETL_PROCESSES ไว้ และระบบรองรับ fork (ไม่งั้นคืน None = โหมด thread)"""
+        if not ETL_PROCESSES:
+            return None
+        if "fork" not in multiprocessing.get_all_start_methods():
+            print("[⚠️] ระบบนี้ไม่รองรับ fork → ใช้ thread pool แทน")
+            return None
+        return cls(ETL_PROCESSES)
+
+    def run_plan(self, lang: str, raw: str, hashtags: List[str], lexicon=None) -> Tuple[Dict, Dict]:
+        """ส่งข่าวไปให้ worker (เรียกจาก thread ของ bounded_map ได้พร้อมกันหลายข่าว)"""
+        outputs, calls, learned = self.executor.submit(_run_plan, lang, raw, hashtags).result()
+        if lexicon is not None and learned:
+            lexicon.merge(learned)
+        return outputs, calls
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,220 @@
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+# ─────────────────────────────
+# 🔹 Raw news store: ต่อท้ายไฟล์ JSONL บีบอัด (gzip) + index ตาม URL/วันที่
+# ─────────────────────────────
+# โครงสร้างบนดิสก์
+#   data/raw_news/segments/raw-YYYYMMDD-NNNN.jsonl.gz   ← ต่อท้ายทีละก้อน (gzip member)
+#   data/raw_news/index.db                              ← url → (segment, offset, line)
+# การเขียนแต่ละครั้งเป็น gzip member ใหม่ต่อท้ายไฟล์ จึงไม่ต้องอ่าน/เขียนไฟล์เดิมซ้ำ
+RAW_DIR = "data/raw_news"
+SEGMENT_MAX_BYTES = 8 * 1024 * 1024
+COMPACT_MEMBER_SIZE = 500
+# RAW_COMPACT_DAYS=N → segment ที่เก่ากว่า N วันถูกรวมหลังจบ ETL แต่ละรอบ (0 = ไม่ compact อัตโนมัติ)
+RAW_COMPACT_DAYS = int(os.environ.get("RAW_COMPACT_DAYS", "30"))
+
+class RawNewsStore:
+    def __init__(self, root: str = RAW_DIR, segment_max_bytes: int = SEGMENT_MAX_BYTES):
+        self.root = root
+        self.segment_dir = os.path.join(root, "segments")
+        self.segment_max_bytes = segment_max_bytes
+        os.makedirs(self.segment_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "index.db"), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT PRIMARY KEY,
+                    source TEXT,
+                    article_date TEXT,
+                    stored_date TEXT,
+                    segment TEXT,
+                    offset INTEGER,
+                    line INTEGER
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_stored ON articles (stored_date)")
+
+    # ─────────── เขียน ───────────
+    def _current_segment(self, day: str) -> str:
+        prefix = f"raw-{day}-"
+        names = sorted(n for n in os.listdir(self.segment_dir) if n.startswith(prefix))
+        if names:
+            last = names[-1]
+            if os.path.getsize(os.path.join(self.segment_dir, last)) < self.segment_max_bytes:
+                return last
+            seq = int(last[len(prefix):len(prefix) + 4]) + 1
+        else:
+            seq = 0
+        return f"{prefix}{seq:04d}.jsonl.gz"
+
+    def _write_member(self, segment: str, articles: List[Dict]) -> int:
+        """ต่อท้าย gzip member ใหม่ 1 ก้อน คืน byte offset ของ member นั้น"""
+        data = "".join(json.dumps(a, ensure_ascii=False) + "\n" for a in articles)
+        with open(os.path.join(self.segment_dir, segment), "ab") as f:
+            offset = f.tell()
+            f.write(gzip.compress(data.encode("utf-8")))
+        return offset
+
+    def append(self, articles: List[Dict]) -> int:
+        """เพิ่มข่าวใหม่ (ข่าว URL เดิมจะถูกแทนด้วยฉบับล่าสุด ส่วนฉบับเก่ารอ compact)"""
+        articles = [a for a in articles if a.get("url")]
+        if not articles:
+            return 0
+        day = datetime.now().strftime("%Y%m%d")
+        stored_date = datetime.now().strftime("%Y-%m-%d")
+        with self._lock:
+            segment = self._current_segment(day)
+            offset = self._write_member(segment, articles)
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(a["url"], a.get("source"), a.get("date"), stored_date, segment, offset, i)
+                     for i, a in enumerate(articles)],
+                )
+        return len(articles)
+
+    # ─────────── อ่าน ───────────
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM articles WHERE url = ?", (url,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def _read_line(self, segment: str, offset: int, line: int) -> Dict:
+        with open(os.path.join(self.segment_dir, segment), "rb") as f:
+            f.seek(offset)
+            with gzip.GzipFile(fileobj=f) as gz:
+                for i, raw in enumerate(gz):
+                    if i == line:
+                        return json.loads(raw)
+        return None
+
+    def get(self, url: str):
+        """อ่านข่าว 1 ข่าวตาม URL (seek ไปที่ member ตรง ๆ ไม่ต้องอ่านทั้งไฟล์)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT segment, offset, line FROM articles WHERE url = ?", (url,)
+            ).fetchone()
+        return self._read_line(*row) if row else None
+
+    def iter_articles(self, since: str = None, until: str = None, source: str = None) -> Iterator[Dict]:
+        """
+        อ่านข่าวแบบ streaming ตามวันที่เก็บ (YYYY-MM-DD) สำหรับ replay/ประมวลผลซ้ำ
+        อ่านเฉพาะ segment ที่มีข่าวในช่วงนั้น และข้ามฉบับเก่าที่ถูกแทนแล้ว
+        """
+        query = "SELECT segment, offset, line FROM articles WHERE 1=1"
+        params = []
+        if since:
+            query += " AND stored_date >= ?"
+            params.append(since)
+        if until:
+            query += " AND stored_date <= ?"
+            params.append(until)
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        with self._lock:
+            live = {}
+            for segment, offset, line in self._conn.execute(query, params):
+                live.setdefault(segment, set()).add((offset, line))
+
+        for segment in sorted(live):
+            yield from self._scan_segment(segment, live[segment])
+
+    def _scan_segment(self, segment: str, wanted: set) -> Iterator[Dict]:
+        path = os.path.join(self.segment_dir, segment)
+        with open(path, "rb") as f:
+            for offset in sorted({o for o, _ in wanted}):
+                f.seek(offset)
+                gz = gzip.GzipFile(fileobj=f)
+                # อ่านเฉพาะ member นี้: หยุดเมื่อครบบรรทัดที่ต้องการ
+                lines = {l for o, l in wanted if o == offset}
+                last = max(lines)
+                for i, raw in enumerate(gz):
+                    if i in lines:
+                        yield json.loads(raw)
+                    if i >= last:
+                        break
+
+    # ─────────── compact ───────────
+    def compact(self, older_than_days: int = RAW_COMPACT_DAYS) -> int:
+        """
+        รวม segment ที่เก่ากว่า N วันเป็นไฟล์เดียว ตัดข่าวฉบับที่ถูกแทนแล้วทิ้ง
+        แล้วลบ segment เดิม คืนจำนวนข่าวที่ย้าย
+        """
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).strftime("%Y%m%d")
+        with self._lock:
+            old = sorted(n for n in os.listdir(self.segment_dir)
+                         if n.startswith("raw-") and n[4:12] < cutoff)
+            if not old:
+                return 0
+
+            target = f"compact-{old[0][4:12]}-{old[-1][4:12]}-{datetime.now():%H%M%S}.jsonl.gz"
+            moved = 0
+            buffer = []
+
+            def flush():
+                offset = self._write_member(target, [article for _, article in buffer])
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE articles SET segment = ?, offset = ?, line = ? WHERE url = ?",
+                        [(target, offset, i, url) for i, (url, _) in enumerate(buffer)],
+                    )
+                buffer.clear()
+
+            for segment in old:
+                rows = self._conn.execute(
+                    "SELECT url, offset, line FROM articles WHERE segment = ? ORDER BY offset, line",
+                    (segment,),
+                ).fetchall()
+                if not rows:
+                    continue
+                articles = self._scan_segment(segment, {(offset, line) for _, offset, line in rows})
+                for (url, _, _), article in zip(rows, articles):
+                    buffer.append((url, article))
+                    moved += 1
+                    if len(buffer) >= COMPACT_MEMBER_SIZE:
+                        flush()
+            if buffer:
+                flush()
+
+            for segment in old:
+                os.remove(os.path.join(self.segment_dir, segment))
+        print(f"🗜️ compact {len(old)} segment → {target} ({moved} ข่าว)")
+        return moved
+
+    def close(self):
+        self._conn.close()
+
+# ─────────────────────────────
+# 🔹 CLI
+#   python -m core.raw_store compact --older-than-days 30
+#   python -m core.raw_store stats
+# ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the raw news store")
+    parser.add_argument("mode", choices=["compact", "stats"])
+    parser.add_argument("--root", default=RAW_DIR)
+    parser.add_argument("--older-than-days", type=int, default=RAW_COMPACT_DAYS)
+    args = parser.parse_args()
+
+    store = RawNewsStore(args.root)
+    try:
+        if args.mode == "compact":
+            store.compact(older_than_days=args.older_than_days)
+        else:
+            names = sorted(os.listdir(store.segment_dir))
+            size = sum(os.path.getsize(os.path.join(store.segment_dir, n)) for n in names)
+            print(f"📁 {len(store)} ข่าว ใน {len(names)} segment ({size / 1024 / 1024:.1f} MB)")
+    finally:
+        store.close()
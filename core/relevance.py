@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+import joblib
+from pythainlp.tokenize import word_tokenize
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import precision_score, recall_score
+from sklearn.pipeline import Pipeline
+
+from core.filter import is_epidemic_related
+from core.stream import batched
+
+# ─────────────────────────────
+# 🔹 ตัวคัดกรองขั้นที่ 2: TF-IDF (ตัดคำไทย) + Logistic Regression
+# ─────────────────────────────
+MODEL_DIR = "models/relevance"
+THRESHOLD = 0.5        # ความน่าจะเป็นขั้นต่ำที่ถือว่าเกี่ยวกับโรคระบาด
+DELETE_BELOW = 0.2     # ข่าวใน DB ที่คะแนนต่ำกว่านี้ถือว่าไม่เกี่ยวข้องแน่ ๆ (ใช้ลบ)
+BATCH_SIZE = 32
+
+def thai_tokens(text: str) -> List[str]:
+    """ตัดคำด้วย pythainlp (ต้องเป็นฟังก์ชันระดับ module เพื่อให้ joblib pickle ได้)"""
+    return [t for t in word_tokenize(re.sub(r'\s+', ' ', text).strip().lower(), keep_whitespace=False) if t.strip()]
+
+def article_text(article: Dict) -> str:
+    return f"{article.get('title', '') or ''}\n{article.get('content_raw', '') or ''}"
+
+def build_model() -> Pipeline:
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(tokenizer=thai_tokens, token_pattern=None, ngram_range=(1, 2),
+                                  min_df=2, max_features=50000, sublinear_tf=True)),
+        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced")),
+    ])
+
+# ─────────────────────────────
+# 🔹 บันทึก/โหลดโมเดลแบบมีเวอร์ชัน
+#   models/relevance/relevance-v0003.joblib + relevance-v0003.json (metadata)
+# ─────────────────────────────
+def _versions(model_dir: str) -> List[int]:
+    if not os.path.isdir(model_dir):
+        return []
+    return sorted(int(m.group(1)) for m in (re.match(r"relevance-v(\d+)\.joblib$", n) for n in os.listdir(model_dir)) if m)
+
+def save_model(model: Pipeline, metadata: Dict, model_dir: str = MODEL_DIR) -> str:
+    os.makedirs(model_dir, exist_ok=True)
+    version = (_versions(model_dir) or [0])[-1] + 1
+    path = os.path.join(model_dir, f"relevance-v{version:04d}.joblib")
+    joblib.dump(model, path)
+    with open(path.replace(".joblib", ".json"), "w", encoding="utf-8") as f:
+        json.dump({**metadata, "version": version}, f, ensure_ascii=False, indent=2)
+    return path
+
+def load_model(version: int = None, model_dir: str = MODEL_DIR):
+    """โหลดเวอร์ชันที่ระบุหรือล่าสุด → (model, metadata) หรือ (None, None) ถ้ายังไม่เคย train"""
+    versions = _versions(model_dir)
+    if not versions:
+        return None, None
+    version = version or versions[-1]
+    path = os.path.join(model_dir, f"relevance-v{version:04d}.joblib")
+    with open(path.replace(".joblib", ".json"), encoding="utf-8") as f:
+        metadata = json.load(f)
+    return joblib.load(path), metadata
+
+def train(articles: List[Dict], labels: List[int], model_dir: str = MODEL_DIR) -> str:
+    """train โมเดลใหม่จากข่าวที่ติด label (1 = เกี่ยวกับโรคระบาด) แล้วบันทึกเป็นเวอร์ชันถัดไป"""
+    texts = [article_text(a) for a in articles]
+    x_train, x_test, y_train, y_test = train_test_split(texts, labels, test_size=0.2,
+                                                        stratify=labels, random_state=42)
+    model = build_model().fit(x_train, y_train)
+    pred = (model.predict_proba(x_test)[:, 1] >= THRESHOLD).astype(int)
+    metadata = {
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "n_samples": len(texts),
+        "threshold": THRESHOLD,
+        "precision": precision_score(y_test, pred, zero_division=0),
+        "recall": recall_score(y_test, pred, zero_division=0),
+    }
+    model.fit(texts, labels)  # ใช้ข้อมูลทั้งหมดกับโมเดลที่บันทึกจริง
+    path = save_model(model, metadata, model_dir)
+    print(f"✅ บันทึกโมเดล → {path} (precision {metadata['precision']:.2f}, recall {metadata['recall']:.2f})")
+    return path
+
+# ─────────────────────────────
+# 🔹 Cascade: keyword (ถูก) → classifier (แม่นกว่า, ทำเป็น batch)
+# ─────────────────────────────
+class RelevanceCascade:
+    def __init__(self, model=None, threshold: float = None, model_dir: str = MODEL_DIR):
+        metadata = {}
+        if model is None:
+            model, metadata = load_model(model_dir=model_dir)
+        self.model = model
+        self.version = (metadata or {}).get("version")
+        self.threshold = threshold if threshold is not None else (metadata or {}).get("threshold", THRESHOLD)
+        if self.model is None:
+            print("⚠️ ยังไม่มีโมเดล relevance → ใช้ keyword filter อย่างเดียว")
+
+    def score(self, articles: List[Dict]) -> List[float]:
+        """ความน่าจะเป็นว่าเกี่ยวกับโรคระบาด (ทั้ง batch ในการเรียกครั้งเดียว)"""
+        if not articles:
+            return []
+        if self.model is None:
+            return [1.0 if is_epidemic_related(a) else 0.0 for a in articles]
+        return self.model.predict_proba([article_text(a) for a in articles])[:, 1].tolist()
+
+    def filter_stream(self, articles: Iterable[Dict], batch_size: int = BATCH_SIZE,
+                      rejected: List[str] = None) -> Iterator[Dict]:
+        """
+        ผ่าน keyword ก่อน แล้วให้ classifier ตัดสินทีละ batch
+        URL ของข่าวที่ผ่าน keyword แต่ classifier ปฏิเสธจะถูกเก็บใน rejected (ถ้าส่ง list มา)
+        """
+        candidates = (a for a in articles if is_epidemic_related(a))
+        for batch in batched(candidates, batch_size):
+            for article, prob in zip(batch, self.score(batch)):
+                article["relevance_score"] = prob
+                if prob >= self.threshold:
+                    yield article
+                elif rejected is not None:
+                    rejected.append(article["url"])
+
+    def irrelevant_urls(self, rows: Iterable[Dict], below: float = DELETE_BELOW) -> List[str]:
+        """หา URL ของข่าวใน DB ที่ไม่ผ่าน keyword หรือคะแนนต่ำกว่า below (ใช้กับ delete_irrelevant_news)"""
+        urls = []
+        for batch in batched(rows, BATCH_SIZE):
+            for row, prob in zip(batch, self.score(batch)):
+                if not is_epidemic_related(row) or (self.model is not None and prob < below):
+                    urls.append(row["url"])
+        return urls
+
+# ─────────────────────────────
+# 🔹 CLI: python -m core.relevance train --data labeled.jsonl
+#   (JSONL แต่ละบรรทัดมี title, content_raw, label)
+# ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the epidemic relevance classifier")
+    parser.add_argument("command", choices=["train"])
+    parser.add_argument("--data", required=True)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    args = parser.parse_args()
+
+    with open(args.data, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    train(rows, [int(r["label"]) for r in rows], args.model_dir)
@@ -0,0 +1,146 @@
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+
+import requests
+
+from core.extract import ExtractPool
+from core.fetcher import AsyncFetcher, HOST_POLICY
+from core.hfocus_scraper import scrape_hfocus_articles
+from core.scraper import scrape_standard
+
+# ─────────────────────────────
+# 🔹 บันทึก/เล่นซ้ำ response ของเว็บข่าว (สำหรับ benchmark แบบไม่ต่อเน็ต)
+# ─────────────────────────────
+FIXTURE_DIR = "data/fixtures"
+
+class RecordingFetcher(AsyncFetcher):
+    """ดึงจากเว็บจริงตามปกติ แล้วเก็บทุก response ไว้ใน archive (gzip JSONL)"""
+
+    def __init__(self, archive_path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.archive_path = archive_path
+        self.records = {}
+        self._lock = threading.Lock()
+
+    def _get(self, url: str, use_cache: bool = False) -> requests.Response:
+        res = super()._get(url, use_cache=False)
+        with self._lock:
+            self.records[url] = {
+                "url": url,
+                "status": res.status_code,
+                "encoding": res.encoding or "utf-8",
+                "body": res.text,
+            }
+        return res
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.archive_path) or ".", exist_ok=True)
+        with gzip.open(self.archive_path, "wt", encoding="utf-8") as f:
+            for record in self.records.values():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"📼 บันทึก {len(self.records)} response → {self.archive_path}")
+
+class ReplayFetcher(AsyncFetcher):
+    """ตอบจาก archive แทนเว็บจริง พร้อมจำลอง latency (URL ที่ไม่มีใน archive → 404)"""
+
+    def __init__(self, archive_path: str, latency: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.served = {"listing": 0, "article": 0}
+        with gzip.open(archive_path, "rt", encoding="utf-8") as f:
+            self.records = {r["url"]: r for r in map(json.loads, f)}
+
+    def _get(self, url: str, use_cache: bool = False) -> requests.Response:
+        if self.latency:
+            time.sleep(self.latency)  # จำลอง network แบบ blocking เหมือน requests จริง
+        record = self.records.get(url)
+        res = requests.Response()
+        res.url = url
+        res.from_cache = False
+        if record is None:
+            res.status_code = 404
+            res._content = b""
+            return res
+        res.status_code = record["status"]
+        res.encoding = record["encoding"]
+        res._content = record["body"].encode(record["encoding"])
+        # scraper ดึงหน้า list แบบไม่ใช้ cache เสมอ (ต้องเห็นข่าวใหม่) ส่วนหน้าข่าวใช้ cache
+        self.served["article" if use_cache else "listing"] += 1
+        return res
+
+# ─────────────────────────────
+# 🔹 Benchmark
+# ─────────────────────────────
+def unthrottled_policy() -> dict:
+    """ปิด token bucket (วัดความเร็ว engine ล้วน ๆ) แต่คง concurrency ต่อ host เดิม"""
+    return {host: {**p, "rate": 1e9, "burst": p["concurrency"]} for host, p in HOST_POLICY.items()}
+
+def benchmark(archive_path: str, source: str, pages: int, latency: float = 0.0,
+              throttled: bool = False, parse_workers: int = None) -> dict:
+    """
+    เล่นซ้ำ archive ผ่าน scraper จริง แล้ววัด pages/sec (หน้า list), articles/sec และเวลา CPU ที่ใช้ parse
+    (article_pages = หน้าข่าวที่ดึงได้ทั้งหมด รวมข่าวที่ถูกข้ามเพราะเนื้อหาว่าง)
+    """
+    fetcher = ReplayFetcher(archive_path, latency=latency,
+                            host_policy=None if throttled else unthrottled_policy())
+    pool = ExtractPool(parse_workers)
+    try:
+        start = time.perf_counter()
+        if source == "hfocus":
+            articles = scrape_hfocus_articles(pages=pages, fetcher=fetcher, extractor=pool)
+        else:
+            articles = scrape_standard(max_pages=pages, fetcher=fetcher, extractor=pool)
+        elapsed = time.perf_counter() - start
+        parse = pool.report()
+    finally:
+        pool.close()
+
+    return {
+        "source": source,
+        "latency_s": latency,
+        "elapsed_s": elapsed,
+        "pages": fetcher.served["listing"],
+        "article_pages": fetcher.served["article"],
+        "articles": len(articles),
+        "pages_per_sec": fetcher.served["listing"] / elapsed if elapsed else 0.0,
+        "articles_per_sec": len(articles) / elapsed if elapsed else 0.0,
+        "parse_cpu_ms": parse["total_ms"],
+        "parse_avg_ms": parse["avg_ms"],
+    }
+
+def record(archive_path: str, source: str, pages: int):
+    fetcher = RecordingFetcher(archive_path)
+    if source == "hfocus":
+        scrape_hfocus_articles(pages=pages, fetcher=fetcher)
+    else:
+        scrape_standard(max_pages=pages, fetcher=fetcher)
+    fetcher.save()
+
+# ─────────────────────────────
+# 🔹 CLI
+#   python -m core.replay record --source hfocus --pages 3
+#   python -m core.replay bench  --source hfocus --pages 3 --latency 0.2
+# ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record/replay scraper responses and benchmark crawl throughput")
+    parser.add_argument("mode", choices=["record", "bench"])
+    parser.add_argument("--source", choices=["hfocus", "thestandard"], default="hfocus")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--archive", default=None, help="default: data/fixtures/<source>.jsonl.gz")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per response")
+    parser.add_argument("--throttled", action="store_true", help="keep HOST_POLICY rate limits during replay")
+    parser.add_argument("--parse-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    archive = args.archive or os.path.join(FIXTURE_DIR, f"{args.source}.jsonl.gz")
+    if args.mode == "record":
+        record(archive, args.source, args.pages)
+    else:
+        result = benchmark(archive, args.source, args.pages, args.latency, args.throttled, args.parse_workers)
+        print("\n🏁 Benchmark")
+        for key, value in result.items():
+            print(f"   {key:>16}: {value:.3f}" if isinstance(value, float) else f"   {key:>16}: {value}")
@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+
+# ─────────────────────────────
+# 🔹 Retry / backoff / circuit breaker ต่อ host
+# ─────────────────────────────
+# retries        = จำนวนครั้งที่ลองใหม่หลังครั้งแรกล้มเหลว
+# backoff        = เวลารอก่อน retry ครั้งแรก (วินาที) แล้วคูณ 2 ทุกครั้ง (+ jitter)
+# max_backoff    = เพดานเวลารอ
+# failure_threshold = ล้มเหลวติดกันกี่ครั้งจึงตัดวงจร (ไม่ยิง host นี้ชั่วคราว)
+# reset_after    = ตัดวงจรนานกี่วินาทีก่อนลองยิงทดสอบใหม่ (half-open)
+RETRY_POLICY = {
+    "retries": 3,
+    "backoff": 0.5,
+    "max_backoff": 8.0,
+    "failure_threshold": 5,
+    "reset_after": 60.0,
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 15]
+
+class CircuitOpenError(Exception):
+    """host นี้ถูกตัดวงจรอยู่ จึงไม่ยิง request จริง"""
+
+def backoff_delay(attempt: int, policy: dict = RETRY_POLICY) -> float:
+    """exponential backoff + full jitter (attempt เริ่มที่ 0)"""
+    ceiling = min(policy["max_backoff"], policy["backoff"] * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = RETRY_POLICY["failure_threshold"],
+                 reset_after: float = RETRY_POLICY["reset_after"]):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """closed → ยิงได้, half-open → ให้ยิงทดสอบได้ทีละ 1 request, open → ไม่ยิง"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def release_probe(self):
+        """
+        request ที่ได้สิทธิ์ยิงจบโดยไม่รู้ผลของ host (ถูก cancel หรือ error ฝั่งเรา)
+        → คืนสิทธิ์ probe โดยไม่นับเป็นความล้มเหลว ไม่งั้น host จะค้างอยู่ใน half-open ตลอดไป
+        """
+        with self._lock:
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+# ─────────────────────────────
+# 🔹 ตัวนับและ histogram ของ latency ต่อแหล่งข่าว
+# ─────────────────────────────
+class CrawlMetrics:
+    COUNTERS = ("requests", "ok", "errors", "retries", "short_circuited", "cache_hits", "empty_bodies")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.latency = {}
+
+    def _source(self, source: str):
+        if source not in self.counters:
+            self.counters[source] = dict.fromkeys(self.COUNTERS, 0)
+            self.latency[source] = [0] * (len(LATENCY_BUCKETS) + 1)
+        return self.counters[source]
+
+    def incr(self, source: str, name: str, n: int = 1):
+        with self._lock:
+            self._source(source)[name] += n
+
+    def observe(self, source: str, seconds: float):
+        with self._lock:
+            self._source(source)
+            self.latency[source][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                source: {
+                    **counts,
+                    "latency": dict(zip([f"<={b}s" for b in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"],
+                                        self.latency[source])),
+                }
+                for source, counts in self.counters.items()
+            }
+
+    def print_report(self):
+        for source, data in self.report().items():
+            latency = ", ".join(f"{k}:{v}" for k, v in data.pop("latency").items() if v)
+            counts = ", ".join(f"{k}={v}" for k, v in data.items())
+            print(f"📊 {source}: {counts}")
+            print(f"   ⏱️ latency {latency or '-'}")
@@ -1,9 +1,13 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 import json
-from datetime import datetime
 import os
 import re
+from urllib.parse import urlparse
+
+from core.extract import ExtractPool, make_soup
+from core.fetcher import AsyncFetcher, http_get, iter_crawl, iterate_in_thread
+from core.frontier import CrawlFrontier, listing_exhausted, advance_watermark
+from core.raw_store import RawNewsStore
 
 # ───────────────────── helper ─────────────────────
 TH_MONTH = {
@@ -21,16 +25,24 @@ def parse_thai_date(text: str) -> str:
         return f"{year}-{TH_MONTH[month_th]}-{int(day):02d}"
     return text.strip()
 
+# parse เฉพาะ node ที่ใช้จริง (เนื้อหาข่าว, การ์ดข่าวในหน้า tag)
+ARTICLE_NODES = SoupStrainer("div", class_="entry-content")
+LISTING_NODES = SoupStrainer("div", class_="news-item")
+
+def parse_article_body(html: str) -> str:
+    """แยกเนื้อหาเต็มออกจาก HTML ของเพจข่าว"""
+    soup = make_soup(html, ARTICLE_NODES)
+    body = soup.select_one("div.entry-content")
+    if not body:
+        return ""
+    paras = [p.get_text(" ", strip=True) for p in body.find_all(["p", "li", "blockquote"])]
+    return "\n\n".join([re.sub(r'\s+', ' ', p) for p in paras if p])
+
 def fetch_article_body(url: str) -> str:
     """ดึงเนื้อหาเต็มจากเพจข่าว"""
     try:
-        res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
-        soup = BeautifulSoup(res.text, "html.parser")
-        body = soup.select_one("div.entry-content")
-        if not body:
-            return ""
-        paras = [p.get_text(" ", strip=True) for p in body.find_all(["p", "li", "blockquote"])]
-        return "\n\n".join([re.sub(r'\s+', ' ', p) for p in paras if p])
+        res = http_get(url, use_cache=True)
+        return parse_article_body(res.text)
     except Exception:
         return ""
 
@@ -46,70 +58,99 @@ def load_existing_urls(path: str) -> set:
         return set()
 
 # ───────────────────── main scraper ─────────────────────
-def scrape_standard(max_pages: int = 24, existing_urls: set = set()) -> list[dict]:
-    base = "https://thestandard.co/tag/โรคระบาด/page/{}/"
-    out = []
-
-    for page in range(1, max_pages + 1):
-        url = base.format(page)
-        print(f"📄 page {page}: {url}")
-        try:
-            res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
-            soup = BeautifulSoup(res.text, "html.parser")
-            cards = soup.select("div.news-item")
-            if not cards:
-                break
-
-            for card in cards:
-                a = card.select_one("h3.news-title a")
-                if not a:
-                    continue
-                art_url = a["href"]
-
-                if art_url in existing_urls:
-                    print(f"   🔁 ข้ามข่าวซ้ำ: {art_url}")
-                    continue
-
-                title = a.get_text(strip=True)
-                date_raw = card.select_one("div.date")
-                date = parse_thai_date(date_raw.get_text(strip=True)) if date_raw else ""
-                content_raw = fetch_article_body(art_url)
-
-                out.append({
-                    "source": "thestandard",
-                    "title": title,
-                    "url": art_url,
-                    "date": date,
-                    "content_raw": content_raw,  # ✅ ใช้ content_raw แทน content
-                    "language": "th",
-                    "is_translated": False,
-                    "is_summarized": False
-                })
-        except Exception as e:
-            print(f"⚠️ Error page {page}: {e}")
+BASE_URL = "https://thestandard.co/tag/โรคระบาด/page/{}/"
+
+def parse_listing(html: str) -> list[dict]:
+    """ดึงชื่อข่าว ลิงก์ และวันที่จากหน้า tag"""
+    soup = make_soup(html, LISTING_NODES)
+    items = []
+    for card in soup.select("div.news-item"):
+        a = card.select_one("h3.news-title a")
+        if not a:
             continue
+        date_raw = card.select_one("div.date")
+        items.append({
+            "title": a.get_text(strip=True),
+            "url": a["href"],
+            "date": parse_thai_date(date_raw.get_text(strip=True)) if date_raw else "",
+        })
+    return items
+
+async def aiter_standard(max_pages: int = 24, existing_urls: set = set(), fetcher: AsyncFetcher = None,
+                         frontier: CrawlFrontier = None, extractor: ExtractPool = None):
+    """
+    async iterator: ดึงข่าวจาก The Standard พร้อมกันผ่าน AsyncFetcher แล้ว yield ทีละข่าว (parse ใน ExtractPool)
+    frontier ใช้ข้ามข่าวที่รู้จักแล้วเท่านั้น ผู้เรียกเป็นคน mark_seen หลังบันทึกข่าวสำเร็จ
+    """
+    fetcher = fetcher or AsyncFetcher()
+    pool = extractor or ExtractPool()
+    newest = []
+
+    async def fetch_article(item: dict):
+        art_url = item["url"]
+        if art_url in existing_urls or (frontier is not None and art_url in frontier):
+            print(f"   🔁 ข้ามข่าวซ้ำ: {art_url}")
+            return None
 
-    return out
+        try:
+            html = await fetcher.get_text(art_url, use_cache=True)
+            content_raw = await pool.run(parse_article_body, html, art_url)
+        except Exception as err:
+            print(f"❌ Error @ {art_url} : {err}")
+            content_raw = ""
+
+        # ❗ ไม่ส่งข่าวเนื้อหาว่างต่อไปยังขั้นแปล/สรุป
+        if not content_raw:
+            fetcher.metrics.incr(urlparse(art_url).netloc, "empty_bodies")
+            return None
+
+        return {
+            "source": "thestandard",
+            "title": item["title"],
+            "url": art_url,
+            "date": item["date"],
+            "content_raw": content_raw,  # ✅ ใช้ content_raw แทน content
+            "language": "th",
+            "is_translated": False,
+            "is_summarized": False
+        }
+
+    def stop_after(items: list[dict]) -> bool:
+        if not newest:
+            newest.append(items)
+        return listing_exhausted(frontier, items, "thestandard")
+
+    page_urls = [BASE_URL.format(page) for page in range(1, max_pages + 1)]
+    try:
+        async for article in iter_crawl(page_urls, parse_listing, fetch_article, fetcher=fetcher,
+                                        extractor=pool, stop_after=stop_after):
+            yield article
+        if newest:
+            advance_watermark(frontier, newest[0], "thestandard")
+    finally:
+        pool.print_report()
+        fetcher.metrics.print_report()
+        if extractor is None:
+            pool.close()
+
+def iter_standard(max_pages: int = 24, **kwargs):
+    """generator แบบ sync ของ aiter_standard (ดึงใน thread แยก)"""
+    return iterate_in_thread(lambda: aiter_standard(max_pages, **kwargs))
+
+def scrape_standard(max_pages: int = 24, existing_urls: set = set(), fetcher: AsyncFetcher = None,
+                    frontier: CrawlFrontier = None, extractor: ExtractPool = None) -> list[dict]:
+    """ดึงข่าวจาก The Standard ทั้งหมดเป็น list (ดู aiter_standard)"""
+    return list(iter_standard(max_pages, existing_urls=existing_urls, fetcher=fetcher,
+                              frontier=frontier, extractor=extractor))
 
 # ───────────────────── runner ─────────────────────
 if __name__ == "__main__":
-    save_path = "data/raw_news/thestandard_news.json"
-    existing_urls = load_existing_urls(save_path)
+    store = RawNewsStore()
 
     print("🚀 เริ่มดึงข่าวจาก The Standard …")
-    new_articles = scrape_standard(max_pages=24, existing_urls=existing_urls)
-
-    if os.path.exists(save_path):
-        with open(save_path, "r", encoding="utf-8") as f:
-            old_articles = json.load(f)
-    else:
-        old_articles = []
-
-    all_articles = old_articles + new_articles
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    with open(save_path, "w", encoding="utf-8") as f:
-        json.dump(all_articles, f, ensure_ascii=False, indent=2)
+    new_articles = scrape_standard(max_pages=24, existing_urls=store)
+    store.append(new_articles)
 
     print(f"\n✅ ข่าวใหม่: {len(new_articles)} ข่าว")
-    print(f"📦 รวมทั้งหมด: {len(all_articles)} ข่าว")
-    print(f"📝 บันทึกไว้ที่: {save_path}")
+    print(f"📦 รวมทั้งหมด: {len(store)} ข่าว")
+    print(f"📝 บันทึกไว้ที่: {store.segment_dir}")
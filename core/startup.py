@@ -0,0 +1,89 @@
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+# ─────────────────────────────
+# 🔹 Startup benchmark: import-time budgets for modules that must not load models on import
+# ─────────────────────────────
+# Seconds, measured in a fresh interpreter (cold import of the module and its dependencies)
+IMPORT_BUDGETS = {
+    "core.summarizer": 0.5,
+    "core.translator": 0.5,
+    "core.plan": 0.2,
+    "core.hashtag_lexicon": 0.2,
+    "core.translation_memory": 0.2,
+}
+# Importing any of these means a model/runtime is being pulled in at import time
+HEAVY_MODULES = ("torch", "transformers", "optimum", "onnxruntime", "kss", "nltk")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure_import(module: str) -> Dict:
+    """Import module in a fresh interpreter → {"seconds", "heavy"} (heavy = HEAVY_MODULES it pulled in)"""
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"seconds": None, "heavy": [], "error": result.stderr.strip().splitlines()[-1:]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def benchmark(budgets: Dict[str, float] = IMPORT_BUDGETS, repeat: int = 3) -> List[Dict]:
+    """Best of `repeat` cold imports per module, checked against its budget."""
+    rows = []
+    for module, budget in budgets.items():
+        runs = [measure_import(module) for _ in range(repeat)]
+        timed = [r["seconds"] for r in runs if r["seconds"] is not None]
+        best = min(timed) if timed else None
+        heavy = sorted({m for r in runs for m in r["heavy"]})
+        rows.append({
+            "module": module,
+            "budget_s": budget,
+            "best_s": best,
+            "heavy": heavy,
+            "error": next((r["error"] for r in runs if "error" in r), None),
+            "ok": best is not None and best <= budget and not heavy,
+        })
+    return rows
+
+def warm_up_times() -> Dict[str, float]:
+    """Seconds to load each model and run one short generation (the cost moved out of import)."""
+    from core import summarizer, translator
+    return {"core.translator": translator.warm_up(), "core.summarizer": summarizer.warm_up()}
+
+# ─────────────────────────────
+# 🔹 CLI
+#   python -m core.startup                 # exit code 1 if any module is over budget
+#   python -m core.startup --warm-up --output startup.json
+# ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check import-time budgets (no model loading at import)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warm-up", action="store_true", help="also time explicit model warm-up")
+    parser.add_argument("--output", default=None, help="write the report as JSON")
+    args = parser.parse_args()
+
+    rows = benchmark(repeat=args.repeat)
+    print(f"\n🏁 Import time (best of {args.repeat}, fresh interpreter)")
+    for row in rows:
+        status = "✅" if row["ok"] else "❌"
+        seconds = f"{row['best_s']:.3f}s" if row["best_s"] is not None else "failed"
+        detail = f" heavy: {', '.join(row['heavy'])}" if row["heavy"] else ""
+        detail += f" error: {row['error'][0]}" if row["error"] else ""
+        print(f"   {status} {row['module']:>24}: {seconds:>8} (budget {row['budget_s']:.1f}s){detail}")
+
+    report = {"imports": rows}
+    if args.warm_up:
+        report["warm_up_s"] = warm_up_times()
+        for module, seconds in report["warm_up_s"].items():
+            print(f"   🔥 {module:>24}: warm-up {seconds:.1f}s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    sys.exit(0 if all(row["ok"] for row in rows) else 1)
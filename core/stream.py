@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List
+
+_END = object()
+
+# ─────────────────────────────
+# 🔹 ตัวช่วยทำ pipeline แบบ streaming (ไม่ต้องรอข้อมูลครบทั้งก้อน)
+# ─────────────────────────────
+def bounded_map(func: Callable, items: Iterable, max_workers: int = 8, max_pending: int = 16) -> Iterator:
+    """
+    เหมือน executor.map แต่ดึง items ทีละน้อย (ค้างในคิวไม่เกิน max_pending งาน)
+    และ yield ผลลัพธ์ตามลำดับที่ทำเสร็จ → เริ่มประมวลผลได้ตั้งแต่ข่าวแรก และ memory คงที่
+    """
+    source = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                item = next(source, _END)
+                if item is _END:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(func, item))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    """แบ่ง iterable เป็นก้อนละ size ชิ้น (ก้อนสุดท้ายอาจน้อยกว่า)"""
+    source = iter(items)
+    while batch := list(islice(source, size)):
+        yield batch
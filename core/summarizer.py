@@ -1,18 +1,49 @@
 # summarizer.py
 
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-from typing import Literal
+import threading
+import time
+from typing import List, Literal
 import re
-from pythainlp.tokenize import sent_tokenize
+
+from core.decoding import DECODING_PROFILE, generation_kwargs
 
 # ─────────────────────────────────────────────────────────
-# CONFIG: Load summarization model (English only)
+# CONFIG: Summarization model (English only) — โหลดตอนใช้งานครั้งแรก ไม่ใช่ตอน import
 # ─────────────────────────────────────────────────────────
 
 model_name = "facebook/bart-large-cnn"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-summarizer_pipeline = pipeline("summarization", model=model, tokenizer=tokenizer)
+_tokenizer = None
+_summarizer_pipeline = None
+_load_lock = threading.Lock()
+
+def get_summarizer():
+    """
+    คืน (tokenizer, summarization pipeline) โหลดครั้งเดียวตอนเรียกใช้ครั้งแรก
+    ปลอดภัยเมื่อเรียกจากหลาย thread พร้อมกัน (โหลดแค่ thread เดียว ที่เหลือรอ)
+    """
+    global _tokenizer, _summarizer_pipeline
+    if _summarizer_pipeline is None:
+        with _load_lock:
+            if _summarizer_pipeline is None:
+                from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+                from core.quantize import QUANTIZED_INFERENCE
+                from core.inference import make_backend
+
+                tokenizer = AutoTokenizer.from_pretrained(model_name)
+                # INFERENCE_BACKEND=onnx → ONNX Runtime, QUANTIZED_INFERENCE=1 → int8 (PyTorch) เร็วขึ้นบน CPU
+                backend = make_backend(model_name, AutoModelForSeq2SeqLM, quantize=QUANTIZED_INFERENCE)
+                _tokenizer = tokenizer
+                _summarizer_pipeline = pipeline("summarization", model=backend.model, tokenizer=tokenizer)
+                print(f"✅ ใช้ device: {backend.model.device}")
+    return _tokenizer, _summarizer_pipeline
+
+def warm_up() -> float:
+    """โหลดโมเดลล่วงหน้า + สรุปข้อความสั้นหนึ่งครั้ง คืนเวลาที่ใช้ (วินาที)"""
+    start = time.perf_counter()
+    _, summarizer_pipeline = get_summarizer()
+    summarizer_pipeline("Health officials reported new influenza cases this week.", max_length=16, min_length=1,
+                        num_beams=1)
+    return time.perf_counter() - start
 
 # ─────────────────────────────────────────────────────────
 # UTIL: แบ่งข้อความยาวเป็น Chunk ตามย่อหน้า
@@ -40,36 +71,65 @@ def split_into_chunks(text: str, max_chunk_chars: int = 1000):
 # SUMMARIZER: ภาษาอังกฤษ
 # ─────────────────────────────────────────────────────────
 
-def summarize_en(text: str, max_length=150, min_length=30) -> str:
+def _chunk_settings(tokenizer, chunk: str, max_length: int, min_length: int, profile: str) -> dict:
+    # ปรับ max/min ตามจำนวน token จริง + จำนวน beam ตาม profile (fast/balanced/quality)
+    settings = generation_kwargs("summarize_en", len(tokenizer.encode(chunk)), profile=profile)
+    settings["max_length"] = min(max_length, settings["max_length"])
+    settings["min_length"] = min(min_length, settings["min_length"])
+    if settings["min_length"] >= settings["max_length"]:
+        settings["min_length"] = max(1, settings["max_length"] // 2)
+    return settings
+
+def summarize_en(text: str, max_length=150, min_length=30, profile: str = DECODING_PROFILE) -> str:
     if not text.strip():
         return ""
     
+    tokenizer, summarizer_pipeline = get_summarizer()
     chunks = split_into_chunks(text, max_chunk_chars=1000)
     summaries = []
 
     for i, chunk in enumerate(chunks):
         print(f"🧠 สรุป Chunk {i+1}/{len(chunks)} …")
         try:
-            word_count = len(chunk.split())
-            # ปรับ max/min ตามความยาวจริง
-            dynamic_max = min(max_length, max(30, int(word_count * 0.7)))
-            dynamic_min = min(min_length, max(10, int(word_count * 0.3)))
-
-            if dynamic_min >= dynamic_max:
-                dynamic_min = max(5, dynamic_max - 5)
-
-            summary = summarizer_pipeline(
-                chunk,
-                max_length=dynamic_max,
-                min_length=dynamic_min,
-                do_sample=False
-            )
+            settings = _chunk_settings(tokenizer, chunk, max_length, min_length, profile)
+            summary = summarizer_pipeline(chunk, **settings)
             summaries.append(summary[0]['summary_text'].strip())
         except Exception as e:
             summaries.append(f"[ERROR] {e}")
 
     return " ".join(summaries)
 
+def summarize_en_batch(texts: List[str], max_length=150, min_length=30, profile: str = DECODING_PROFILE,
+                       batch_size: int = 8) -> List[str]:
+    """
+    สรุปหลายข่าวพร้อมกัน: รวม chunk ของทุกข่าวแล้วเรียก pipeline ครั้งเดียว (batch_size chunk ต่อ forward)
+    ใช้ max_length ของ chunk ที่ยาวที่สุด / min_length ของ chunk ที่สั้นที่สุดใน batch
+    """
+    owners, chunks = [], []
+    for i, text in enumerate(texts):
+        if text.strip():
+            for chunk in split_into_chunks(text, max_chunk_chars=1000):
+                owners.append(i)
+                chunks.append(chunk)
+    summaries = [[] for _ in texts]
+    if not chunks:
+        return ["" for _ in texts]
+
+    tokenizer, summarizer_pipeline = get_summarizer()
+    per_chunk = [_chunk_settings(tokenizer, chunk, max_length, min_length, profile) for chunk in chunks]
+    settings = dict(per_chunk[0])
+    settings["max_length"] = max(s["max_length"] for s in per_chunk)
+    settings["min_length"] = min(s["min_length"] for s in per_chunk)
+    print(f"🧠 สรุป {len(chunks)} chunk จาก {len(set(owners))} ข่าวในครั้งเดียว …")
+    try:
+        outputs = summarizer_pipeline(chunks, batch_size=batch_size, **settings)
+        for owner, output in zip(owners, outputs):
+            summaries[owner].append(output['summary_text'].strip())
+    except Exception as e:
+        for owner in set(owners):
+            summaries[owner].append(f"[ERROR] {e}")
+    return [" ".join(parts) for parts in summaries]
+
 
 # ─────────────────────────────────────────────────────────
 # SUMMARIZER: ภาษาไทย (ตัดประโยค)
@@ -78,6 +138,7 @@ def summarize_en(text: str, max_length=150, min_length=30) -> str:
 def summarize_th(text: str, max_sentences=3) -> str:
     if not text.strip():
         return ""
+    from pythainlp.tokenize import sent_tokenize
     sentences = sent_tokenize(text)
     return " ".join(sentences[:max_sentences])
 
@@ -96,6 +157,10 @@ def summarize(text: str, lang: Literal["en", "th", "ko"] = "en") -> str:
         return summarize_th(text)
     else:
         return "[ERROR] Unsupported language"
-    
-print(f"✅ ใช้ device: {model.device}")
+
+def summarize_many(texts: List[str], lang: Literal["en", "th", "ko"] = "en") -> List[str]:
+    """summarize() หลายข้อความภาษาเดียวกัน (en/ko สรุปเป็น batch เดียว)"""
+    if lang == "en" or lang == "ko":
+        return summarize_en_batch(texts)
+    return [summarize(text, lang) for text in texts]
 
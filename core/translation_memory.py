@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+# ─────────────────────────────
+# 🔹 Translation memory: content-addressed cache of translated segments (SQLite, LRU-bounded)
+# ─────────────────────────────
+TM_PATH = "data/translation_memory.db"
+TM_MAX_ENTRIES = 200_000   # translations kept before least-recently-used ones are evicted
+TM_EVICT_TO = 0.9          # evict down to this fraction of the limit so eviction runs rarely
+REUSE_MIN_SEEN = 2         # a sentence seen in this many documents is split out and cached on its own
+
+_PLACEHOLDER = re.compile(r"\[\[GLOSSARY_(\d{3})_([^\[\]]*)\]\]")
+
+def normalize_segment(text: str) -> str:
+    return re.sub(r'\s+', ' ', text or "").strip()
+
+def canonicalize(text: str) -> Tuple[str, List[str]]:
+    """
+    Renumber glossary placeholders by order of appearance in this segment, so the same sentence
+    hashes the same in every article. Returns (canonical text, original placeholders in canonical order).
+    """
+    originals: List[str] = []
+    numbering: Dict[str, str] = {}
+
+    def renumber(match: re.Match) -> str:
+        placeholder = match.group(0)
+        if placeholder not in numbering:
+            originals.append(placeholder)
+            numbering[placeholder] = f"[[GLOSSARY_{len(originals):03d}_{match.group(2)}]]"
+        return numbering[placeholder]
+
+    return _PLACEHOLDER.sub(renumber, normalize_segment(text)), originals
+
+def _to_canonical(translation: str, originals: List[str]) -> str:
+    numbering = {p: f"[[GLOSSARY_{i:03d}_{_PLACEHOLDER.match(p).group(2)}]]" for i, p in enumerate(originals, 1)}
+    return _PLACEHOLDER.sub(lambda m: numbering.get(m.group(0), m.group(0)), translation)
+
+def _from_canonical(translation: str, originals: List[str]) -> str:
+    def restore(match: re.Match) -> str:
+        idx = int(match.group(1)) - 1
+        return originals[idx] if idx < len(originals) else match.group(0)
+    return _PLACEHOLDER.sub(restore, translation)
+
+class TranslationMemory:
+    """
+    Persistent translations keyed by (model id, source lang, target lang, normalized segment hash).
+    Segments are chunks or single sentences; placeholders are canonicalized before hashing.
+    """
+
+    def __init__(self, model_id: str, path: str = TM_PATH, max_entries: int = TM_MAX_ENTRIES):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.model_id = model_id
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS memory (
+                    key TEXT PRIMARY KEY,
+                    translation TEXT,
+                    last_used REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_lru ON memory (last_used)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sentences (
+                    key TEXT PRIMARY KEY,
+                    seen INTEGER,
+                    last_seen REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sentences_lru ON sentences (last_seen)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    key TEXT PRIMARY KEY,
+                    isolated TEXT,
+                    last_seen REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_lru ON documents (last_seen)")
+            self._size = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+            self._sentences = self._conn.execute("SELECT COUNT(*) FROM sentences").fetchone()[0]
+            self._documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def _key(self, source_lang: str, target_lang: str, canonical: str) -> str:
+        raw = "\x1f".join((self.model_id, source_lang, target_lang, canonical))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get_many(self, requests: List[Tuple[str, str, str]]) -> List[Optional[str]]:
+        """Look up (text, source_lang, target_lang) requests; None where there is no stored translation."""
+        prepared = [(self._key(src, tgt, canonical), originals)
+                    for canonical, originals, src, tgt in
+                    ((*canonicalize(text), src, tgt) for text, src, tgt in requests)]
+        now = time.time()
+        results = []
+        with self._lock, self._conn:
+            for key, originals in prepared:
+                row = self._conn.execute("SELECT translation FROM memory WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                self.hits += 1
+                self._conn.execute("UPDATE memory SET last_used = ? WHERE key = ?", (now, key))
+                results.append(_from_canonical(row[0], originals))
+        return results
+
+    def put_many(self, items: List[Tuple[str, str, str, str]]):
+        """Store (text, source_lang, target_lang, translation) items, then evict if over the limit."""
+        rows = []
+        for text, src, tgt, translation in items:
+            if not text or not translation:
+                continue
+            canonical, originals = canonicalize(text)
+            rows.append((self._key(src, tgt, canonical), _to_canonical(translation, originals), time.time()))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO memory VALUES (?, ?, ?)", rows)
+            self._size += self._conn.total_changes - before
+            if self._size > self.max_entries:
+                self._evict(self._conn, "memory", "last_used")
+                self._size = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection, table: str, column: str):
+        keep = int(self.max_entries * TM_EVICT_TO)
+        conn.execute(f"DELETE FROM {table} WHERE key IN "
+                     f"(SELECT key FROM {table} ORDER BY {column} DESC LIMIT -1 OFFSET ?)", (keep,))
+
+    def recurring(self, lang: str, sentences: List[str]) -> Set[int]:
+        """
+        Indices of the document's sentences that have appeared in at least REUSE_MIN_SEEN documents.
+        Sightings are counted once per document (one transaction), and the answer is stored with the
+        document, so asking again for the same text (another target language, a later run) gives the
+        same answer even after the counts have moved on.
+        """
+        canonical = [canonicalize(sentence)[0] for sentence in sentences]
+        doc_key = self._key(lang, "#document", "\x1e".join(canonical))
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT isolated FROM documents WHERE key = ?", (doc_key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE documents SET last_seen = ? WHERE key = ?", (now, doc_key))
+                return set(json.loads(row[0]))
+
+            keys = [self._key(lang, "*", c) for c in canonical]
+            unique = list(dict.fromkeys(keys))
+            self._conn.executemany(
+                "INSERT INTO sentences VALUES (?, 1, ?) "
+                "ON CONFLICT(key) DO UPDATE SET seen = seen + 1, last_seen = excluded.last_seen",
+                [(key, now) for key in unique])
+            counts = {}
+            for start in range(0, len(unique), 500): # stay under SQLite's bound-parameter limit
+                batch = unique[start:start + 500]
+                counts.update(self._conn.execute(
+                    f"SELECT key, seen FROM sentences WHERE key IN ({','.join('?' * len(batch))})", batch))
+            isolated = [i for i, key in enumerate(keys) if counts.get(key, 0) >= REUSE_MIN_SEEN]
+            self._conn.execute("INSERT INTO documents VALUES (?, ?, ?)", (doc_key, json.dumps(isolated), now))
+
+            self._sentences += sum(1 for key in unique if counts.get(key) == 1)
+            if self._sentences > self.max_entries:
+                self._evict(self._conn, "sentences", "last_seen")
+                self._sentences = self._conn.execute("SELECT COUNT(*) FROM sentences").fetchone()[0]
+            self._documents += 1
+            if self._documents > self.max_entries:
+                self._evict(self._conn, "documents", "last_seen")
+                self._documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return set(isolated)
+
+    def report(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self._conn.close()
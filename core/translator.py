@@ -1,28 +1,43 @@
 import logging
-import re
+import threading
+import time
+from bisect import bisect_left
 from typing import Dict, List, Tuple, Optional
-import torch
-from transformers import T5Tokenizer, T5ForConditionalGeneration
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import nltk
-from nltk.tokenize import sent_tokenize
-from pythainlp.tokenize import sent_tokenize as th_sent_tokenize # For Thai
-import kss # For Korean
-
-# Configure logging
-logging.basicConfig(
-    filename='epidemic_news_pipeline.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
 
-# Download NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from core.glossary import GlossaryEngine, HashtagIndex
+from core.translation_memory import TranslationMemory
+from core.decoding import DECODING_PROFILE, cache_namespace, generation_kwargs, output_cap
+
+# Importing this module stays cheap (glossary, hashtag index, config only): torch/transformers,
+# the sentence splitters and psycopg2 are imported where they are first used, and the model is
+# loaded on first use (or explicitly via warm_up()).
+logger = logging.getLogger(__name__)
+LOG_FILE = 'epidemic_news_pipeline.log'
+
+def configure_logging():
+    """File logging for pipeline runs; a no-op if the application already configured logging."""
+    logging.basicConfig(
+        filename=LOG_FILE,
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+_punkt_lock = threading.Lock()
+_punkt_ready = False
+
+def _ensure_punkt():
+    """Download NLTK punkt data once, the first time an English splitter is needed."""
+    global _punkt_ready
+    if _punkt_ready:
+        return
+    import nltk
+    with _punkt_lock:
+        if not _punkt_ready:
+            try:
+                nltk.data.find('tokenizers/punkt')
+            except LookupError:
+                nltk.download('punkt')
+            _punkt_ready = True
 
 # Database connection parameters
 DB_PARAMS = {
@@ -118,41 +133,145 @@ GLOSSARY_KO = {
     "Ministry of Public Health": "공중보건부"
 }
 
+# Built once at import: protects/restores every glossary term in a single pass per text
+GLOSSARY_ENGINE = GlossaryEngine(GLOSSARY, GLOSSARY_KO)
+
+# Hashtag categories (Thai glossary terms), in priority order for ties
+HASHTAG_COUNTRIES = ['Thailand', 'South Korea', 'United States', 'China', 'Japan', 'Singapore', 'Malaysia', 'India']
+HASHTAG_CITIES = ['Bangkok', 'Seoul', 'Busan', 'New York', 'London', 'Paris']
+HASHTAG_DISEASES = ['โควิด', 'เดงกี่', 'ชิคุนกุนยา', 'ไข้หวัดใหญ่']
+HASHTAG_CATEGORIES = {
+    "country": [k for k, v in GLOSSARY.items() if 'ประเทศ' in k or v in HASHTAG_COUNTRIES],
+    "province_city": [k for k, v in GLOSSARY.items() if v in HASHTAG_CITIES and 'จังหวัด' not in k],
+    "disease": [k for k in GLOSSARY if any(d in k for d in HASHTAG_DISEASES)],
+}
+# Built once at import: finds every category's Thai/English/Korean forms in one pass
+HASHTAG_INDEX = HashtagIndex(GLOSSARY, GLOSSARY_KO, HASHTAG_CATEGORIES)
+
+# Batched generation: padded input tokens per generate() call (batch size x longest prompt)
+TRANSLATE_TOKEN_BUDGET = 4096
+TRANSLATE_MAX_BATCH = 16
+ROW_BATCH = 4 # Rows claimed per lease in run(); their chunks share translation batches
+
+def length_batches(order: List[int], lengths: List[int], token_budget: int, max_batch_size: int) -> List[List[int]]:
+    """
+    Groups indices (already sorted by length, longest first) into batches whose padded size
+    (len(batch) x longest member) stays within token_budget. A single over-budget item gets its own batch.
+    """
+    batches, batch, longest = [], [], 0
+    for idx in order:
+        widest = max(longest, lengths[idx])
+        if batch and (len(batch) >= max_batch_size or (len(batch) + 1) * widest > token_budget):
+            batches.append(batch)
+            batch, widest = [], lengths[idx]
+        batch.append(idx)
+        longest = widest
+    if batch:
+        batches.append(batch)
+    return batches
+
 class EpidemicNewsPipeline:
-    def __init__(self):
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        logger.info(f"Using device: {self.device}")
-        self.tokenizer = T5Tokenizer.from_pretrained("google/flan-t5-large", legacy=False)
-        self.model = T5ForConditionalGeneration.from_pretrained("google/flan-t5-large").to(self.device)
+    def __init__(self, quantize: Optional[bool] = None, backend: Optional[str] = None,
+                 decoding_profile: str = DECODING_PROFILE):
+        """
+        Cheap to construct: the tokenizer, model backend and translation memory are loaded on first
+        use (thread-safe, once) or explicitly with load()/warm_up().
+        quantize/backend default to QUANTIZED_INFERENCE / INFERENCE_BACKEND from the environment.
+        """
+        self.model_id = "google/flan-t5-large"
+        self._quantize_requested = quantize
+        self._backend_requested = backend
+        self._load_lock = threading.Lock()
+        self._tokenizer = None
+        self._backend = None
+        self._memory = None
+        self.quantized = False
+        self._prefix_cache = {}
         self.model_max_input_length = 512 # This is the tokenizer/model's hard limit
         self.prompt_buffer = 100 # Generous buffer for various prompts (translate, summarize, hashtags)
         self.max_chunk_tokens = self.model_max_input_length - self.prompt_buffer 
         logger.info(f"Calculated max_chunk_tokens for content: {self.max_chunk_tokens}")
-
-        # Compile regex patterns for faster hashtag detection
-        self.country_patterns = self._compile_patterns([k for k in GLOSSARY.keys() if 'ประเทศ' in k or 'South Korea' in GLOSSARY[k] or 'United States' in GLOSSARY[k] or 'China' in GLOSSARY[k] or 'Japan' in GLOSSARY[k] or 'Singapore' in GLOSSARY[k] or 'Malaysia' in GLOSSARY[k] or 'India' in GLOSSARY[k]], GLOSSARY)
-        self.province_city_patterns = self._compile_patterns([k for k in GLOSSARY.keys() if k not in self.country_patterns and 'จังหวัด' not in k and GLOSSARY[k] in ['Bangkok', 'Seoul', 'Busan', 'New York', 'London', 'Paris']], GLOSSARY)
-        self.disease_patterns = self._compile_patterns([k for k in GLOSSARY.keys() if 'โควิด' in k or 'เดงกี่' in k or 'ชิคุนกุนยา' in k or 'ไข้หวัดใหญ่' in k], GLOSSARY)
-
-    def _compile_patterns(self, terms_th: List[str], glossary: Dict[str, str]) -> Dict[str, re.Pattern]:
-        """Compiles regex patterns for glossary terms and their English equivalents."""
-        patterns = {}
-        for term_th in terms_th:
-            term_en = glossary.get(term_th, term_th) # Fallback to Thai if no English equivalent
-            # Use | for OR to match either Thai or English term (case-insensitive for English)
-            pattern_str = r'\b(?:' + re.escape(term_th) + r'|' + re.escape(term_en) + r')\b'
-            patterns[term_en] = re.compile(pattern_str, re.IGNORECASE)
-        return patterns
+        # fast / balanced / quality beam settings; output caps scale with each input's length
+        self.decoding_profile = decoding_profile
+        logger.info(f"Decoding profile: {self.decoding_profile}")
+        # Model calls the original per-row flow made that planning avoids (skipped title summaries)
+        self.saved_calls = {"summaries": 0}
+
+    def load(self) -> "EpidemicNewsPipeline":
+        """Load tokenizer, model backend and translation memory once; safe to call from many threads."""
+        if self._backend is not None:
+            return self
+        with self._load_lock:
+            if self._backend is not None:
+                return self
+            import torch
+            from transformers import T5TokenizerFast, T5ForConditionalGeneration
+            from core.quantize import QUANTIZED_INFERENCE
+            from core.inference import INFERENCE_BACKEND, make_backend
+
+            quantize = QUANTIZED_INFERENCE if self._quantize_requested is None else self._quantize_requested
+            device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+            # Fast (Rust) tokenizer: batch encoding and character offsets for the chunker
+            tokenizer = T5TokenizerFast.from_pretrained(self.model_id, legacy=False)
+            # PyTorch or ONNX Runtime, chosen by config; everything below only calls backend.generate()
+            # int8 dynamic quantization only helps (and only runs) on CPU
+            backend = make_backend(self.model_id, T5ForConditionalGeneration,
+                                   backend=self._backend_requested or INFERENCE_BACKEND,
+                                   device=device, quantize=quantize and device.type == "cpu")
+            self.quantized = quantize and backend.name == "pytorch" and backend.device.type == "cpu"
+            logger.info(f"Using device: {backend.device}")
+            logger.info(f"Loaded {self.model_id} on {backend.name} ({'int8 quantized' if self.quantized else 'fp32'})")
+            # Persistent sentence/chunk translations, consulted before every generate() call
+            # Quantized/ONNX outputs can differ slightly, and the decoding profile and output caps change
+            # what generate() returns, so each combination gets its own memory namespace
+            self._memory = TranslationMemory(self.model_id + ("+int8" if self.quantized else "")
+                                             + ("+onnx" if backend.name == "onnx" else "")
+                                             + f"+{cache_namespace(self.decoding_profile)}")
+            self._tokenizer = tokenizer
+            self._backend = backend # Set last: other threads only skip the lock once everything is ready
+        return self
+
+    def warm_up(self) -> float:
+        """Load everything and run one short generate() so the first real request is not the slow one."""
+        start = time.perf_counter()
+        self.load()
+        inputs = self.tokenizer(["Translate from en to th: Hello"], return_tensors="pt").to(self.device)
+        self.backend.generate(**inputs, max_length=8, num_beams=1)
+        elapsed = time.perf_counter() - start
+        logger.info(f"Warm-up of {self.model_id} took {elapsed:.1f}s")
+        return elapsed
+
+    @property
+    def tokenizer(self):
+        return self.load()._tokenizer
+
+    @property
+    def backend(self):
+        return self.load()._backend
+
+    @property
+    def memory(self) -> TranslationMemory:
+        return self.load()._memory
+
+    @property
+    def device(self):
+        return self.backend.device
+
+    @property
+    def model(self):
+        return self.backend.model
 
     def get_sentence_splitter(self, lang: str):
         if lang == "th":
+            from pythainlp.tokenize import sent_tokenize as th_sent_tokenize # For Thai
             return th_sent_tokenize
-        elif lang == "en":
-            return sent_tokenize
         elif lang == "ko":
+            import kss # For Korean
             return kss.split_sentences
-        else:
-            return sent_tokenize # Default to NLTK for unknown/other
+        # NLTK for English and unknown/other
+        _ensure_punkt()
+        from nltk.tokenize import sent_tokenize
+        return sent_tokenize
 
     def detect_language(self, text: str, db_language: Optional[str]) -> str:
         """Use the language column from the database; if not available, detect using simple heuristics."""
@@ -168,128 +287,167 @@ class EpidemicNewsPipeline:
 
     def replace_glossary_terms(self, text: str) -> Tuple[str, Dict[str, Tuple[str, str]]]:
         """Replace glossary terms with unique placeholders. Stores (original Thai term, English equivalent)."""
-        if not text:
-            return text, {}
-        term_map = {} # Maps placeholder -> (original Thai term, English equivalent)
-        idx = 1
-        # Sort terms by length in descending order to prevent partial matches
-        sorted_terms = sorted(GLOSSARY.items(), key=lambda item: len(item[0]), reverse=True)
-        
-        for term_th, term_en in sorted_terms:
-            pattern = r'\b' + re.escape(term_th) + r'\b'
-            if re.search(pattern, text):
-                # Placeholder contains original Thai term and English equivalent for easy lookup
-                unique_placeholder = f"[[GLOSSARY_{idx:03d}_{term_en.replace(' ', '_')}]]"
-                term_map[unique_placeholder] = (term_th, term_en) 
-                text = re.sub(pattern, unique_placeholder, text)
-                idx += 1
-        return text, term_map
+        # Single left-to-right pass over the text with the prebuilt automaton (longest term wins)
+        return GLOSSARY_ENGINE.protect(text)
 
     def restore_glossary_terms(self, text: str, term_map: Dict[str, Tuple[str, str]], target_lang: str) -> str:
         """Restores terms from placeholders based on the target language."""
-        if not text:
-            return text
-        
-        for placeholder, (original_th_term, english_equivalent) in term_map.items():
-            if target_lang == "th":
-                text = text.replace(placeholder, original_th_term)
-            elif target_lang == "en":
-                text = text.replace(placeholder, english_equivalent)
-            elif target_lang == "ko":
-                korean_equivalent = GLOSSARY_KO.get(english_equivalent, english_equivalent) # Lookup in KO glossary, fallback to EN
-                text = text.replace(placeholder, korean_equivalent)
-            # For other languages or if not found, the placeholder might remain or need more complex handling.
-            # Currently, it falls back to the English equivalent if no direct KO translation in GLOSSARY_KO.
-        return text
+        # One regex pass over all placeholders; Korean falls back to English if missing from GLOSSARY_KO
+        return GLOSSARY_ENGINE.restore(text, term_map, target_lang)
 
     def split_into_chunks(self, text: str, lang: str) -> List[str]:
         """
         Splits text into chunks respecting sentence boundaries, ensuring no chunk exceeds max_chunk_tokens.
         For sentences that are individually too long, they are further split by token count.
         """
+        return [chunk for chunk, _ in self.chunk_document(text, lang)]
+
+    def chunk_document(self, text: str, lang: str) -> List[Tuple[str, List[int]]]:
+        """
+        Same chunking as split_into_chunks, but from a single fast-tokenizer pass: sentences are mapped
+        onto token offsets, packed greedily by token count, and every chunk keeps its token ids
+        (and its exact source substring) so nothing is decoded or re-encoded before generation.
+        """
         if not text:
             return []
 
-        sentence_splitter = self.get_sentence_splitter(lang)
-        sentences = sentence_splitter(text)
-        chunks = []
-        current_chunk_sentences = []
-        current_chunk_token_count = 0
+        encoding = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        ids, offsets = encoding["input_ids"], encoding["offset_mapping"]
+        if not ids:
+            return []
+        token_starts = [start for start, _ in offsets]
+
+        # Sentence start offsets; text between sentences stays with the preceding sentence
+        boundaries, pos = [0], 0
+        for sentence in self.get_sentence_splitter(lang)(text):
+            sentence = sentence.strip()
+            found = text.find(sentence, pos) if sentence else -1
+            if found < 0:
+                continue
+            if found > boundaries[-1]:
+                boundaries.append(found)
+            pos = found + len(sentence)
+        token_bounds = [bisect_left(token_starts, b) for b in boundaries] + [len(ids)]
+        sentences = [(a, b) for a, b in zip(token_bounds, token_bounds[1:]) if a < b]
+
+        def span(a: int, b: int) -> Tuple[str, List[int]]:
+            return text[offsets[a][0]:offsets[b - 1][1]], ids[a:b]
+
+        # Recurring sentences (boilerplate, official statements) become their own chunk so their
+        # translation can be served from the translation memory. Decided once per document and stored
+        # with it, so chunking the same text again always yields the same chunks (and memory keys).
+        recurring = self.memory.recurring(lang, [span(a, b)[0] for a, b in sentences])
 
-        for sentence in sentences:
-            # Encode sentence to get actual token count
-            sentence_tokens = len(self.tokenizer.encode(sentence, add_special_tokens=False))
+        chunks = []
+        current = None # (first token, end token) of the chunk being packed
+        for n, (a, b) in enumerate(sentences):
+            sentence_tokens = b - a
 
-            # If a single sentence is larger than the chunk limit
+            # If a single sentence is larger than the chunk limit, split it by token count
             if sentence_tokens > self.max_chunk_tokens:
-                # Add any accumulated sentences as a separate chunk
-                if current_chunk_sentences:
-                    chunks.append(" ".join(current_chunk_sentences))
-                    current_chunk_sentences = []
-                    current_chunk_token_count = 0
-
+                if current:
+                    chunks.append(span(*current))
+                    current = None
                 logger.warning(
                     f"Sentence too long ({sentence_tokens} tokens) for max_chunk_tokens ({self.max_chunk_tokens}). "
                     f"Breaking down the long sentence into sub-token chunks."
                 )
-                
-                # Directly encode and split by tokens for oversized sentences
-                encoded_sentence = self.tokenizer.encode(sentence, add_special_tokens=False)
-                start_idx = 0
-                while start_idx < len(encoded_sentence):
-                    end_idx = min(start_idx + self.max_chunk_tokens, len(encoded_sentence))
-                    token_chunk_text = self.tokenizer.decode(encoded_sentence[start_idx:end_idx], skip_special_tokens=True)
-                    chunks.append(token_chunk_text)
-                    start_idx = end_idx
-                
-                continue # Move to the next original sentence
-
-            # Check if adding this sentence will exceed the token limit for the current chunk
-            # Add a small buffer for potential spaces between sentences when joining
-            # +1 is for the space that would be added if joining with previous sentences
-            potential_new_token_count = current_chunk_token_count + sentence_tokens + (1 if current_chunk_sentences else 0)
-
-            if potential_new_token_count <= self.max_chunk_tokens:
-                current_chunk_sentences.append(sentence)
-                current_chunk_token_count = potential_new_token_count
+                for start_idx in range(a, b, self.max_chunk_tokens):
+                    chunks.append(span(start_idx, min(start_idx + self.max_chunk_tokens, b)))
+                continue
+
+            if n in recurring:
+                if current:
+                    chunks.append(span(*current))
+                    current = None
+                chunks.append(span(a, b))
+                continue
+
+            if current and b - current[0] <= self.max_chunk_tokens:
+                current = (current[0], b)
             else:
                 # Current sentence doesn't fit, finalize current chunk and start new one
-                if current_chunk_sentences:
-                    chunks.append(" ".join(current_chunk_sentences))
-                current_chunk_sentences = [sentence]
-                current_chunk_token_count = sentence_tokens
-
-        # Add any remaining sentences as the last chunk
-        if current_chunk_sentences:
-            chunks.append(" ".join(current_chunk_sentences))
+                if current:
+                    chunks.append(span(*current))
+                current = (a, b)
 
+        if current:
+            chunks.append(span(*current))
         return chunks
 
+    def _prefix_ids(self, prefix: str) -> List[int]:
+        """Token ids of a prompt prefix (cached), so chunk ids can be appended without re-encoding."""
+        if prefix not in self._prefix_cache:
+            self._prefix_cache[prefix] = self.tokenizer(prefix, add_special_tokens=False)["input_ids"]
+        return self._prefix_cache[prefix]
+
+    def _prompt_ids(self, prefix: str, token_ids: List[int]) -> List[int]:
+        """prefix + text ids + </s>, truncated to model_max_input_length like tokenizer(truncation=True)."""
+        prefix_ids = self._prefix_ids(prefix)
+        room = self.model_max_input_length - len(prefix_ids) - 1
+        return prefix_ids + token_ids[:room] + [self.tokenizer.eos_token_id]
+
     def translate_text(self, text: str, source_lang: str, target_lang: str) -> str:
         """Translates text. Guarantees input respects model_max_input_length."""
-        if not text:
-            return ""
-        
-        prompt = f"Translate from {source_lang} to {target_lang}: {text}"
-        inputs = self.tokenizer(prompt, return_tensors="pt", max_length=self.model_max_input_length, truncation=True).to(self.device)
-        
-        # Log if truncation happened at tokenizer level
-        if inputs['input_ids'].shape[1] > self.model_max_input_length:
-            logger.warning(f"Translation input was truncated to {self.model_max_input_length} tokens after prompt. Original text length: {len(self.tokenizer.encode(text, add_special_tokens=False))} tokens.")
+        return self.translate_batch([(text, source_lang, target_lang)])[0]
 
-        try:
-            outputs = self.model.generate(
-                **inputs,
-                max_length=self.model_max_input_length, 
-                num_beams=4,
-                early_stopping=True,
-                do_sample=False # For more deterministic output
-            )
-            translated = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return translated
-        except Exception as e:
-            logger.error(f"Error during translation from {source_lang} to {target_lang} for text '{text[:50]}...': {str(e)}")
-            return "" # Return empty string on failure
+    def translate_batch(self, requests: List[Tuple[str, str, str]], token_budget: int = TRANSLATE_TOKEN_BUDGET,
+                        max_batch_size: int = TRANSLATE_MAX_BATCH,
+                        token_ids: Optional[List[Optional[List[int]]]] = None) -> List[str]:
+        """
+        Translates many (text, source_lang, target_lang) requests with as few generate() calls as possible.
+        Prompts are sorted by token length and packed into padded batches within token_budget,
+        then results are scattered back in request order ("" for empty input or a failed batch).
+        token_ids[i], when given (e.g. from chunk_document), is used instead of tokenizing text i again.
+        """
+        results = [""] * len(requests)
+        # Translation memory first: repeated segments cost a lookup instead of a beam search
+        remembered = iter(self.memory.get_many([r for r in requests if r[0]]))
+        prompts, positions, pairs = [], [], []
+        for i, (text, source_lang, target_lang) in enumerate(requests):
+            if not text:
+                continue
+            stored = next(remembered)
+            if stored is not None:
+                results[i] = stored
+            else:
+                prompts.append(f"Translate from {source_lang} to {target_lang}: {text}")
+                positions.append(i)
+                pairs.append((source_lang, target_lang))
+        if not prompts:
+            return results
+
+        encoded: List[Optional[List[int]]] = [None] * len(prompts)
+        for j, i in enumerate(positions):
+            if token_ids is not None and token_ids[i] is not None:
+                source_lang, target_lang = pairs[j]
+                encoded[j] = self._prompt_ids(f"Translate from {source_lang} to {target_lang}: ", token_ids[i])
+        untokenized = [j for j in range(len(prompts)) if encoded[j] is None]
+        if untokenized:
+            batch_ids = self.tokenizer([prompts[j] for j in untokenized], max_length=self.model_max_input_length,
+                                       truncation=True)["input_ids"]
+            for j, ids in zip(untokenized, batch_ids):
+                encoded[j] = ids
+        lengths = [len(ids) for ids in encoded]
+        for j in range(len(prompts)):
+            if lengths[j] >= self.model_max_input_length:
+                logger.warning(f"Translation input was truncated to {self.model_max_input_length} tokens after prompt.")
+        order = sorted(range(len(prompts)), key=lambda j: lengths[j], reverse=True)
+
+        for batch in length_batches(order, lengths, token_budget, max_batch_size):
+            inputs = self.tokenizer.pad({"input_ids": [encoded[j] for j in batch]}, return_tensors="pt").to(self.device)
+            # Output cap follows the member that needs the longest output, not a fixed 512 tokens
+            widest = max(batch, key=lambda j: output_cap("translate", lengths[j], *pairs[j]))
+            settings = generation_kwargs("translate", lengths[widest], *pairs[widest], profile=self.decoding_profile)
+            try:
+                outputs = self.backend.generate(**inputs, **settings)
+                for j, translated in zip(batch, self.tokenizer.batch_decode(outputs, skip_special_tokens=True)):
+                    results[positions[j]] = translated
+            except Exception as e:
+                logger.error(f"Error during batched translation of {len(batch)} prompts "
+                             f"(first: '{prompts[batch[0]][:50]}...'): {str(e)}")
+        self.memory.put_many([(*requests[i], results[i]) for i in positions])
+        return results
 
     def summarize_text(self, text: str, lang: str) -> str:
         """
@@ -299,36 +457,24 @@ class EpidemicNewsPipeline:
         if not text:
             return ""
         
-        # Calculate max tokens for the text content, considering prompt length
+        # Encode the text once; the prompt is assembled from token ids (no decode/re-encode to truncate)
         prompt_prefix = f"Summarize the following text in {lang} to 500-700 characters: "
-        prompt_prefix_tokens = len(self.tokenizer.encode(prompt_prefix, add_special_tokens=False))
-        max_text_tokens_for_summarization = self.model_max_input_length - prompt_prefix_tokens
+        max_text_tokens_for_summarization = self.model_max_input_length - len(self._prefix_ids(prompt_prefix)) - 1
+        encoded_text = self.tokenizer(text, add_special_tokens=False)["input_ids"]
 
-        # Truncate text *before* tokenizing and adding prompt, to ensure it fits.
-        encoded_text = self.tokenizer.encode(text, add_special_tokens=False)
-        
         if len(encoded_text) > max_text_tokens_for_summarization:
             logger.warning(
                 f"Full text for summarization is too long ({len(encoded_text)} tokens). "
                 f"Truncating to {max_text_tokens_for_summarization} tokens for summary generation in {lang}."
             )
-            text_to_summarize = self.tokenizer.decode(encoded_text[:max_text_tokens_for_summarization], skip_special_tokens=True)
-        else:
-            text_to_summarize = text
+        inputs = self.tokenizer.pad({"input_ids": [self._prompt_ids(prompt_prefix, encoded_text)]},
+                                    return_tensors="pt").to(self.device)
+        # Up to 150 tokens (500-700 chars), less for short inputs
+        settings = generation_kwargs("summarize", min(len(encoded_text), max_text_tokens_for_summarization),
+                                     profile=self.decoding_profile)
 
-        prompt = prompt_prefix + text_to_summarize
-        inputs = self.tokenizer(prompt, return_tensors="pt", max_length=self.model_max_input_length, truncation=True).to(self.device)
-        
         try:
-            outputs = self.model.generate(
-                **inputs,
-                max_length=150, # Sufficient for 500-700 chars usually
-                min_length=50,
-                length_penalty=1.0,
-                num_beams=4,
-                early_stopping=True,
-                do_sample=False
-            )
+            outputs = self.backend.generate(**inputs, length_penalty=1.0, **settings)
             summary = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
             return summary[:700] # Truncate to character limit after generation
         except Exception as e:
@@ -340,244 +486,270 @@ class EpidemicNewsPipeline:
         Extracts 3-5 relevant hashtags (country, province/city, disease).
         Operates on the provided text (e.g., summary or beginning of content).
         """
-        hashtags = set()
-        
-        # Convert text to lowercase for case-insensitive matching
-        lower_text = text.lower()
-
-        # Helper to add hashtags and limit count
-        def add_hashtag(tag_key: str, glossary_map: Dict[str, str], current_lang: str):
-            if tag_key in glossary_map:
-                if current_lang == "en":
-                    hashtags.add(f"#{glossary_map[tag_key].replace(' ', '')}")
-                elif current_lang == "th":
-                    hashtags.add(f"#{tag_key.replace(' ', '')}")
-                elif current_lang == "ko":
-                    ko_equiv = GLOSSARY_KO.get(glossary_map[tag_key], glossary_map[tag_key]) # Try KO, fallback to EN
-                    hashtags.add(f"#{ko_equiv.replace(' ', '')}")
-            if len(hashtags) >= 5: return True
-            return False
-
-        # 1. Detect Countries
-        for th_term, en_term in GLOSSARY.items():
-            if 'ประเทศ' in th_term or en_term in ['Thailand', 'South Korea', 'United States', 'China', 'Japan', 'Singapore', 'Malaysia', 'India']:
-                 if re.search(r'\b(?:' + re.escape(th_term) + r'|' + re.escape(en_term) + r')\b', text, re.IGNORECASE):
-                    if add_hashtag(th_term, GLOSSARY, lang): break
-
-        # 2. Detect Provinces/Cities (more specific for each language)
-        if lang == "th":
-            for th_term, en_term in GLOSSARY.items():
-                if th_term in self.province_city_patterns and self.province_city_patterns[en_term].search(text):
-                    if add_hashtag(th_term, GLOSSARY, lang): break
-        elif lang == "en":
-            for th_term, en_term in GLOSSARY.items():
-                if en_term in ['Bangkok', 'Seoul', 'Busan', 'New York', 'London', 'Paris'] and re.search(r'\b' + re.escape(en_term) + r'\b', text, re.IGNORECASE):
-                    if add_hashtag(th_term, GLOSSARY, lang): break
-        elif lang == "ko":
-            for th_term, en_term in GLOSSARY.items():
-                ko_equiv = GLOSSARY_KO.get(en_term)
-                if ko_equiv and re.search(r'\b' + re.escape(ko_equiv) + r'\b', text, re.IGNORECASE):
-                    if add_hashtag(th_term, GLOSSARY, lang): break
-                elif en_term in ['Seoul', 'Busan'] and re.search(r'\b' + re.escape(en_term) + r'\b', text, re.IGNORECASE): # Fallback if no KO in glossary for common cities
-                    if add_hashtag(th_term, GLOSSARY, lang): break
-
-
-        # 3. Detect Diseases
-        for th_term, en_term in GLOSSARY.items():
-            if 'โควิด' in th_term or 'เดงกี่' in th_term or 'ชิคุนกุนยา' in th_term or 'ไข้หวัดใหญ่' in th_term:
-                if re.search(r'\b(?:' + re.escape(th_term) + r'|' + re.escape(en_term) + r')\b', text, re.IGNORECASE):
-                    if add_hashtag(th_term, GLOSSARY, lang): break
-
-        return list(hashtags)[:5] # Return up to 5 hashtags
+        # Single scan with the prebuilt entity index; most-mentioned entities first
+        return HASHTAG_INDEX.extract(text, lang, limit=5)
 
     def process_text(self, text: str, source_lang: str, target_langs: List[str]) -> Dict[str, str]:
         """Process text: protect terms, chunk, translate, summarize, generate hashtags."""
-        if not text:
-            empty_results = {lang: "" for lang in target_langs}
-            empty_summaries = {f"summary_{lang}": "" for lang in target_langs}
-            empty_hashtags = {f"hashtags_{lang}": [] for lang in target_langs}
-            return {**empty_results, **empty_summaries, **empty_hashtags}
+        return self.process_texts([(text, source_lang)], target_langs)[0]
 
-        protected_text, term_map = self.replace_glossary_terms(text)
-        chunks = self.split_into_chunks(protected_text, source_lang) # Pass source_lang for appropriate splitter
-        
-        # Initialize results structure
-        translated_chunks_by_lang = {lang: [] for lang in target_langs}
-
-        # If source language is a target language, populate its chunks directly (restored)
-        if source_lang in target_langs:
-            for chunk in chunks:
-                # Restore original Thai terms into Thai chunks
-                translated_chunks_by_lang[source_lang].append(self.restore_glossary_terms(chunk, term_map, source_lang))
-
-        # Process translation for other target languages
-        for i, chunk in enumerate(chunks):
-            current_chunk_id = f"Chunk {i+1}/{len(chunks)}"
-            
-            # Pivot through English for better quality, unless source is already English
-            en_chunk_for_pivot = ""
-            if source_lang == "en":
-                en_chunk_for_pivot = chunk
-            else:
-                en_chunk_for_pivot = self.translate_text(chunk, source_lang, "en")
-                if not en_chunk_for_pivot:
+    def process_texts(self, items: List[Tuple[str, str]], target_langs: List[str],
+                      summarize: Optional[List[bool]] = None) -> List[Dict[str, str]]:
+        """
+        Process many (text, source_lang) items together. Every chunk of every text is pivoted to
+        English in one batched call, then all pivots go to the remaining targets in a second one.
+        summarize[i] = False skips summary and hashtags for item i (e.g. titles).
+        """
+        prepared = [] # (source_lang, term_map, chunks) per item
+        chunk_ids = [] # token ids of each chunk, straight from the chunker
+        for text, source_lang in items:
+            protected_text, term_map = self.replace_glossary_terms(text)
+            chunked = self.chunk_document(protected_text, source_lang) if text else []
+            prepared.append((source_lang, term_map, [chunk for chunk, _ in chunked]))
+            chunk_ids.append([ids for _, ids in chunked])
+
+        # Pivot through English for better quality, unless source is already English
+        pivot_items = [(chunk, source_lang, "en", ids) for (source_lang, _, chunks), item_ids in zip(prepared, chunk_ids)
+                       if source_lang != "en" for chunk, ids in zip(chunks, item_ids)]
+        pivots = iter(self.translate_batch([item[:3] for item in pivot_items],
+                                           token_ids=[item[3] for item in pivot_items]))
+        en_chunks = [[chunk if source_lang == "en" else next(pivots) for chunk in chunks]
+                     for source_lang, _, chunks in prepared]
+
+        # English pivot -> every other target language, all texts and chunks in one batch
+        requests = [(i, k, lang) for i, (source_lang, _, _) in enumerate(prepared)
+                    for k, en_chunk in enumerate(en_chunks[i]) if en_chunk
+                    for lang in target_langs if lang not in ("en", source_lang)]
+        translated = dict(zip(requests, self.translate_batch([(en_chunks[i][k], "en", lang) for i, k, lang in requests])))
+
+        results = []
+        for i, (text, _) in enumerate(items):
+            source_lang, term_map, chunks = prepared[i]
+            if not text:
+                empty_results = {lang: "" for lang in target_langs}
+                empty_summaries = {f"summary_{lang}": "" for lang in target_langs}
+                empty_hashtags = {f"hashtags_{lang}": [] for lang in target_langs}
+                results.append({**empty_results, **empty_summaries, **empty_hashtags})
+                continue
+
+            translated_chunks_by_lang = {lang: [] for lang in target_langs}
+            # If source language is a target language, populate its chunks directly (restored)
+            if source_lang in target_langs:
+                for chunk in chunks:
+                    translated_chunks_by_lang[source_lang].append(self.restore_glossary_terms(chunk, term_map, source_lang))
+
+            for k, en_chunk in enumerate(en_chunks[i]):
+                current_chunk_id = f"Chunk {k+1}/{len(chunks)}"
+                if not en_chunk:
                     logger.warning(f"Skipping translation for {current_chunk_id} due to English pivot failure.")
                     continue
-
-            # Translate to English (if not source language)
-            if "en" in target_langs and source_lang != "en":
-                translated_chunks_by_lang["en"].append(self.restore_glossary_terms(en_chunk_for_pivot, term_map, "en"))
-
-            # Translate to Thai (if not source language)
-            if "th" in target_langs and source_lang != "th":
-                th_chunk = self.translate_text(en_chunk_for_pivot, "en", "th")
-                if th_chunk:
-                    translated_chunks_by_lang["th"].append(self.restore_glossary_terms(th_chunk, term_map, "th"))
+                if "en" in target_langs and source_lang != "en":
+                    translated_chunks_by_lang["en"].append(self.restore_glossary_terms(en_chunk, term_map, "en"))
+                for lang in target_langs:
+                    if lang in ("en", source_lang):
+                        continue
+                    if translated[(i, k, lang)]:
+                        translated_chunks_by_lang[lang].append(self.restore_glossary_terms(translated[(i, k, lang)], term_map, lang))
+                    else:
+                        logger.warning(f"Skipping {lang} translation for {current_chunk_id} due to failure.")
+
+            results.append({lang: " ".join(translated_chunks_by_lang[lang]) for lang in target_langs})
+
+        # Summaries: one summarize call per text in the pivot language, then the summary is
+        # translated to the other targets in one batch instead of summarizing every language again
+        pivot_lang = "en" if "en" in target_langs else target_langs[0]
+        summary_items = [i for i, (text, _) in enumerate(items) if text and (summarize is None or summarize[i])]
+        pivot_summaries = {i: self.summarize_text(results[i][pivot_lang], pivot_lang) for i in summary_items}
+        summary_requests = [(i, lang) for i in summary_items if pivot_summaries[i]
+                            for lang in target_langs if lang != pivot_lang]
+        translated_summaries = dict(zip(summary_requests, self.translate_batch(
+            [(pivot_summaries[i], pivot_lang, lang) for i, lang in summary_requests])))
+
+        for i, (text, _) in enumerate(items):
+            if not text:
+                continue
+            for lang in target_langs:
+                if lang == pivot_lang:
+                    summary = pivot_summaries.get(i, "")
                 else:
-                    logger.warning(f"Skipping Thai translation for {current_chunk_id} due to failure.")
-
-            # Translate to Korean (if not source language)
-            if "ko" in target_langs and source_lang != "ko":
-                ko_chunk = self.translate_text(en_chunk_for_pivot, "en", "ko")
-                if ko_chunk:
-                    translated_chunks_by_lang["ko"].append(self.restore_glossary_terms(ko_chunk, term_map, "ko"))
-                else:
-                    logger.warning(f"Skipping Korean translation for {current_chunk_id} due to failure.")
-
-        final_processed_data = {}
-        for lang in target_langs:
-            concatenated_text = " ".join(translated_chunks_by_lang[lang])
-            final_processed_data[lang] = concatenated_text
-
-            # For summarization and hashtag generation, use the concatenated text
-            # The summarize_text and generate_hashtags functions handle their own truncation
-            summary = self.summarize_text(concatenated_text, lang)
-            # Generate hashtags from the summary for conciseness
-            hashtags = self.extract_hashtags(summary, lang) 
-            
-            final_processed_data[f"summary_{lang}"] = summary
-            final_processed_data[f"hashtags_{lang}"] = hashtags
+                    summary = translated_summaries.get((i, lang), "")[:700]
+                results[i][f"summary_{lang}"] = summary
+                # Generate hashtags from the summary for conciseness
+                results[i][f"hashtags_{lang}"] = self.extract_hashtags(summary, lang)
 
-        return final_processed_data
+        return results
 
     def process_row(self, row: Dict) -> Dict:
         """Process a database row."""
-        try:
-            title = row.get('title', '') or ''
-            content = row.get('content_raw', '') or ''
-            source_lang = self.detect_language(title + " " + content, row.get('language'))
-            logger.info(f"Processing row {row.get('id', 'unknown')}, detected language: {source_lang}")
+        return self.process_rows([row])[0]
 
+    def process_rows(self, rows: List[Dict]) -> List[Dict]:
+        """Process several database rows; titles and contents of all rows share translation batches."""
+        try:
             target_langs = ["th", "en", "ko"]
-            
-            # Process title (typically short, so less prone to chunking issues)
-            title_processed_data = self.process_text(title, source_lang, target_langs)
-
-            # Process content
-            content_processed_data = self.process_text(content, source_lang, target_langs)
-
-            update_data = {
-                'title_th': title_processed_data.get('th', title),
-                'title_en': title_processed_data.get('en', title),
-                'title_ko': title_processed_data.get('ko', title),
-                'content_translated_th': content_processed_data.get('th', content),
-                'content_translated_en': content_processed_data.get('en', content),
-                'content_translated_ko': content_processed_data.get('ko', content),
-                'summary_th': content_processed_data.get('summary_th', ''),
-                'summary_en': content_processed_data.get('summary_en', ''),
-                'summary_ko': content_processed_data.get('summary_ko', ''),
-                'hashtags_th': content_processed_data.get('hashtags_th', []),
-                'hashtags_en': content_processed_data.get('hashtags_en', []),
-                'hashtags_ko': content_processed_data.get('hashtags_ko', []),
-                'is_translated': True,
-                'is_summarized': True
-            }
-            return update_data
+            items = []
+            for row in rows:
+                title = row.get('title', '') or ''
+                content = row.get('content_raw', '') or ''
+                source_lang = self.detect_language(title + " " + content, row.get('language'))
+                logger.info(f"Processing row {row.get('id', 'unknown')}, detected language: {source_lang}")
+                # Title (typically short, so less prone to chunking issues) and content
+                items += [(title, source_lang), (content, source_lang)]
+
+            # Only the content needs a summary and hashtags; titles are translated only
+            processed = self.process_texts(items, target_langs, summarize=[False, True] * len(rows))
+            # The original per-row flow summarized titles in every target language too
+            self.saved_calls["summaries"] += len(target_langs) * sum(1 for text, _ in items[::2] if text)
+
+            updates = []
+            for idx, row in enumerate(rows):
+                title = row.get('title', '') or ''
+                content = row.get('content_raw', '') or ''
+                title_processed_data, content_processed_data = processed[2 * idx], processed[2 * idx + 1]
+                update_data = {
+                    'title_th': title_processed_data.get('th', title),
+                    'title_en': title_processed_data.get('en', title),
+                    'title_ko': title_processed_data.get('ko', title),
+                    'content_translated_th': content_processed_data.get('th', content),
+                    'content_translated_en': content_processed_data.get('en', content),
+                    'content_translated_ko': content_processed_data.get('ko', content),
+                    'summary_th': content_processed_data.get('summary_th', ''),
+                    'summary_en': content_processed_data.get('summary_en', ''),
+                    'summary_ko': content_processed_data.get('summary_ko', ''),
+                    'hashtags_th': content_processed_data.get('hashtags_th', []),
+                    'hashtags_en': content_processed_data.get('hashtags_en', []),
+                    'hashtags_ko': content_processed_data.get('hashtags_ko', []),
+                    'is_translated': True,
+                    'is_summarized': True
+                }
+                updates.append(update_data)
+            return updates
         except Exception as e:
-            logger.error(f"Error processing row {row.get('id', 'unknown')}: {str(e)}")
-            return {}
+            if len(rows) > 1:
+                # Retry one by one so a single bad row does not fail the whole batch
+                logger.error(f"Error processing batch of {len(rows)} rows, retrying individually: {str(e)}")
+                return [self.process_row(row) for row in rows]
+            logger.error(f"Error processing row {rows[0].get('id', 'unknown')}: {str(e)}")
+            return [{}]
+
+    def run(self, claim_size: int = ROW_BATCH, lease_seconds: int = None, worker_id: str = None):
+        """
+        Run the main pipeline as one worker of a leased work queue: claim a few rows, process them
+        while a heartbeat keeps the lease alive, write results, repeat until nothing is claimable.
+        Any number of workers on any number of machines can run this against the same database.
+        """
+        import psycopg2
+        from core.work_queue import WorkQueue, LEASE_SECONDS
 
-    def run(self):
-        """Run the main pipeline."""
-        conn = None
-        cursor = None
+        configure_logging()
+        queue = None
+        claimed = []
+        done = failed = 0
         try:
-            conn = psycopg2.connect(**DB_PARAMS)
-            conn.autocommit = False # Ensure transactions are explicit
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            
-            # Fetch only rows that haven't been processed yet and lock them
-            cursor.execute("SELECT id, title, content_raw, language FROM epidemic_news WHERE is_translated = FALSE OR is_summarized = FALSE FOR UPDATE SKIP LOCKED") 
-            rows = cursor.fetchall()
-            total_rows = len(rows)
-            logger.info(f"Found {total_rows} rows to process (untranslated/unsummarized)")
-
-            if total_rows == 0:
-                print("No new rows to process. Pipeline finished.")
-                logger.info("No new rows to process. Pipeline finished.")
-                return
-
-            for idx, row_dict in enumerate(rows, 1):
-                print(f"Processing row {idx}/{total_rows} (ID: {row_dict.get('id', 'N/A')})")
-                update_data = self.process_row(row_dict)
-                if update_data:
-                    update_query = """
-                        UPDATE epidemic_news
-                        SET
-                            title_th = %s,
-                            title_en = %s,
-                            title_ko = %s,
-                            content_translated_th = %s,
-                            content_translated_en = %s,
-                            content_translated_ko = %s,
-                            summary_th = %s,
-                            summary_en = %s,
-                            summary_ko = %s,
-                            hashtags_th = %s,
-                            hashtags_en = %s,
-                            hashtags_ko = %s,
-                            is_translated = %s,
-                            is_summarized = %s
-                        WHERE id = %s
-                    """
+            queue = WorkQueue(lambda: psycopg2.connect(**DB_PARAMS), worker_id=worker_id,
+                              lease_seconds=lease_seconds or LEASE_SECONDS)
+            queue.ensure_schema()
+            logger.info(f"Worker {queue.worker_id} started (claim {claim_size} rows, lease {queue.lease_seconds}s)")
+
+            while True:
+                # Rows are only locked for the claim itself; the lease (not a row lock) protects them after that
+                claimed = queue.claim(claim_size)
+                if not claimed:
+                    break
+                ids = [row['id'] for row in claimed]
+                print(f"Processing rows (IDs: {', '.join(str(i) for i in ids)}) as {queue.worker_id}")
+                with queue.keep_alive(ids):
+                    updates = self.process_rows(claimed)
+
+                for row_dict, update_data in zip(claimed, updates):
                     try:
-                        cursor.execute(update_query, (
-                            update_data['title_th'],
-                            update_data['title_en'],
-                            update_data['title_ko'],
-                            update_data['content_translated_th'],
-                            update_data['content_translated_en'],
-                            update_data['content_translated_ko'],
-                            update_data['summary_th'],
-                            update_data['summary_en'],
-                            update_data['summary_ko'],
-                            update_data['hashtags_th'],
-                            update_data['hashtags_en'],
-                            update_data['hashtags_ko'],
-                            update_data['is_translated'],
-                            update_data['is_summarized'],
-                            row_dict['id']
-                        ))
-                        conn.commit() # Commit each row individually
-                        logger.info(f"Successfully updated row {row_dict['id']}")
+                        if not update_data:
+                            queue.release([row_dict['id']], error="processing error")
+                            failed += 1
+                            logger.warning(f"Released row {row_dict['id']} due to processing error.")
+                        elif queue.complete(row_dict['id'], update_data):
+                            done += 1
+                            logger.info(f"Successfully updated row {row_dict['id']}")
+                        else:
+                            logger.warning(f"Lease on row {row_dict['id']} was lost; result discarded.")
                     except Exception as e:
-                        conn.rollback() # Rollback if update fails for this row
+                        failed += 1
                         logger.error(f"Failed to update row {row_dict.get('id', 'unknown')}: {str(e)}")
-                else:
-                    logger.warning(f"Skipping update for row {row_dict.get('id', 'unknown')} due to processing error.")
+                        queue.release([row_dict['id']], error=str(e))
+                claimed = []
 
+            if done == 0 and failed == 0:
+                print("No new rows to process. Pipeline finished.")
+                logger.info("No new rows to process. Pipeline finished.")
+                return
+
+            logger.info(f"Rows completed: {done}, released after failure: {failed}")
+            logger.info(f"Model calls saved: {self.saved_calls}")
+            logger.info(f"Translation memory: {self.memory.report()}")
+            print(f"Translation memory hit rate: {self.memory.report()['hit_rate']:.1%}")
             logger.info("Pipeline run completed.")
-            print("Pipeline run completed.")
+            print(f"Pipeline run completed: {done} rows updated, {failed} released.")
         except Exception as e:
             logger.error(f"Pipeline failed: {str(e)}")
             print(f"Pipeline failed: {str(e)}")
             raise
         finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+            if queue:
+                # Hand unfinished rows back right away instead of waiting for their leases to expire
+                if claimed:
+                    try:
+                        queue.release([row['id'] for row in claimed], error="worker stopped")
+                    except Exception as e:
+                        logger.error(f"Could not release rows on shutdown: {str(e)}")
+                queue.close()
+
+# ─────────────────────────────
+# 🔹 Shared pipeline for callers that only need translate() (ETL plan, tools)
+# ─────────────────────────────
+_shared_pipeline: Optional[EpidemicNewsPipeline] = None
+_shared_lock = threading.Lock()
+
+def get_pipeline() -> EpidemicNewsPipeline:
+    """Process-wide EpidemicNewsPipeline, created on first call; the model loads on first use."""
+    global _shared_pipeline
+    if _shared_pipeline is None:
+        with _shared_lock:
+            if _shared_pipeline is None:
+                configure_logging()
+                _shared_pipeline = EpidemicNewsPipeline()
+    return _shared_pipeline
+
+def warm_up() -> float:
+    """Load the shared pipeline's model ahead of the first request; returns seconds spent."""
+    return get_pipeline().warm_up()
+
+def translate(text: str, src: str = "th", tgt: str = "en") -> str:
+    """Glossary-protected translation of one text with the shared pipeline (pivoting through English)."""
+    return translate_many([(text, src, tgt)])[0]
+
+def translate_many(requests: List[Tuple[str, str, str]]) -> List[str]:
+    """translate() for many (text, src, tgt) at once; texts with the same target share translation batches."""
+    results = [text for text, _, _ in requests]
+    by_target: Dict[str, List[int]] = {}
+    for i, (text, src, tgt) in enumerate(requests):
+        if text and src != tgt:
+            by_target.setdefault(tgt, []).append(i)
+    for tgt, indices in by_target.items():
+        processed = get_pipeline().process_texts([(requests[i][0], requests[i][1]) for i in indices], [tgt],
+                                                 summarize=[False] * len(indices))
+        for i, outputs in zip(indices, processed):
+            results[i] = outputs[tgt]
+    return results
 
 if __name__ == "__main__":
+    import argparse
+
+    # Start one of these per machine/GPU; workers divide the rows through leases in the database
+    parser = argparse.ArgumentParser(description="Translate/summarize unprocessed epidemic_news rows")
+    parser.add_argument("--claim-size", type=int, default=ROW_BATCH, help="rows leased per claim")
+    parser.add_argument("--lease-seconds", type=int, default=None, help="lease length before rows can be reclaimed")
+    parser.add_argument("--worker-id", default=None, help="defaults to hostname:pid")
+    args = parser.parse_args()
+
     pipeline = EpidemicNewsPipeline()
-    pipeline.run()
\ No newline at end of file
+    pipeline.run(claim_size=args.claim_size, lease_seconds=args.lease_seconds, worker_id=args.worker_id)
\ No newline at end of file
@@ -0,0 +1,167 @@
+import logging
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List
+
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────
+# 🔹 Leased work queue on epidemic_news
+# ─────────────────────────────
+# Workers claim a few rows by stamping lease_owner/lease_expires_at in a short transaction
+# (FOR UPDATE SKIP LOCKED only while claiming), so no row lock is held during model inference.
+# A heartbeat extends the lease while a batch is processed; a crashed worker's rows become
+# claimable again once the lease expires. Results are only written while the lease is still ours.
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3        # rows failing this many times are left for manual inspection (see last_error)
+
+LEASE_COLUMNS = {
+    "lease_owner": "TEXT",
+    "lease_expires_at": "TIMESTAMPTZ",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "last_error": "TEXT",
+}
+PENDING_INDEX = "epidemic_news_pending_idx"
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class WorkQueue:
+    """
+    One connection, serialized by a lock so the heartbeat thread can share it with the worker.
+    Every method is a single short transaction.
+    """
+    def __init__(self, connect: Callable, worker_id: str = None, lease_seconds: int = LEASE_SECONDS,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.conn = connect()
+        self.conn.autocommit = False
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+    def _execute(self, query, params=None) -> List[Dict]:
+        with self._lock:
+            try:
+                with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(query, params)
+                    rows = cursor.fetchall() if cursor.description else []
+                self.conn.commit()
+                return rows
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def ensure_schema(self):
+        """
+        Adds the lease columns and the pending-rows index only if they are missing. The check reads the
+        catalog (no table lock), so a worker starting against a migrated table never takes the ACCESS
+        EXCLUSIVE lock of ALTER TABLE; the index is built CONCURRENTLY so writers are not blocked.
+        """
+        existing = {row["column_name"] for row in self._execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'epidemic_news'")}
+        missing = [column for column in LEASE_COLUMNS if column not in existing]
+        if missing:
+            logger.info(f"Adding lease columns to epidemic_news: {missing}")
+            self._execute(sql.SQL("ALTER TABLE epidemic_news {}").format(sql.SQL(", ").join(
+                sql.SQL("ADD COLUMN IF NOT EXISTS {} " + LEASE_COLUMNS[column]).format(sql.Identifier(column))
+                for column in missing)))
+
+        if not self._execute("SELECT 1 FROM pg_indexes WHERE schemaname = current_schema() "
+                             "AND tablename = 'epidemic_news' AND indexname = %s", (PENDING_INDEX,)):
+            logger.info(f"Creating index {PENDING_INDEX} concurrently")
+            with self._lock:
+                self.conn.autocommit = True # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+                try:
+                    with self.conn.cursor() as cursor:
+                        cursor.execute(sql.SQL("""
+                            CREATE INDEX CONCURRENTLY IF NOT EXISTS {} ON epidemic_news (id)
+                            WHERE is_translated = FALSE OR is_summarized = FALSE
+                        """).format(sql.Identifier(PENDING_INDEX)))
+                finally:
+                    self.conn.autocommit = False
+
+    def claim(self, limit: int) -> List[Dict]:
+        """Leases up to limit unprocessed rows that nobody holds (or whose lease expired)."""
+        return self._execute("""
+            UPDATE epidemic_news
+            SET lease_owner = %s,
+                lease_expires_at = now() + %s * interval '1 second',
+                attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM epidemic_news
+                WHERE (is_translated = FALSE OR is_summarized = FALSE)
+                  AND (lease_expires_at IS NULL OR lease_expires_at < now())
+                  AND attempts < %s
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, title, content_raw, language
+        """, (self.worker_id, self.lease_seconds, self.max_attempts, limit))
+
+    def heartbeat(self, ids: Iterable) -> List:
+        """Extends our leases; returns the ids we still hold (a missing id was taken over after expiry)."""
+        ids = list(ids)
+        if not ids:
+            return []
+        rows = self._execute("""
+            UPDATE epidemic_news SET lease_expires_at = now() + %s * interval '1 second'
+            WHERE id = ANY(%s) AND lease_owner = %s
+            RETURNING id
+        """, (self.lease_seconds, ids, self.worker_id))
+        return [row["id"] for row in rows]
+
+    def complete(self, row_id, fields: Dict) -> bool:
+        """Writes the results and clears the lease; False if the lease was lost (results are not written)."""
+        assignments = sql.SQL(", ").join(
+            sql.SQL("{} = %s").format(sql.Identifier(column)) for column in fields
+        )
+        query = sql.SQL("""
+            UPDATE epidemic_news SET {}, lease_owner = NULL, lease_expires_at = NULL, last_error = NULL
+            WHERE id = %s AND lease_owner = %s
+            RETURNING id
+        """).format(assignments)
+        return bool(self._execute(query, (*fields.values(), row_id, self.worker_id)))
+
+    def release(self, ids: Iterable, error: str = None):
+        """Gives rows back immediately (on failure or shutdown) instead of waiting for the lease to expire."""
+        ids = list(ids)
+        if ids:
+            self._execute("""
+                UPDATE epidemic_news SET lease_owner = NULL, lease_expires_at = NULL, last_error = %s
+                WHERE id = ANY(%s) AND lease_owner = %s
+            """, (error, ids, self.worker_id))
+
+    @contextmanager
+    def keep_alive(self, ids: Iterable):
+        """Heartbeats the given leases every lease/3 seconds while the block runs."""
+        ids = list(ids)
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(self.lease_seconds / 3):
+                try:
+                    lost = set(ids) - set(self.heartbeat(ids))
+                    if lost:
+                        logger.warning(f"Lost lease on rows {sorted(lost)}; their results will not be written")
+                except Exception as e:
+                    logger.error(f"Heartbeat failed: {str(e)}")
+
+        thread = threading.Thread(target=beat, name="lease-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
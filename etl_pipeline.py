@@ -1,94 +1,251 @@
 # ✅ etl_pipeline.py เวอร์ชันสมบูรณ์ 
-import os
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
-
-from core.scraper import scrape_standard
-from core.hfocus_scraper import scrape_hfocus_articles, load_existing_urls
-from core.filter import is_epidemic_related
-from core.translator import translate
-from core.summarizer import summarize
+import threading
+from core.scraper import aiter_standard
+from core.hfocus_scraper import aiter_hfocus_articles
+from core.fetcher import iterate_in_thread
+from core.frontier import CrawlFrontier
+from core.extract import ExtractPool
+from core.raw_store import RawNewsStore, RAW_COMPACT_DAYS
+from core.stream import bounded_map, batched
+from core.relevance import RelevanceCascade
+from core.dedup import DedupIndex
+from core.plan import build_plan, execute_plan
+from core.hashtag_lexicon import HashtagLexicon
+from core.translator import translate, GLOSSARY, GLOSSARY_KO, warm_up as warm_up_translator
+from core.summarizer import summarize, warm_up as warm_up_summarizer
+from core.inference_service import INFERENCE_SERVICE, InferenceClient
+from core.process_pool import ETL_PROCESSES, ArticlePool
 from core.database import fetch_existing_news, insert_or_update_news, delete_irrelevant_news
 from core.nlp_utils import generate_hashtags
 
-# 📁 เตรียมโฟลเดอร์เก็บข่าวดิบ
-RAW_DIR = "data/raw_news"
-os.makedirs(RAW_DIR, exist_ok=True)
+# 📁 ที่เก็บข่าวดิบ (ต่อท้าย gzip JSONL ไม่เขียนไฟล์เดิมซ้ำ)
+raw_store = RawNewsStore()
 
-# 🗓️ ตั้งชื่อไฟล์ตามวัน
-today = datetime.now().strftime("%Y%m%d")
-existing_path = os.path.join(RAW_DIR, f"hfocus_news_{today}.json")
-existing_urls = load_existing_urls(existing_path)
+# 🧭 URL ที่เคยดึงแล้ว (ข้ามวันได้ ไม่ต้องโหลดไฟล์ JSON ทั้งไฟล์)
+#    จำเฉพาะข่าวที่บันทึกลง DB สำเร็จหรือถูกคัดออก → ข่าวที่ประมวลผลล้มเหลวจะถูกดึงใหม่รอบหน้า
+frontier = CrawlFrontier()
 
 HFOCUS_PAGES = 20
 MAX_WORKERS = 8
-
-# ────────────────────────────────
-print("📅 กำลังดึงข่าวจาก Hfocus และ The Standard…")
-hfocus = scrape_hfocus_articles(pages=HFOCUS_PAGES, existing_urls=existing_urls)
-standard = scrape_standard()
-all_news = hfocus + standard
-print(f"📄 ดึงมา {len(all_news)} ข่าว")
-
-# ────────────────────────────────
-print("🔍 คัดกรองข่าวโรคระบาด…")
-filtered = [a for a in all_news if is_epidemic_related(a)]
-print(f"✅ คัดกรองเหลือ {len(filtered)} ข่าว")
+QUEUE_SIZE = 16   # จำนวนข่าวที่ค้างรอในแต่ละขั้นได้สูงสุด (memory คงที่ไม่ว่าจะดึงกี่ข่าว)
+DB_BATCH = 5      # บันทึกลง DB ทุก ๆ กี่ข่าวที่ประมวลผลเสร็จ
+RAW_BATCH = 20    # ต่อท้าย raw store ทีละกี่ข่าว (1 gzip member + 1 commit ของ index ต่อก้อน)
+CLASSIFIER_BATCH = 8  # จำนวนข่าวต่อการเรียก classifier หนึ่งครั้ง
+
+# 🧮 ETL_PROCESSES=auto|N → แปล/สรุปใน worker process
+#    สร้างก่อนอย่างอื่นทั้งหมด: fork worker ตอนที่ process หลักยังมี thread เดียว
+article_pool = None if INFERENCE_SERVICE else ArticlePool.from_env()
+if article_pool:
+    print(f"🧮 ใช้ {article_pool.workers} worker process × {article_pool.threads} torch threads")
+    # thread ใน process หลักแค่รอผลจาก worker → ให้มีงานค้างพอสำหรับทุก worker
+    MAX_WORKERS = max(MAX_WORKERS, 2 * article_pool.workers)
+    QUEUE_SIZE = max(QUEUE_SIZE, 2 * article_pool.workers)
+
+# 🧩 process pool สำหรับ parse HTML ตัวเดียวใช้ร่วมกันทั้งสองแหล่ง (fork ตอนนี้ ก่อน scraper/warm-up เริ่ม thread)
+#    โหมด process pool: core เป็นของ worker โมเดล และ ArticlePool เริ่ม thread จัดการคิวไปแล้ว
+#    → parse ใน process หลัก (max_workers=0) แทนการ fork เพิ่มจาก process ที่มีหลาย thread
+extract_pool = ExtractPool(max_workers=0 if article_pool else None).start()
+
+stats = {"scraped": 0, "filtered": 0, "duplicates": 0, "reused": 0, "saved": 0,
+         "model_calls": 0, "calls_saved": 0}
+
+# 🎯 keyword filter → classifier (ถ้ามีโมเดลที่ train ไว้)
+relevance = RelevanceCascade()
+rejected_urls = []
+
+# 🧬 ลายนิ้วมือของข่าวที่เคยประมวลผลแล้ว (ใช้หาข่าวซ้ำ/เกือบซ้ำข้ามแหล่ง)
+dedup_index = DedupIndex()
+processed_outputs = {}   # url → เฉพาะ OUTPUT_FIELDS ของข่าวที่ประมวลผลแล้ว (ไม่เก็บ dict ข่าวทั้งก้อน)
+in_flight = {}           # url → Event ของข่าวต้นฉบับที่กำลังประมวลผล (ข่าวซ้ำรอผลแทนการเรียกโมเดลเอง)
+DUPLICATE_WAIT = 600     # วินาทีที่ข่าวซ้ำรอต้นฉบับได้มากสุด
+
+# 🏷️ คำแปลแฮชแท็กจาก glossary (เรียกโมเดลเฉพาะแท็กที่ไม่รู้จัก แล้วจำไว้)
+hashtag_lexicon = HashtagLexicon(GLOSSARY, GLOSSARY_KO)
+
+# 🛰️ ตั้ง INFERENCE_SERVICE ไว้ → ส่งงานไปที่ service ที่โหลดโมเดลไว้แล้ว (รวม request จากทุก thread/process เป็น batch)
+#    ไม่ได้ตั้ง → โหลดโมเดลใน process นี้เหมือนเดิม
+if INFERENCE_SERVICE:
+    inference_client = InferenceClient(INFERENCE_SERVICE)
+    translate_fn, summarize_fn = inference_client.translate, inference_client.summarize
+else:
+    translate_fn, summarize_fn = translate, summarize
+
+OUTPUT_FIELDS = [
+    "content_translated_en", "content_translated_ko", "content_translated_th",
+    "summary_en", "summary_ko", "summary_th",
+    "hashtags_th", "hashtags_en", "hashtags_ko",
+    "is_translated", "is_summarized",
+]
 
 # ────────────────────────────────
 print("📥 ดึงข่าวที่เคยมีใน Database…")
 existing_by_url = {a['url']: a for a in fetch_existing_news()}
 
+# ────────────────────────────────
+def remember(entries):
+    """mark_seen ทีละแหล่ง จาก (url, source)"""
+    by_source = {}
+    for url, source in entries:
+        by_source.setdefault(source, []).append(url)
+    for source, urls in by_source.items():
+        frontier.mark_seen(urls, source)
+
+def scraped_news():
+    """ดึงข่าวจาก Hfocus และ The Standard พร้อมกัน แล้ว yield ทีละข่าวทันทีที่ parse เสร็จ"""
+    raw_buffer = []
+    try:
+        for article in iterate_in_thread(
+            lambda: aiter_hfocus_articles(pages=HFOCUS_PAGES, frontier=frontier, extractor=extract_pool),
+            lambda: aiter_standard(frontier=frontier, extractor=extract_pool),
+            maxsize=QUEUE_SIZE,
+        ):
+            stats["scraped"] += 1
+            # เก็บสำเนาตอนดึงมา (ขั้นถัดไปจะเติมผลแปลลงใน dict เดิม) แล้วเขียนทีละก้อน
+            raw_buffer.append(dict(article))
+            if len(raw_buffer) >= RAW_BATCH:
+                raw_store.append(raw_buffer)
+                raw_buffer = []
+            yield article
+    finally:
+        if raw_buffer:
+            raw_store.append(raw_buffer)
+
+def epidemic_news(articles):
+    """
+    คัดกรองข่าวโรคระบาด: ข่าวเนื้อหาว่างไม่ผ่าน → keyword → classifier ทีละ batch เล็ก ๆ
+    ข่าวที่ถูกคัดออกจะถูกจำใน frontier ตอนคัดกรองครบ (ตั้งใจไม่เก็บ ไม่ต้องดึงซ้ำ)
+    """
+    screening = {}   # url → source ของข่าวที่ยังไม่ผ่านการคัดกรอง
+
+    def candidates():
+        for article in articles:
+            if (article.get("content_raw") or "").strip():
+                screening[article["url"]] = article.get("source")
+                yield article
+
+    for article in relevance.filter_stream(candidates(), batch_size=CLASSIFIER_BATCH, rejected=rejected_urls):
+        screening.pop(article["url"], None)
+        stats["filtered"] += 1
+        yield article
+    remember(screening.items())
+
+def unique_news(articles):
+    """ติด duplicate_of ให้ข่าวที่ซ้ำ/เกือบซ้ำกับข่าวที่ประมวลผลไปแล้ว"""
+    for article in articles:
+        dup = dedup_index.check_and_add(article)
+        if dup:
+            article["duplicate_of"], article["duplicate_score"] = dup
+            stats["duplicates"] += 1
+            print(f"♻️ ข่าวซ้ำ ({dup[1]:.2f}): {article['url']} ≈ {dup[0]}")
+        else:
+            # ลงทะเบียนก่อน yield → ข่าวซ้ำที่ตามมาทีหลังเจอ Event นี้แน่นอน (ต้นฉบับถูก submit ก่อนเสมอ)
+            in_flight[article["url"]] = threading.Event()
+        yield article
+
+def reuse_outputs(article) -> bool:
+    """ใช้ผลแปล/สรุป/แฮชแท็กของข่าวต้นฉบับแทนการเรียกโมเดลใหม่ (ต้นฉบับยังประมวลผลอยู่ → รอให้เสร็จก่อน)"""
+    pending = in_flight.get(article["duplicate_of"])
+    if pending is not None:
+        pending.wait(DUPLICATE_WAIT)
+    original = processed_outputs.get(article["duplicate_of"]) or existing_by_url.get(article["duplicate_of"])
+    if not original or not original.get("is_translated"):
+        return False
+    article.update({field: original.get(field) for field in OUTPUT_FIELDS})
+    stats["reused"] += 1
+    return True
+
 # ────────────────────────────────
 def process_article(article):
     url = article['url']
     lang = article.get("language", "th")
     raw = article.get("content_raw") or article.get("content", "")
 
-    try:
-        en = translate(raw, src=lang, tgt="en")
-        ko = translate(raw, src=lang, tgt="ko")
-        th = translate(raw, src=lang, tgt="th")
-
-        sum_en = summarize(en, lang="en")
-        sum_ko = translate(sum_en, src="en", tgt="ko")
-        sum_th = translate(sum_en, src="en", tgt="th")
+    # ข่าวซ้ำที่ต้นฉบับประมวลผลเสร็จแล้ว (หรือกำลังประมวลผล) → ไม่ต้องเรียกโมเดล
+    if article.get("duplicate_of") and reuse_outputs(article):
+        return article
 
-        hashtags_th = generate_hashtags(raw)
-        hashtags_en = [translate(tag, src="th", tgt="en") for tag in hashtags_th]
-        hashtags_ko = [translate(tag, src="th", tgt="ko") for tag in hashtags_th]
+    try:
+        # วางแผนก่อน: ข้ามการแปลเป็นภาษาเดิม, แปลต่อจาก pivot อังกฤษ, สรุปครั้งเดียว
+        if article_pool:
+            outputs, calls = article_pool.run_plan(lang, raw, generate_hashtags(raw), lexicon=hashtag_lexicon)
+        else:
+            outputs, calls = execute_plan(build_plan(lang),
+                                          {"content": raw, "hashtags": generate_hashtags(raw)},
+                                          translate_fn, summarize_fn, lexicon=hashtag_lexicon)
+        stats["model_calls"] += calls["calls"]
+        stats["calls_saved"] += calls["saved"]
 
         article.update({
-            "content_translated_en": en,
-            "content_translated_ko": ko,
-            "content_translated_th": th,
-            "summary_en": sum_en,
-            "summary_ko": sum_ko,
-            "summary_th": sum_th,
-            "hashtags_th": ", ".join(hashtags_th),
-            "hashtags_en": ", ".join(hashtags_en),
-            "hashtags_ko": ", ".join(hashtags_ko),
+            "content_translated_en": outputs["content_en"],
+            "content_translated_ko": outputs["content_ko"],
+            "content_translated_th": outputs["content_th"],
+            "summary_en": outputs["summary_en"],
+            "summary_ko": outputs["summary_ko"],
+            "summary_th": outputs["summary_th"],
+            "hashtags_th": ", ".join(outputs["hashtags_th"]),
+            "hashtags_en": ", ".join(outputs["hashtags_en"]),
+            "hashtags_ko": ", ".join(outputs["hashtags_ko"]),
             "is_translated": True,
             "is_summarized": True
         })
+        processed_outputs[url] = {field: article[field] for field in OUTPUT_FIELDS}
         return article
 
     except Exception as e:
         print(f"[❌] Error: {url} | {e}")
         return None
+    finally:
+        # ปลุกข่าวซ้ำที่รออยู่ (ถ้าต้นฉบับล้มเหลว ข่าวซ้ำจะประมวลผลเองตามปกติ)
+        done = in_flight.pop(url, None)
+        if done is not None:
+            done.set()
 
 # ────────────────────────────────
-print(f"🧠 ประมวลผล {len(filtered)} ข่าวด้วย {MAX_WORKERS} threads…")
-with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-    processed = list(executor.map(process_article, filtered))
+def warm_up_models():
+    """โหลดโมเดลแปล/สรุปใน background ระหว่างที่ scraper ดึงข่าว (ถ้าล้มเหลวจะโหลดตอนใช้งานครั้งแรกแทน)"""
+    try:
+        print(f"🔥 โหลดโมเดลพร้อมใช้ใน {warm_up_translator() + warm_up_summarizer():.1f} วินาที")
+    except Exception as e:
+        print(f"[⚠️] warm-up ไม่สำเร็จ: {e}")
 
-results = [r for r in processed if r is not None]
+if not INFERENCE_SERVICE and not article_pool:
+    threading.Thread(target=warm_up_models, daemon=True).start()
 
 # ────────────────────────────────
-print("💾 บันทึกข่าวลงฐานข้อมูล…")
-insert_or_update_news(results)
+print("📅 ดึงข่าว → คัดกรอง → ประมวลผล → บันทึก แบบ streaming…")
+print(f"🧠 ประมวลผลด้วย {MAX_WORKERS} threads (คิวละไม่เกิน {QUEUE_SIZE} ข่าว)")
+processed = bounded_map(process_article, unique_news(epidemic_news(scraped_news())),
+                        max_workers=MAX_WORKERS, max_pending=QUEUE_SIZE)
+
+for batch in batched(processed, DB_BATCH):
+    results = [r for r in batch if r is not None]
+    if results:
+        print("💾 บันทึกข่าวลงฐานข้อมูล…")
+        insert_or_update_news(results)
+        remember((r["url"], r.get("source")) for r in results)
+        stats["saved"] += len(results)
+
+print(f"📄 ดึงมา {stats['scraped']} ข่าว")
+print(f"✅ คัดกรองเหลือ {stats['filtered']} ข่าว")
+print(f"♻️ ข่าวซ้ำ {stats['duplicates']} ข่าว (ใช้ผลเดิม {stats['reused']} ข่าว)")
+print(f"🧠 เรียกโมเดล {stats['model_calls']} ครั้ง (ประหยัดไป {stats['calls_saved']} ครั้งจากการวางแผน)")
+print(f"🏷️ แปลแฮชแท็กด้วยโมเดล {hashtag_lexicon.model_calls} ครั้ง (ที่เหลือมาจากพจนานุกรม)")
+print(f"💾 บันทึกแล้ว {stats['saved']} ข่าว")
+if INFERENCE_SERVICE:
+    service_stats = inference_client.stats()
+    for op in ("translate", "summarize"):
+        print(f"🛰️ {op}: {service_stats[op]['requests']} requests, batch เฉลี่ย {service_stats[op]['mean_batch']:.1f}, "
+              f"คิวค้าง {service_stats[op]['queue_depth']}")
+hashtag_lexicon.save()
+extract_pool.close()
+# 🗜️ รวม segment เก่าของ raw store ทุกรอบ ไม่ให้จำนวนไฟล์/ขนาดโตไม่สิ้นสุด (RAW_COMPACT_DAYS=0 → ข้าม)
+if RAW_COMPACT_DAYS > 0:
+    raw_store.compact(older_than_days=RAW_COMPACT_DAYS)
+raw_store.close()
+if article_pool:
+    article_pool.shutdown()
 
 # ────────────────────────────────
 print("🧹 ลบข่าวที่ไม่เกี่ยวกับโรคระบาดออกจาก DB…")
-delete_irrelevant_news()
+delete_irrelevant_news(relevance.irrelevant_urls(existing_by_url.values()) + rejected_urls)
 print("✅ เสร็จสิ้นการอัปเดตข่าวทั้งหมด")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# โมดูลอยู่ใน core/ (import แบบ from core.x) → ให้ pytest หา package ได้ไม่ว่าจะรันจาก directory ไหน
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from core.automaton import AhoCorasick
+from core.filter import EPIDEMIC_KEYWORDS, filter_epidemic_batch, is_epidemic_related, match_keywords
+
+def naive_matches(patterns, text):
+    return sorted((i, p) for p in set(patterns) if p for i in range(len(text) - len(p) + 1)
+                  if text.startswith(p, i))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_finditer_matches_naive_search(seed):
+    rng = random.Random(seed)
+    patterns = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 12))]
+    text = "".join(rng.choice("abcd") for _ in range(200))
+    matcher = AhoCorasick(patterns)
+    assert sorted(matcher.finditer(text)) == naive_matches(patterns, text)
+    assert matcher.search(text) == bool(naive_matches(patterns, text))
+
+def test_overlapping_and_nested_patterns():
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+    assert sorted(matcher.finditer("ushers")) == [(1, "she"), (2, "he"), (2, "hers")]
+
+def test_thai_keywords_match_naive_search():
+    text = "ผู้ป่วยไข้เลือดออกเพิ่มขึ้น โรงพยาบาลเร่งฉีดวัคซีนป้องกันการแพร่ระบาด"
+    assert sorted(AhoCorasick(EPIDEMIC_KEYWORDS).finditer(text)) == naive_matches(EPIDEMIC_KEYWORDS, text)
+
+def test_longest_matches_do_not_overlap():
+    matcher = AhoCorasick(["ระบาด", "แพร่ระบาด", "แพร่"])
+    assert matcher.longest_matches("การแพร่ระบาดของโรค") == [(3, 12, "แพร่ระบาด")]
+
+def test_empty_patterns_and_text():
+    assert list(AhoCorasick(["", "a"]).finditer("")) == []
+    assert not AhoCorasick([]).search("anything")
+
+def test_filter_uses_the_matcher():
+    assert is_epidemic_related({"title": "ข่าวทั่วไป", "content_raw": "พบผู้ติดเชื้อ  โควิด เพิ่ม"})
+    assert not is_epidemic_related({"title": "ราคาทองวันนี้", "content_raw": "ปรับขึ้น 100 บาท"})
+    result = match_keywords({"title": "โควิด", "content_raw": "โควิด ระบาด"})
+    assert result["counts"] == {"โควิด": 2, "ระบาด": 1}
+
+def test_filter_batch_handles_missing_dataframe_cells():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame([{"title": "โควิด", "content_raw": "ระบาด"}, {"title": "ข่าว"}, {"content_raw": "วัคซีน"}])
+    kept = filter_epidemic_batch(df)
+    assert list(kept.index) == [0, 2]
+    assert kept.loc[2, "keyword_counts"] == {"วัคซีน": 1}
+    assert not is_epidemic_related({"title": float("nan"), "content_raw": None})
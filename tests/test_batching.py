@@ -0,0 +1,28 @@
+from core.translator import length_batches
+
+def sorted_order(lengths):
+    return sorted(range(len(lengths)), key=lambda i: -lengths[i])
+
+def test_batches_keep_order_and_cover_every_index():
+    lengths = [5, 40, 12, 7, 33, 2, 18]
+    order = sorted_order(lengths)
+    batches = length_batches(order, lengths, token_budget=64, max_batch_size=8)
+    assert [i for batch in batches for i in batch] == order
+
+def test_padded_size_stays_within_budget():
+    lengths = [30, 25, 20, 16, 10, 8, 8, 4, 3, 1]
+    order = sorted_order(lengths)
+    for batch in length_batches(order, lengths, token_budget=48, max_batch_size=16):
+        assert len(batch) * max(lengths[i] for i in batch) <= 48
+
+def test_max_batch_size():
+    lengths = [1] * 10
+    batches = length_batches(list(range(10)), lengths, token_budget=1000, max_batch_size=4)
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+def test_over_budget_item_gets_its_own_batch():
+    lengths = [100, 10, 10]
+    assert length_batches([0, 1, 2], lengths, token_budget=32, max_batch_size=8) == [[0], [1, 2]]
+
+def test_empty():
+    assert length_batches([], [], token_budget=32, max_batch_size=8) == []
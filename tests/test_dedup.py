@@ -0,0 +1,58 @@
+import pytest
+
+from core.dedup import DedupIndex, exact_hash
+
+SENTENCES = [
+    "กรมควบคุมโรครายงานผู้ป่วยไข้เลือดออกรายใหม่ในจังหวัดเชียงใหม่",
+    "เจ้าหน้าที่สาธารณสุขลงพื้นที่พ่นหมอกควันกำจัดยุงลายในชุมชน",
+    "โรงพยาบาลประจำจังหวัดเตรียมเตียงรองรับผู้ป่วยเพิ่มเติม",
+    "แพทย์แนะนำให้ประชาชนสังเกตอาการไข้สูงและปวดศีรษะ",
+    "หน่วยงานท้องถิ่นรณรงค์ให้ทำลายแหล่งเพาะพันธุ์ยุงทุกสัปดาห์",
+    "ผู้ว่าราชการจังหวัดสั่งการให้ทุกอำเภอรายงานสถานการณ์ทุกวัน",
+    "โรงเรียนในพื้นที่เสี่ยงได้รับแจกทรายกำจัดลูกน้ำยุงลาย",
+    "นักวิชาการคาดว่าจำนวนผู้ป่วยจะเพิ่มขึ้นในช่วงฤดูฝน",
+    "ประชาชนที่มีไข้ติดต่อกันเกินสองวันควรรีบไปพบแพทย์",
+    "สำนักงานสาธารณสุขจังหวัดเปิดสายด่วนให้คำปรึกษาตลอดยี่สิบสี่ชั่วโมง",
+]
+
+@pytest.fixture
+def index():
+    i = DedupIndex(":memory:")
+    yield i
+    i.close()
+
+def news(url, content):
+    return {"url": url, "content_raw": content}
+
+def test_exact_hash_ignores_whitespace_and_case():
+    assert exact_hash("  COVID   ระบาด\n") == exact_hash("covid ระบาด")
+
+def test_exact_duplicate(index):
+    original = " ".join(SENTENCES)
+    assert index.check_and_add(news("https://a/1", original)) is None
+    assert index.check_and_add(news("https://b/1", original.replace(" ", "\n"))) == ("https://a/1", 1.0)
+
+def test_near_duplicate(index):
+    index.check_and_add(news("https://a/1", " ".join(SENTENCES)))
+    # สำนักข่าวอื่นเรียบเรียงใหม่เล็กน้อย: แก้ประโยคสุดท้าย
+    reworded = " ".join(SENTENCES[:-1] + ["สำนักงานสาธารณสุขจังหวัดเปิดสายด่วนตลอดวัน"])
+    dup = index.check_and_add(news("https://b/1", reworded))
+    assert dup is not None
+    url, score = dup
+    assert url == "https://a/1" and index.threshold <= score < 1.0
+
+def test_different_article_is_not_a_duplicate(index):
+    index.check_and_add(news("https://a/1", " ".join(SENTENCES)))
+    other = "สภาพอากาศวันนี้มีฝนตกหนักในภาคใต้ กรมอุตุนิยมวิทยาเตือนคลื่นลมแรงบริเวณอ่าวไทย " \
+            "ชาวประมงควรงดออกจากฝั่งจนถึงวันศุกร์ นักท่องเที่ยวควรติดตามประกาศอย่างใกล้ชิด"
+    assert index.check_and_add(news("https://b/1", other)) is None
+
+def test_duplicates_are_not_indexed_and_same_url_is_not_its_own_duplicate(index):
+    original = news("https://a/1", " ".join(SENTENCES))
+    index.check_and_add(original)
+    index.check_and_add(news("https://b/1", " ".join(SENTENCES)))
+    assert index.find_duplicate(original) is None  # b ซ้ำจึงไม่ถูกเพิ่ม, a ไม่นับตัวเอง
+
+def test_empty_content_is_skipped(index):
+    assert index.check_and_add(news("https://a/1", "")) is None
+    assert index.check_and_add(news("https://b/1", "")) is None
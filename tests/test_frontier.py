@@ -0,0 +1,52 @@
+import pytest
+
+from core.frontier import CrawlFrontier, advance_watermark, listing_exhausted, normalize_url
+
+@pytest.fixture
+def frontier():
+    f = CrawlFrontier(":memory:")
+    yield f
+    f.close()
+
+def items(*urls):
+    return [{"url": url, "date": "2026-01-0%d" % (i + 1)} for i, url in enumerate(urls)]
+
+def test_normalize_url_drops_tracking_and_fragment():
+    assert normalize_url("HTTPS://Hfocus.org/content/2026/01/1/?utm_source=fb#top") == \
+        "https://hfocus.org/content/2026/01/1"
+
+def test_known_returns_urls_as_given(frontier):
+    frontier.mark_seen(["https://hfocus.org/a"], "hfocus")
+    assert frontier.known(["https://hfocus.org/a/?utm_medium=x", "https://hfocus.org/b"]) == \
+        {"https://hfocus.org/a/?utm_medium=x"}
+
+def test_listing_exhausted_only_when_every_item_is_known(frontier):
+    page = items("https://hfocus.org/a", "https://hfocus.org/b")
+    assert not listing_exhausted(frontier, page, "hfocus")
+
+    frontier.mark_seen(["https://hfocus.org/a"], "hfocus")
+    assert not listing_exhausted(frontier, page, "hfocus")
+
+    frontier.mark_seen(["https://hfocus.org/b"], "hfocus")
+    assert listing_exhausted(frontier, page, "hfocus")
+
+def test_listing_exhausted_ignores_watermark(frontier):
+    # ข่าวที่ดึงไม่สำเร็จรอบก่อนยังไม่ถูก mark_seen → ต้องไล่ต่อแม้จะเจอ watermark
+    frontier.update_watermark("hfocus", "https://hfocus.org/a")
+    frontier.mark_seen(["https://hfocus.org/a"], "hfocus")
+    assert not listing_exhausted(frontier, items("https://hfocus.org/a", "https://hfocus.org/b"), "hfocus")
+
+def test_listing_exhausted_without_frontier_or_items(frontier):
+    assert not listing_exhausted(None, items("https://hfocus.org/a"), "hfocus")
+    assert not listing_exhausted(frontier, [], "hfocus")
+
+def test_advance_watermark_waits_for_a_fully_seen_page(frontier):
+    page = items("https://hfocus.org/new", "https://hfocus.org/old")
+    frontier.mark_seen(["https://hfocus.org/old"], "hfocus")
+    assert not advance_watermark(frontier, page, "hfocus")
+    assert frontier.high_watermark("hfocus") is None
+
+    frontier.mark_seen(["https://hfocus.org/new"], "hfocus")
+    assert advance_watermark(frontier, page, "hfocus")
+    mark = frontier.high_watermark("hfocus")
+    assert (mark["url"], mark["date"]) == ("https://hfocus.org/new", "2026-01-01")
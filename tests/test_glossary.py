@@ -0,0 +1,52 @@
+import pytest
+
+from core.glossary import GlossaryEngine, _regex_protect, at_word_boundary
+from core.translator import GLOSSARY, GLOSSARY_KO
+
+SAMPLES = [
+    "ผู้ป่วยโควิด-19 ในกรุงเทพมหานคร เพิ่มขึ้น",
+    "นพ.สมจิตร กล่าวว่า ไข้เลือดออก ระบาดใน เชียงใหม่",
+    "กรมควบคุมโรค เตือน โควิด และ โควิด-19 ยังระบาด",
+    "ไม่มีคำในพจนานุกรม",
+    "",
+]
+
+@pytest.fixture(scope="module")
+def engine():
+    return GlossaryEngine(GLOSSARY, GLOSSARY_KO)
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_round_trip_restores_the_original(engine, text):
+    protected, term_map = engine.protect(text)
+    assert engine.restore(protected, term_map, "th") == text
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_matches_the_old_regex_loop(engine, text):
+    new, new_map = engine.protect(text)
+    old, old_map = _regex_protect(GLOSSARY, text)
+    for lang in ("en", "ko"):
+        assert engine.restore(new, new_map, lang) == engine.restore(old, old_map, lang)
+
+def test_longest_term_wins_and_repeats_share_a_placeholder(engine):
+    protected, term_map = engine.protect("โควิด-19 และ โควิด-19 ต่างจาก โควิด")
+    assert protected == "[[GLOSSARY_001_COVID-19]] และ [[GLOSSARY_001_COVID-19]] ต่างจาก [[GLOSSARY_002_COVID]]"
+    assert term_map == {"[[GLOSSARY_001_COVID-19]]": ("โควิด-19", "COVID-19"),
+                        "[[GLOSSARY_002_COVID]]": ("โควิด", "COVID")}
+    assert engine.restore(protected, term_map, "ko") == "코로나19 และ 코로나19 ต่างจาก COVID"
+
+def test_terms_inside_a_longer_word_are_not_protected(engine):
+    assert engine.protect("โควิดระบาด")[1] == {}
+    assert not at_word_boundary("โควิดระบาด", 0, 5)
+    assert at_word_boundary("โควิด ระบาด", 0, 5)
+
+def test_boundaries_are_checked_on_the_original_text(engine):
+    # The regex loop checked "ดร." after "สมจิตร" was already replaced and skipped it
+    protected, term_map = engine.protect("ดร.สมจิตร")
+    assert engine.restore(protected, term_map, "en") == "Dr.Somjit"
+    old, old_map = _regex_protect(GLOSSARY, "ดร.สมจิตร")
+    assert engine.restore(old, old_map, "en") == "ดร.Somjit"
+
+def test_unknown_placeholders_and_languages_are_left_alone(engine):
+    protected, term_map = engine.protect("โควิด")
+    assert engine.restore("[[GLOSSARY_009_Other]] " + protected, term_map, "en") == "[[GLOSSARY_009_Other]] COVID"
+    assert engine.restore(protected, term_map, "ja") == protected
@@ -0,0 +1,35 @@
+import pytest
+
+from core.hashtag_lexicon import HashtagLexicon
+from core.translator import GLOSSARY, GLOSSARY_KO
+
+@pytest.fixture
+def lexicon():
+    return HashtagLexicon(GLOSSARY, GLOSSARY_KO, path=None)
+
+def no_model(text, src="th", tgt="en"):
+    raise AssertionError(f"unexpected model call for {text!r}")
+
+def test_same_english_tag_gets_the_same_korean_tag(lexicon):
+    by_english = {}
+    for word, langs in lexicon.entries.items():
+        by_english.setdefault(langs["en"], set()).add(langs["ko"])
+    assert {en: kos for en, kos in by_english.items() if len(kos) > 1} == {}
+
+def test_covid_tags_are_consistent_in_korean(lexicon):
+    tags, calls = lexicon.translate_tags(["#โควิด", "#COVID"], "th", "ko", no_model)
+    assert tags == ["#코로나", "#코로나"] and calls == 0
+
+def test_known_tags_come_from_the_lexicon(lexicon):
+    assert lexicon.translate_tags(["#ไทย", "#เชียงใหม่"], "th", "en", no_model)[1] == 0
+
+def test_unknown_tags_call_the_model_once_and_are_learned(lexicon):
+    calls = []
+
+    def translate(text, src="th", tgt="en"):
+        calls.append(text)
+        return "#Measles "
+
+    assert lexicon.translate_tags(["#หัด"], "th", "en", translate) == (["#Measles"], 1)
+    assert lexicon.translate_tags(["#หัด"], "th", "en", translate) == (["#Measles"], 0)
+    assert calls == ["หัด"] and lexicon.learned == {"หัด": {"th": "หัด", "en": "Measles"}}
@@ -0,0 +1,82 @@
+import re
+
+import pytest
+
+from core.glossary import HashtagIndex
+from core.translator import GLOSSARY, GLOSSARY_KO, HASHTAG_CATEGORIES, HASHTAG_CITIES, HASHTAG_COUNTRIES, \
+    HASHTAG_INDEX
+
+def regex_extract(text, lang):
+    """The previous extract_hashtags: one regex per glossary term and category, stop at 5 tags."""
+    hashtags = set()
+
+    def add(term_th):
+        term_en = GLOSSARY[term_th]
+        tag = {"th": term_th, "en": term_en, "ko": GLOSSARY_KO.get(term_en, term_en)}[lang]
+        hashtags.add(f"#{tag.replace(' ', '')}")
+        return len(hashtags) >= 5
+
+    for term_th, term_en in GLOSSARY.items():
+        if 'ประเทศ' in term_th or term_en in HASHTAG_COUNTRIES:
+            if re.search(r'\b(?:' + re.escape(term_th) + r'|' + re.escape(term_en) + r')\b', text, re.IGNORECASE):
+                if add(term_th): break
+    if lang == "en":
+        for term_th, term_en in GLOSSARY.items():
+            if term_en in HASHTAG_CITIES and re.search(r'\b' + re.escape(term_en) + r'\b', text, re.IGNORECASE):
+                if add(term_th): break
+    elif lang == "ko":
+        for term_th, term_en in GLOSSARY.items():
+            term_ko = GLOSSARY_KO.get(term_en)
+            if term_ko and re.search(r'\b' + re.escape(term_ko) + r'\b', text, re.IGNORECASE):
+                if add(term_th): break
+            elif term_en in ['Seoul', 'Busan'] and re.search(r'\b' + re.escape(term_en) + r'\b', text, re.IGNORECASE):
+                if add(term_th): break
+    for term_th, term_en in GLOSSARY.items():
+        if term_th in HASHTAG_CATEGORIES["disease"]:
+            if re.search(r'\b(?:' + re.escape(term_th) + r'|' + re.escape(term_en) + r')\b', text, re.IGNORECASE):
+                if add(term_th): break
+    return hashtags
+
+SAMPLES = [
+    ("Influenza cases rise in Bangkok, Thailand and Seoul", "en"),
+    ("dengue outbreak in thailand; influenza reported in Japan", "en"),
+    ("ผู้ป่วย ไข้หวัดใหญ่ ใน ประเทศไทย และ เกาหลีใต้ เพิ่มขึ้น", "th"),
+    ("ผู้ป่วยโควิด-19ในประเทศไทยเพิ่มขึ้น", "th"),
+    ("โควิด-19ระบาดหนักที่กรุงเทพ", "th"),
+    ("서울 에서 인플루엔자 유행", "ko"),
+    ("no entities here", "en"),
+]
+
+@pytest.mark.parametrize("text, lang", SAMPLES)
+def test_same_tags_as_the_regex_loop(text, lang):
+    assert set(HASHTAG_INDEX.extract(text, lang)) == regex_extract(text, lang)
+
+def test_thai_without_spaces_follows_the_word_boundary_rule():
+    # \b never falls between two Thai letters, so glued terms are skipped in both versions
+    assert HASHTAG_INDEX.extract("ผู้ป่วยโควิด-19ในประเทศไทยเพิ่มขึ้น", "th") == []
+    assert HASHTAG_INDEX.extract("โควิด-19ระบาด", "th") == ["#โควิด"]
+
+def test_nested_terms_count_once():
+    # the regex loop tagged both #โควิด and #โควิด-19 for "โควิด-19"
+    assert regex_extract("ผู้ป่วย โควิด-19 ใน ประเทศไทย", "th") == {"#ประเทศไทย", "#โควิด", "#โควิด-19"}
+    assert HASHTAG_INDEX.extract("ผู้ป่วย โควิด-19 ใน ประเทศไทย", "th") == ["#ประเทศไทย", "#โควิด-19"]
+    assert HASHTAG_INDEX.extract("COVID-19 in Thailand", "en") == ["#Thailand", "#COVID-19"]
+
+def test_korean_text_is_tagged_from_category_terms_only():
+    # the regex loop scanned Korean text for every GLOSSARY_KO word, so 환자 (Patient) became a tag
+    text = "태국 방콕 에서 뎅기열 환자 증가"
+    assert regex_extract(text, "ko") == {"#방콕", "#뎅기열", "#환자", "#태국"}
+    assert HASHTAG_INDEX.extract(text, "ko") == ["#태국", "#방콕", "#뎅기열"]
+
+def test_ranked_by_mentions_then_category_then_position():
+    text = "Dengue in Seoul. Dengue in Thailand. Dengue again, and Seoul again."
+    assert HASHTAG_INDEX.extract(text, "en") == ["#Dengue", "#Seoul", "#Thailand"]
+    assert HASHTAG_INDEX.extract(text, "ko") == ["#뎅기열", "#서울", "#태국"]
+    assert HASHTAG_INDEX.extract(text, "en", limit=1) == ["#Dengue"]
+
+def test_any_surface_form_maps_to_the_requested_language():
+    index = HashtagIndex({"ประเทศไทย": "Thailand"}, {"Thailand": "태국"}, {"country": ["ประเทศไทย"]})
+    for text in ("ประเทศไทย", "THAILAND", "태국"):
+        assert index.extract(text, "th") == ["#ประเทศไทย"]
+        assert index.extract(text, "ko") == ["#태국"]
+    assert index.extract("", "en") == []
@@ -0,0 +1,61 @@
+import pytest
+
+from core.plan import build_plan, execute_plan, naive_calls
+
+class FakeModels:
+    """นับจำนวนครั้งที่เรียกโมเดล (ยุบ whitespace/ขึ้นบรรทัดใหม่เหมือน tokenizer ของ T5)"""
+    def __init__(self):
+        self.translations = []
+        self.summaries = []
+
+    def translate(self, text, src="th", tgt="en"):
+        self.translations.append((src, tgt))
+        return " ".join(f"{tgt}:{text}".split())
+
+    def summarize(self, text, lang="en"):
+        self.summaries.append(lang)
+        return f"summary:{text[:10]}"
+
+def run(plan, inputs):
+    models = FakeModels()
+    outputs, stats = execute_plan(plan, inputs, models.translate, models.summarize)
+    return models, outputs, stats
+
+def test_thai_article_translates_once_per_language_via_english_pivot():
+    plan = build_plan("th")
+    assert plan["content_th"] == ("copy", "content", None, None)
+    assert plan["content_ko"] == ("translate", "content_en", "en", "ko")
+    assert plan["summary_ko"] == ("translate", "summary_en", "en", "ko")
+
+    models, outputs, stats = run(plan, {"content": "ข่าว", "hashtags": ["#โควิด", "#วัคซีน"]})
+    # content en/ko + summary ko/th + แฮชแท็ก 2 แท็ก × en/ko (ทีละแท็ก) = 8, สรุป 1
+    assert sorted(models.translations) == [("en", "ko"), ("en", "ko"), ("en", "th"), ("th", "en"),
+                                           ("th", "en"), ("th", "en"), ("th", "ko"), ("th", "ko")]
+    assert models.summaries == ["en"]
+    assert stats == {"calls": 9, "skipped": 2, "naive": naive_calls(n_hashtags=2), "saved": 1}
+    assert outputs["content_th"] == "ข่าว"
+    assert outputs["hashtags_th"] == ["#โควิด", "#วัคซีน"]
+    assert outputs["hashtags_en"] == ["#en:โควิด", "#en:วัคซีน"]
+
+def test_english_article_copies_the_pivot():
+    models, outputs, stats = run(build_plan("en"), {"content": "news", "hashtags": []})
+    assert outputs["content_en"] == "news"
+    assert sorted(models.translations) == [("en", "ko"), ("en", "ko"), ("en", "th"), ("en", "th")]
+    assert stats["calls"] == 5 and stats["naive"] == naive_calls()
+
+def test_empty_content_makes_no_model_calls():
+    models, outputs, stats = run(build_plan("th"), {"content": "", "hashtags": []})
+    assert models.translations == [] and models.summaries == []
+    assert stats["calls"] == 0
+    assert outputs["summary_ko"] == ""
+
+def test_hashtags_never_cost_more_calls_than_the_baseline():
+    tags = ["#ไข้หวัดใหญ่", "#เชียงใหม่", "#วัคซีน"]
+    models, outputs, stats = run(build_plan("th", targets=("en",)), {"content": "ข่าว", "hashtags": tags})
+    assert stats["calls"] == 1 + 1 + len(tags)
+    assert stats["calls"] <= stats["naive"]
+    assert outputs["hashtags_en"] == ["#en:ไข้หวัดใหญ่", "#en:เชียงใหม่", "#en:วัคซีน"]
+
+@pytest.mark.parametrize("n_hashtags, expected", [(0, 6), (3, 12)])
+def test_naive_calls(n_hashtags, expected):
+    assert naive_calls(n_hashtags=n_hashtags) == expected
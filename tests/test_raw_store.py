@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from core.raw_store import RawNewsStore
+
+@pytest.fixture
+def store(tmp_path):
+    s = RawNewsStore(str(tmp_path / "raw"))
+    yield s
+    s.close()
+
+def article(n, **extra):
+    return {"url": f"https://hfocus.org/{n}", "source": "hfocus", "title": f"ข่าว {n}", **extra}
+
+def segments(store):
+    return sorted(os.listdir(store.segment_dir))
+
+def test_append_and_get(store):
+    assert store.append([article(1), article(2), {"title": "ไม่มี url"}]) == 2
+    assert len(store) == 2
+    assert "https://hfocus.org/2" in store
+    assert store.get("https://hfocus.org/2")["title"] == "ข่าว 2"
+    assert store.get("https://hfocus.org/404") is None
+
+def test_one_gzip_member_per_append(store):
+    store.append([article(1), article(2)])
+    store.append([article(3)])
+    path = os.path.join(store.segment_dir, segments(store)[0])
+    with open(path, "rb") as f:
+        assert f.read().count(b"\x1f\x8b\x08") == 2
+    assert [a["url"] for a in store.iter_articles()] == [f"https://hfocus.org/{n}" for n in (1, 2, 3)]
+
+def test_append_replaces_same_url(store):
+    store.append([article(1, content_raw="เดิม")])
+    store.append([article(1, content_raw="ใหม่")])
+    assert len(store) == 1
+    assert store.get("https://hfocus.org/1")["content_raw"] == "ใหม่"
+    assert [a["content_raw"] for a in store.iter_articles()] == ["ใหม่"]
+
+def test_segment_rolls_over_at_max_bytes(tmp_path):
+    store = RawNewsStore(str(tmp_path / "raw"), segment_max_bytes=1)
+    store.append([article(1)])
+    store.append([article(2)])
+    assert len(segments(store)) == 2
+    assert store.get("https://hfocus.org/1")["title"] == "ข่าว 1"
+    store.close()
+
+def test_compact_merges_segments_and_drops_replaced(tmp_path):
+    store = RawNewsStore(str(tmp_path / "raw"), segment_max_bytes=1)
+    store.append([article(1, content_raw="เดิม"), article(2)])
+    store.append([article(1, content_raw="ใหม่")])
+    store.append([article(3)])
+    assert len(segments(store)) == 3
+
+    assert store.compact(older_than_days=30) == 0  # ยังไม่มี segment เก่าพอ
+    assert store.compact(older_than_days=-1) == 3  # cutoff = พรุ่งนี้ → ทุก segment ของวันนี้
+    [name] = segments(store)
+    assert name.startswith("compact-")
+    assert store.get("https://hfocus.org/1")["content_raw"] == "ใหม่"
+    assert sorted(a["url"] for a in store.iter_articles()) == [f"https://hfocus.org/{n}" for n in (1, 2, 3)]
+    store.close()
+
+def test_compact_cli(tmp_path):
+    root = str(tmp_path / "raw")
+    store = RawNewsStore(root, segment_max_bytes=1)
+    store.append([article(1)])
+    store.append([article(2)])
+    store.close()
+
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-m", "core.raw_store", "compact", "--root", root, "--older-than-days", "-1"],
+        cwd=repo, capture_output=True, text=True, check=True,
+    ).stdout
+    assert "2 ข่าว" in out
+
+    store = RawNewsStore(root)
+    [name] = segments(store)
+    assert name.startswith("compact-")
+    assert len(store) == 2
+    store.close()
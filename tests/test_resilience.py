@@ -0,0 +1,139 @@
+import asyncio
+import threading
+
+import pytest
+import requests
+
+from core import resilience
+from core.extract import ExtractPool
+from core.fetcher import AsyncFetcher
+from core.resilience import CircuitBreaker, CircuitOpenError, CrawlMetrics
+from core.scraper import BASE_URL, scrape_standard
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    return now
+
+def response(url, status=200, body=""):
+    res = requests.Response()
+    res.url, res.status_code, res.encoding, res.from_cache = url, status, "utf-8", False
+    res._content = body.encode("utf-8")
+    return res
+
+class FakeFetcher(AsyncFetcher):
+    """ตอบจาก dict แทนเว็บจริง (handler(url) คืน Response หรือ raise)"""
+    def __init__(self, handler, **kwargs):
+        super().__init__(retry_policy={"retries": 0, "failure_threshold": 2, "reset_after": 60.0}, **kwargs)
+        self.handler = handler
+
+    def _get(self, url, use_cache=False):
+        return self.handler(url)
+
+# ─────────── circuit breaker ───────────
+def test_breaker_opens_after_threshold_and_half_opens_after_reset(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_after=60)
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock[0] += 60
+    assert breaker.state == "half-open"
+    assert breaker.allow()        # probe 1 request
+    assert not breaker.allow()    # ระหว่าง probe ไม่ให้ยิงเพิ่ม
+
+def test_probe_success_closes_and_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_after=10)
+    breaker.record_failure()
+    clock[0] += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+def test_release_probe_lets_the_next_request_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_after=10)
+    breaker.record_failure()
+    clock[0] += 10
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.state == "half-open" and breaker.allow()
+
+# ─────────── AsyncFetcher + breaker ───────────
+def half_open(fetcher, host):
+    breaker = fetcher.breaker(host)
+    breaker.failures, breaker.opened_at = breaker.failure_threshold, -breaker.reset_after
+    return breaker
+
+def test_failures_short_circuit_the_host():
+    fetcher = FakeFetcher(lambda url: response(url, 503))
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                await fetcher.get("https://down.example/a")
+        with pytest.raises(CircuitOpenError):
+            await fetcher.get("https://down.example/b")
+
+    asyncio.run(run())
+    assert fetcher.metrics.report()["down.example"]["short_circuited"] == 1
+
+def test_cancelled_probe_does_not_leave_the_host_short_circuited():
+    started, release = threading.Event(), threading.Event()
+
+    def hang(url):
+        started.set()
+        release.wait(5)
+        return response(url)
+
+    fetcher = FakeFetcher(hang)
+    breaker = half_open(fetcher, "slow.example")
+
+    async def run():
+        task = asyncio.create_task(fetcher.get("https://slow.example/list"))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        try:
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        finally:
+            release.set()  # asyncio.run รอ thread ของ to_thread ก่อนปิด loop
+
+    asyncio.run(run())
+    assert not breaker.probing and breaker.allow()
+
+def test_non_http_error_in_probe_releases_it():
+    def broken(url):
+        raise ValueError("bad response object")
+
+    fetcher = FakeFetcher(broken)
+    breaker = half_open(fetcher, "odd.example")
+    with pytest.raises(ValueError):
+        asyncio.run(fetcher.get("https://odd.example/a"))
+    assert not breaker.probing and breaker.allow()
+
+# ─────────── empty-body guard ───────────
+LISTING = """
+<div class="news-item"><h3 class="news-title"><a href="https://thestandard.co/full/">มีเนื้อหา</a></h3>
+  <div class="date">17 พฤษภาคม 2025</div></div>
+<div class="news-item"><h3 class="news-title"><a href="https://thestandard.co/empty/">ไม่มีเนื้อหา</a></h3></div>
+"""
+PAGES = {
+    BASE_URL.format(1): LISTING,
+    "https://thestandard.co/full/": '<div class="entry-content"><p>พบผู้ป่วย  ไข้เลือดออก</p></div>',
+    "https://thestandard.co/empty/": '<div class="paywall"></div>',
+}
+
+def test_articles_with_empty_bodies_are_dropped_and_counted():
+    fetcher = FakeFetcher(lambda url: response(url, 200 if url in PAGES else 404, PAGES.get(url, "")),
+                          metrics=CrawlMetrics())
+    articles = scrape_standard(max_pages=2, fetcher=fetcher, extractor=ExtractPool(max_workers=0))
+    assert [(a["url"], a["content_raw"], a["date"]) for a in articles] == \
+        [("https://thestandard.co/full/", "พบผู้ป่วย ไข้เลือดออก", "2025-05-17")]
+    assert fetcher.metrics.report()["thestandard.co"]["empty_bodies"] == 1
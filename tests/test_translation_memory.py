@@ -0,0 +1,79 @@
+import itertools
+
+import pytest
+
+from core import translation_memory
+from core.translation_memory import TranslationMemory, canonicalize
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Strictly increasing time so LRU order does not depend on timer resolution."""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(translation_memory.time, "time", lambda: float(next(ticks)))
+
+@pytest.fixture
+def memory():
+    tm = TranslationMemory("test-model", path=":memory:", max_entries=10)
+    yield tm
+    tm.close()
+
+def test_round_trip_normalizes_whitespace(memory):
+    memory.put_many([("มี  ผู้ป่วย\nเพิ่ม", "th", "en", "More patients")])
+    assert memory.get_many([("มี ผู้ป่วย เพิ่ม", "th", "en"), ("มี ผู้ป่วย เพิ่ม", "th", "ko")]) == \
+        ["More patients", None]
+    assert memory.report() == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_keys_include_model_and_languages(memory):
+    memory.put_many([("ไข้", "th", "en", "fever")])
+    other = TranslationMemory("other-model", path=":memory:")
+    assert other.get_many([("ไข้", "th", "en")]) == [None]
+    assert memory.get_many([("ไข้", "th", "ko")]) == [None]
+    other.close()
+
+def test_glossary_placeholders_are_canonicalized(memory):
+    text = "พบ [[GLOSSARY_007_COVID-19]] ใน [[GLOSSARY_003_Bangkok]]"
+    assert canonicalize(text)[0] == "พบ [[GLOSSARY_001_COVID-19]] ใน [[GLOSSARY_002_Bangkok]]"
+    memory.put_many([(text, "th", "en", "[[GLOSSARY_007_COVID-19]] found in [[GLOSSARY_003_Bangkok]]")])
+    renumbered = "พบ [[GLOSSARY_001_COVID-19]] ใน [[GLOSSARY_005_Bangkok]]"
+    assert memory.get_many([(renumbered, "th", "en")]) == \
+        ["[[GLOSSARY_001_COVID-19]] found in [[GLOSSARY_005_Bangkok]]"]
+
+def test_empty_items_are_not_stored(memory):
+    memory.put_many([("", "th", "en", "x"), ("ข่าว", "th", "en", "")])
+    assert memory.report()["entries"] == 0
+
+def test_eviction_keeps_most_recently_used(memory, clock):
+    memory.put_many([(f"ประโยค {i}", "th", "en", f"sentence {i}") for i in range(10)])
+    memory.get_many([("ประโยค 0", "th", "en")])  # most recently used: must survive eviction
+    memory.put_many([("ประโยค 10", "th", "en", "sentence 10")])
+    assert memory.report()["entries"] == int(10 * translation_memory.TM_EVICT_TO)
+    kept = memory.get_many([(f"ประโยค {i}", "th", "en") for i in range(11)])
+    assert kept[0] == "sentence 0" and kept[10] == "sentence 10"
+    assert kept[1:3] == [None, None]
+
+def test_recurring_counts_documents_not_repeats(memory):
+    assert memory.recurring("th", ["ก", "ข", "ก"]) == set()
+    assert memory.recurring("th", ["ค", "ก"]) == {1}
+
+def test_recurring_is_stable_for_the_same_document(memory):
+    first = ["ข่าว", "ย่อหน้า"]
+    assert memory.recurring("th", first) == set()
+    memory.recurring("th", ["ย่อหน้า", "อื่น"])
+    memory.recurring("th", ["ย่อหน้า", "อีก"])
+    assert memory.recurring("th", first) == set()  # stored answer, although the counts have moved on
+    assert memory.recurring("en", first) == set()
+    assert memory.recurring("th", ["ย่อหน้า", "ใหม่"]) == {0}
+
+def test_decoding_settings_get_their_own_namespace(monkeypatch):
+    from core import decoding
+    namespaces = {profile: decoding.cache_namespace(profile) for profile in decoding.DECODING_PROFILES}
+    assert len(set(namespaces.values())) == len(namespaces)
+    monkeypatch.setattr(decoding, "LENGTH_SLACK", decoding.LENGTH_SLACK + 1)
+    assert decoding.cache_namespace("quality") != namespaces["quality"]
+
+    fast = TranslationMemory("m+" + namespaces["fast"], path=":memory:")
+    fast.put_many([("ไข้", "th", "en", "fever")])
+    quality = TranslationMemory("m+" + namespaces["quality"], path=":memory:")
+    assert quality.get_many([("ไข้", "th", "en")]) == [None]
+    fast.close()
+    quality.close()
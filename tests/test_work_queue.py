@@ -0,0 +1,104 @@
+import os
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+from core.work_queue import LEASE_COLUMNS, PENDING_INDEX, WorkQueue
+
+# Needs a scratch PostgreSQL database, e.g. TEST_DATABASE_URL=postgresql://localhost/epidemic_test
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+@pytest.fixture
+def connect():
+    """Connections pinned to a throwaway schema holding a minimal epidemic_news table."""
+    schema = f"test_work_queue_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(DATABASE_URL)
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA {schema}")
+        cursor.execute(f"""
+            CREATE TABLE {schema}.epidemic_news (
+                id SERIAL PRIMARY KEY,
+                title TEXT,
+                content_raw TEXT,
+                language TEXT DEFAULT 'th',
+                content_en TEXT,
+                is_translated BOOLEAN DEFAULT FALSE,
+                is_summarized BOOLEAN DEFAULT FALSE
+            )
+        """)
+        cursor.execute(f"INSERT INTO {schema}.epidemic_news (title, content_raw) "
+                       f"SELECT 'title ' || n, 'content ' || n FROM generate_series(1, 5) AS n")
+    queues = []
+
+    def make(worker_id, **kwargs):
+        queue = WorkQueue(lambda: psycopg2.connect(DATABASE_URL, options=f"-c search_path={schema}"),
+                          worker_id=worker_id, **kwargs)
+        queues.append(queue)
+        return queue
+
+    make("setup").ensure_schema()
+    yield make
+    for queue in queues:
+        queue.close()
+    with admin.cursor() as cursor:
+        cursor.execute(f"DROP SCHEMA {schema} CASCADE")
+    admin.close()
+
+def fetch(queue, query, params=None):
+    return queue._execute(query, params)
+
+def test_ensure_schema_is_idempotent(connect):
+    queue = connect("a")
+    queue.ensure_schema()
+    columns = {row["column_name"] for row in fetch(queue, """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'epidemic_news'""")}
+    assert set(LEASE_COLUMNS) <= columns
+    assert fetch(queue, "SELECT 1 FROM pg_indexes WHERE schemaname = current_schema() AND indexname = %s",
+                 (PENDING_INDEX,))
+
+def test_claim_skips_rows_leased_by_another_worker(connect):
+    a, b = connect("a"), connect("b")
+    first = a.claim(3)
+    second = b.claim(3)
+    assert [row["id"] for row in first] == [1, 2, 3]
+    assert [row["id"] for row in second] == [4, 5]
+    assert first[0]["title"] == "title 1" and first[0]["language"] == "th"
+    assert b.claim(3) == []
+
+def test_complete_writes_only_while_the_lease_is_held(connect):
+    a, b = connect("a"), connect("b")
+    [row] = a.claim(1)
+    assert not b.complete(row["id"], {"content_en": "stolen"})
+    assert a.complete(row["id"], {"content_en": "news", "is_translated": True, "is_summarized": True})
+    [stored] = fetch(a, "SELECT content_en, lease_owner, lease_expires_at FROM epidemic_news WHERE id = %s",
+                     (row["id"],))
+    assert stored == {"content_en": "news", "lease_owner": None, "lease_expires_at": None}
+    assert row["id"] not in [r["id"] for r in b.claim(5)]  # processed rows are no longer pending
+
+def test_release_hands_rows_back_with_the_error(connect):
+    a, b = connect("a"), connect("b")
+    ids = [row["id"] for row in a.claim(2)]
+    a.release(ids, error="model failed")
+    assert [row["id"] for row in b.claim(2)] == ids
+    assert {row["last_error"] for row in fetch(b, "SELECT last_error FROM epidemic_news WHERE id = ANY(%s)",
+                                               (ids,))} == {"model failed"}
+
+def test_expired_lease_is_taken_over(connect):
+    a, b = connect("a", lease_seconds=0), connect("b")
+    [row] = a.claim(1)
+    assert [r["id"] for r in b.claim(1)] == [row["id"]]
+    assert a.heartbeat([row["id"]]) == []
+    assert not a.complete(row["id"], {"content_en": "late"})
+    assert b.heartbeat([row["id"]]) == [row["id"]]
+
+def test_rows_stop_being_claimed_after_max_attempts(connect):
+    a = connect("a", max_attempts=2)
+    for _ in range(2):
+        ids = [row["id"] for row in a.claim(5)]
+        a.release(ids, error="boom")
+    assert a.claim(5) == []